@@ -0,0 +1,11 @@
+"""
+On-disk caches.
+"""
+
+from .fingerprint import fingerprint, s3_markers
+from .schema import SchemaCache, dtype_from_name, dtype_to_name
+from .media import MediaCache, media_cache_stats
+from .results import ResultCache, content_hash
+
+__all__ = ['fingerprint', 's3_markers', 'SchemaCache', 'dtype_from_name', 'dtype_to_name', 'MediaCache', 'media_cache_stats',
+           'ResultCache', 'content_hash']
@@ -0,0 +1,114 @@
+"""
+Integer counters shared by every worker and process of a run, kept in a
+SQLite `stats.db` inside a cache directory.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import closing
+from typing import Dict, Iterable, Mapping, Optional
+
+# Seconds between flushes of counters buffered by a worker
+FLUSH_INTERVAL_S = 5.0
+
+
+def _stats_db(directory: str) -> sqlite3.Connection:
+  connection = sqlite3.connect(os.path.join(directory, 'stats.db'), timeout=30)
+  connection.execute('CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+  return connection
+
+
+def _scoped(key: str, scope: Optional[str]) -> str:
+  return f'{scope}/{key}' if scope else key
+
+
+def read_counters(directory: str, keys: Iterable[str], scope: Optional[str] = None) -> Dict[str, int]:
+  """
+  Current totals of `keys` (0 for counters never written), or with `scope`
+  only the increments added under that scope (e.g. one job of the server).
+  """
+  counters = dict.fromkeys(keys, 0)
+  if not os.path.exists(os.path.join(directory, 'stats.db')):
+    return counters
+  names = {_scoped(key, scope): key for key in counters}
+  with closing(_stats_db(directory)) as connection:
+    counters.update((names[key], value) for key, value in connection.execute('SELECT key, value FROM counters') if key in names)
+  return counters
+
+
+def add_counters(directory: str, increments: Mapping[str, int], scope: Optional[str] = None) -> None:
+  """
+  Add `increments` to the shared totals, and to the `scope` totals when given.
+  """
+  if not increments:
+    return
+  rows = [(key, int(value)) for key, value in increments.items()]
+  if scope:
+    rows += [(_scoped(key, scope), value) for key, value in rows]
+
+  os.makedirs(directory, exist_ok=True)
+  with closing(_stats_db(directory)) as connection, connection:
+    connection.executemany(
+      'INSERT INTO counters (key, value) VALUES (?, ?) '
+      'ON CONFLICT(key) DO UPDATE SET value = value + excluded.value',
+      rows,
+    )
+
+
+def add_counter(directory: str, key: str, increment: int) -> int:
+  """
+  Add `increment` to one shared counter and return its new total, read in
+  the same transaction.
+  """
+  os.makedirs(directory, exist_ok=True)
+  with closing(_stats_db(directory)) as connection, connection:
+    return connection.execute(
+      'INSERT INTO counters (key, value) VALUES (?, ?) '
+      'ON CONFLICT(key) DO UPDATE SET value = value + excluded.value RETURNING value',
+      (key, int(increment)),
+    ).fetchone()[0]
+
+
+class BufferedCounters:
+  """
+  Counter increments kept in memory by one worker and added to the shared
+  totals at most every `interval_s` seconds, and on `flush` (at teardown),
+  so hot paths do not write SQLite on every batch.
+  """
+
+  def __init__(self, directory: str, scope: Optional[str] = None, interval_s: float = FLUSH_INTERVAL_S):
+    self.directory = directory
+    self.scope = scope
+    self.interval_s = interval_s
+    self._lock = threading.Lock()
+    self._pending = Counter()
+    self._flushed = time.monotonic()
+
+  def add(self, **increments) -> None:
+
+    with self._lock:
+      self._pending.update(increments)
+      due = time.monotonic() - self._flushed >= self.interval_s
+    if due:
+      self.flush()
+
+  def flush(self) -> None:
+    """
+    Add the increments collected since the last flush to the shared totals.
+    """
+    with self._lock:
+      pending, self._pending = self._pending, Counter()
+      self._flushed = time.monotonic()
+    add_counters(self.directory, pending, self.scope)
+
+
+def drop_counters(directory: str, scope: str) -> None:
+  """
+  Delete the counters of `scope` once they have been read.
+  """
+  if not os.path.exists(os.path.join(directory, 'stats.db')):
+    return
+  with closing(_stats_db(directory)) as connection, connection:
+    connection.execute('DELETE FROM counters WHERE key LIKE ?', (f'{scope}/%',))
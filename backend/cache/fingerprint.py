@@ -0,0 +1,73 @@
+"""
+Cheap change markers for local and remote files.
+"""
+import os
+import threading
+import urllib.request
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import daft
+
+
+# boto3 clients are thread-safe but slow to create; one per endpoint
+_s3_clients = {}
+_s3_clients_lock = threading.Lock()
+
+
+def _s3_client(io_config: Optional[daft.io.IOConfig]):
+  import boto3
+  from botocore import UNSIGNED
+  from botocore.config import Config
+
+  s3 = io_config.s3 if io_config is not None else None
+  endpoint_url = getattr(s3, 'endpoint_url', None)
+  anonymous = getattr(s3, 'anonymous', False)
+
+  with _s3_clients_lock:
+    client = _s3_clients.get((endpoint_url, anonymous))
+    if client is None:
+      config = Config(signature_version=UNSIGNED) if anonymous else None
+      client = _s3_clients[(endpoint_url, anonymous)] = boto3.client('s3', endpoint_url=endpoint_url, config=config)
+  return client
+
+
+def fingerprint(path: str, io_config: Optional[daft.io.IOConfig] = None) -> Optional[str]:
+  """
+  Return a string that changes whenever the file at `path` changes.
+
+  Local files use size and mtime, S3 objects use their ETag and HTTP(S) objects
+  use ETag or Last-Modified. Returns None when no marker can be obtained.
+  """
+  try:
+    if path.startswith('s3://'):
+      parsed = urlparse(path)
+      head = _s3_client(io_config).head_object(Bucket=parsed.netloc, Key=parsed.path.lstrip('/'))
+      return f"{head['ContentLength']}:{head['ETag']}"
+
+    if path.startswith('http://') or path.startswith('https://'):
+      request = urllib.request.Request(path, method='HEAD')
+      with urllib.request.urlopen(request, timeout=10) as response:
+        marker = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        if marker is None:
+          return None
+        return f"{response.headers.get('Content-Length')}:{marker}"
+
+    stat = os.stat(path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+  except Exception:
+    return None
+
+
+def s3_markers(bucket: str, prefix: str, io_config: Optional[daft.io.IOConfig] = None) -> Dict[str, str]:
+  """
+  Markers of every object below `s3://bucket/prefix`, keyed by object key, in
+  the format of `fingerprint`. One list request covers 1000 objects, so a
+  shard set is marked without a HEAD request per file.
+  """
+  markers = {}
+  paginator = _s3_client(io_config).get_paginator('list_objects_v2')
+  for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+    for item in page.get('Contents', []):
+      markers[item['Key']] = f"{item['Size']}:{item['ETag']}"
+  return markers
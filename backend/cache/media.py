@@ -0,0 +1,271 @@
+"""
+Local disk cache of downloaded media, keyed by URL and change marker.
+"""
+import fcntl
+import hashlib
+import os
+import time
+import urllib.request
+import uuid
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import daft
+
+from .counters import FLUSH_INTERVAL_S, BufferedCounters, add_counter, read_counters
+from .fingerprint import fingerprint, _s3_client
+
+
+_STAT_KEYS = ('hits', 'misses', 'bypassed', 'evicted', 'bytes_from_cache', 'bytes_downloaded')
+
+
+def media_cache_stats(cache_dir: str, scope: Optional[str] = None) -> Dict[str, int]:
+  """
+  Hit, miss, bypass and eviction counters of the cache at `cache_dir`,
+  summed over every worker and process that has used it (or, with `scope`,
+  over the downloads of one run).
+  """
+  return read_counters(cache_dir, _STAT_KEYS, scope)
+
+
+def fetch(url: str, length: Optional[int] = None, io_config: Optional[daft.io.IOConfig] = None) -> bytes:
+  """
+  Download `url` (local path, s3:// or http(s)://) in full, or only its first
+  `length` bytes with a ranged GET. S3 objects are read from the endpoint of
+  `io_config`.
+  """
+  byte_range = f'bytes=0-{length - 1}' if length else None
+
+  if url.startswith('s3://'):
+    parsed = urlparse(url)
+    request = {'Bucket': parsed.netloc, 'Key': parsed.path.lstrip('/')}
+    if byte_range:
+      request['Range'] = byte_range
+    return _s3_client(io_config).get_object(**request)['Body'].read(length)
+
+  if url.startswith('http://') or url.startswith('https://'):
+    request = urllib.request.Request(url, headers={'Range': byte_range} if byte_range else {})
+    with urllib.request.urlopen(request, timeout=60) as response:
+      # Servers without range support send the whole body; stop reading early
+      return response.read(length) if length else response.read()
+
+  with open(url[len('file://'):] if url.startswith('file://') else url, 'rb') as f:
+    return f.read(length) if length else f.read()
+
+
+class MediaCache:
+  """
+  Stores one file per (URL, ETag / Last-Modified / mtime) key, evicting the
+  least recently used files once the cache grows past `max_bytes`.
+
+  Entries are written to a unique temporary file and renamed into place, and
+  eviction runs under a file lock, so several workers or processes can share
+  one directory. A hit refreshes the entry's mtime, which orders eviction.
+  The stored size is one counter in the directory's `stats.db`, shared by
+  every worker, so their puts together stay within `max_bytes`; eviction
+  corrects it to the size found on disk.
+
+  Each URL's last validated marker is kept in a small `.marker` file. Within
+  `max_age_s` seconds of that validation, hits are served without asking the
+  source for its marker again (`inf` trusts entries until they are evicted).
+  """
+
+  LOCK_FILE = '.lock'
+  SIZE_KEY = 'stored_bytes'
+
+  def __init__(
+    self,
+    cache_dir: str,
+    max_bytes: int,
+    stats_scope: Optional[str] = None,
+    max_age_s: float = 0,
+    io_config: Optional[daft.io.IOConfig] = None,
+    stats_interval_s: float = FLUSH_INTERVAL_S,
+  ):
+    self.cache_dir = cache_dir
+    self.max_bytes = max_bytes
+    self.stats_scope = stats_scope
+    self.max_age_s = max_age_s
+    self.io_config = io_config
+    os.makedirs(cache_dir, exist_ok=True)
+    self._stats = BufferedCounters(cache_dir, stats_scope, stats_interval_s)
+    self._init_size()
+
+  def _init_size(self) -> None:
+    """
+    Start the shared size counter from the files on disk, for a directory
+    filled before the counter existed.
+    """
+    with open(os.path.join(self.cache_dir, self.LOCK_FILE), 'a') as lock:
+      fcntl.flock(lock, fcntl.LOCK_EX)
+      if add_counter(self.cache_dir, self.SIZE_KEY, 0) == 0:
+        add_counter(self.cache_dir, self.SIZE_KEY, sum(entry[2] for entry in self._entries()))
+
+  def _count(self, **increments):
+    self._stats.add(**increments)
+
+  def flush_stats(self) -> None:
+    """
+    Add the counters collected since the last flush to the shared totals.
+    They are otherwise added every `stats_interval_s` seconds.
+    """
+    self._stats.flush()
+
+  def _file(self, url: str, marker: str) -> str:
+    key = hashlib.sha256(f'{url}\n{marker}'.encode('utf-8')).hexdigest()
+    return os.path.join(self.cache_dir, key[:2], key)
+
+  def _marker_file(self, url: str) -> str:
+    return f'{self._file(url, "")}.marker'
+
+  def _trusted_marker(self, url: str) -> Optional[str]:
+    """
+    The URL's last validated marker, if validated within `max_age_s`.
+    """
+    if not self.max_age_s:
+      return None
+    path = self._marker_file(url)
+    try:
+      if time.time() - os.stat(path).st_mtime > self.max_age_s:
+        return None
+      with open(path) as f:
+        return f.read() or None
+    except (FileNotFoundError, PermissionError):
+      return None
+
+  def _remember_marker(self, url: str, marker: str) -> None:
+
+    if not self.max_age_s:
+      return
+    path = self._marker_file(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp, 'w') as f:
+      f.write(marker)
+    os.replace(tmp, path)
+
+  def _entries(self, markers: bool = False):
+    """
+    (mtime, path, size) of every cached file, or with `markers` of every
+    `.marker` file.
+    """
+    entries = []
+    for root, _, files in os.walk(self.cache_dir):
+      for name in files:
+        if name in (self.LOCK_FILE, 'stats.db') or name.startswith('stats.db-') or name.endswith('.tmp'):
+          continue
+        if name.endswith('.marker') != markers:
+          continue
+        path = os.path.join(root, name)
+        try:
+          stat = os.stat(path)
+        except FileNotFoundError:
+          continue
+        entries.append((stat.st_mtime_ns, path, stat.st_size))
+    return entries
+
+  def get(self, url: str, marker: str) -> Optional[bytes]:
+    """
+    Return the cached bytes, or None on a miss.
+    """
+    path = self._file(url, marker)
+    try:
+      with open(path, 'rb') as f:
+        data = f.read()
+      os.utime(path)
+    except (FileNotFoundError, PermissionError):
+      return None
+    return data
+
+  def put(self, url: str, marker: str, data: bytes) -> None:
+
+    if len(data) > self.max_bytes:
+      return
+
+    path = self._file(url, marker)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Another worker may have stored the same entry meanwhile
+    stored = 0 if os.path.exists(path) else len(data)
+    tmp = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp, 'wb') as f:
+      f.write(data)
+    os.replace(tmp, path)
+
+    if add_counter(self.cache_dir, self.SIZE_KEY, stored) > self.max_bytes:
+      self._evict()
+
+  def _evict(self) -> None:
+    """
+    Delete the least recently used entries down to 90% of `max_bytes`, and
+    markers older than `max_age_s`. Skipped when another worker is already
+    evicting.
+    """
+    with open(os.path.join(self.cache_dir, self.LOCK_FILE), 'a') as lock:
+      try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+      except BlockingIOError:
+        return
+
+      counted = add_counter(self.cache_dir, self.SIZE_KEY, 0)
+      entries = sorted(self._entries())
+      size = sum(entry[2] for entry in entries)
+      evicted = 0
+      for _, path, file_size in entries:
+        if size <= self.max_bytes * 0.9:
+          break
+        try:
+          os.remove(path)
+        except FileNotFoundError:
+          pass
+        size -= file_size
+        evicted += 1
+
+      # Puts counted since the walk began are kept
+      add_counter(self.cache_dir, self.SIZE_KEY, size - counted)
+      self._count(evicted=evicted)
+
+      if 0 < self.max_age_s < float('inf'):
+        expired = time.time_ns() - int(self.max_age_s * 1e9)
+        for mtime, path, _ in self._entries(markers=True):
+          if mtime < expired:
+            try:
+              os.remove(path)
+            except FileNotFoundError:
+              pass
+
+  def load(self, url: str) -> Optional[bytes]:
+    """
+    Return the bytes at `url`, from the cache when its marker is unchanged
+    (or was validated within `max_age_s`). Returns None when the file cannot
+    be read.
+    """
+    marker = self._trusted_marker(url)
+    data = self.get(url, marker) if marker is not None else None
+    if data is not None:
+      self._count(hits=1, bytes_from_cache=len(data))
+      return data
+
+    marker = fingerprint(url, self.io_config)
+    if marker is None:
+      # No ETag / Last-Modified: the entry could never be validated
+      self._count(bypassed=1)
+      try:
+        return fetch(url, io_config=self.io_config)
+      except Exception:
+        return None
+
+    data = self.get(url, marker)
+    if data is not None:
+      self._count(hits=1, bytes_from_cache=len(data))
+      self._remember_marker(url, marker)
+      return data
+
+    self._count(misses=1)
+    try:
+      data = fetch(url, io_config=self.io_config)
+    except Exception:
+      return None
+    self._count(bytes_downloaded=len(data))
+    self.put(url, marker, data)
+    self._remember_marker(url, marker)
+    return data
@@ -0,0 +1,74 @@
+"""
+Content-addressed cache of per-file media analysis results.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def content_hash(data: Optional[bytes]) -> Optional[str]:
+  """
+  Hash of a file's content, or None for missing data.
+  """
+  if data is None:
+    return None
+  return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def result_key(digest: str, udf_name: str, version: Any, params: Any) -> str:
+  """
+  Cache key of one UDF result: the content hash plus the UDF's name, version
+  and parameters, so changing any of them misses the old entries.
+  """
+  raw = json.dumps([digest, udf_name, version, params], sort_keys=True, default=str)
+  return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+  """
+  SQLite table of pickled UDF results by key.
+
+  The database runs in WAL mode, so several workers or processes can read
+  and write it concurrently.
+  """
+
+  # SQLite bounds the number of `?` parameters per statement
+  MAX_PARAMS = 500
+
+  def __init__(self, path: str):
+    self.path = path
+    if os.path.dirname(path):
+      os.makedirs(os.path.dirname(path), exist_ok=True)
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    self._connection.execute('PRAGMA journal_mode=WAL')
+    self._connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+    self._connection.commit()
+
+  def get_many(self, keys: List[str]) -> Dict[str, Any]:
+    """
+    Return the cached results found among `keys`.
+    """
+    found = {}
+    with self._lock:
+      for start in range(0, len(keys), self.MAX_PARAMS):
+        chunk = keys[start:start + self.MAX_PARAMS]
+        rows = self._connection.execute(
+          f"SELECT key, value FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall()
+        found.update((key, pickle.loads(value)) for key, value in rows)
+    return found
+
+  def put_many(self, items: List[Tuple[str, Any]]) -> None:
+
+    if not items:
+      return
+    with self._lock, self._connection:
+      self._connection.executemany(
+        'INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)',
+        [(key, pickle.dumps(value)) for key, value in items],
+      )
@@ -0,0 +1,91 @@
+"""
+Cache of inferred CSV schemas, keyed by path and file fingerprint.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from daft import DataType
+
+
+_DTYPES = {
+  'bool': DataType.bool,
+  'int8': DataType.int8,
+  'int16': DataType.int16,
+  'int32': DataType.int32,
+  'int64': DataType.int64,
+  'uint8': DataType.uint8,
+  'uint16': DataType.uint16,
+  'uint32': DataType.uint32,
+  'uint64': DataType.uint64,
+  'float32': DataType.float32,
+  'float64': DataType.float64,
+  'string': DataType.string,
+  'binary': DataType.binary,
+  'date': DataType.date,
+  'null': DataType.null,
+}
+
+
+def dtype_from_name(name: str) -> DataType:
+  """
+  Convert a YAML type name (e.g. `float64`, `string`) to a daft DataType.
+  """
+  factory = _DTYPES.get(str(name).lower())
+  if factory is None:
+    raise ValueError(f'Unsupported schema type: {name}. Supported: {sorted(_DTYPES)}')
+  return factory()
+
+
+def dtype_to_name(dtype: DataType) -> Optional[str]:
+  """
+  Convert a daft DataType back to its YAML type name, or None if unsupported.
+  """
+  for name, factory in _DTYPES.items():
+    if dtype == factory():
+      return name
+  return None
+
+
+class SchemaCache:
+  """
+  Stores one JSON schema file per (path, fingerprint, hints) key.
+  """
+
+  def __init__(self, cache_dir: str):
+    self.cache_dir = cache_dir
+
+  def _key(self, path: str, fingerprint: str, hints: Dict[str, str]) -> str:
+    raw = json.dumps([path, fingerprint, hints], sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+  def _file(self, key: str) -> str:
+    return os.path.join(self.cache_dir, f'{key}.json')
+
+  def get(self, path: str, fingerprint: str, hints: Dict[str, str]) -> Optional[Dict[str, DataType]]:
+    """
+    Return the cached schema, or None on a miss or unreadable entry.
+    """
+    try:
+      with open(self._file(self._key(path, fingerprint, hints)), 'r') as f:
+        names = json.load(f)
+      return {column: dtype_from_name(name) for column, name in names.items()}
+    except Exception:
+      return None
+
+  def put(self, path: str, fingerprint: str, hints: Dict[str, str], schema: Dict[str, DataType]) -> bool:
+    """
+    Store a schema. Schemas with types that cannot be named are not cached.
+    """
+    names = {column: dtype_to_name(dtype) for column, dtype in schema.items()}
+    if any(name is None for name in names.values()):
+      return False
+
+    os.makedirs(self.cache_dir, exist_ok=True)
+    target = self._file(self._key(path, fingerprint, hints))
+    tmp = f'{target}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+      json.dump(names, f)
+    os.replace(tmp, target)
+    return True
@@ -1,37 +1,45 @@
 """
 Detector plugins
+
+Detectors are registered by name and imported on first use, so configs that
+only use numeric or text detectors never import cv2, PIL or soundfile.
 """
 
 from validation.base import registry
 
-# Import all detector modules to trigger registration
-from .numeric import NumericDetector, IntegerDetector, FloatDetector
-from .text import TextDetector, CategoryDetector
-from .image import (
-    ImageResolutionDetector, ImageBlurDetector, ImageAspectRatioDetector,
-    ImageFaceCountDetector, ImageFormatDetector, ImageSizeDetector
-)
-from .audio import AudioDetector
-
 # Register numeric detectors
-registry.register('NUMERIC', NumericDetector)
-registry.register('INTEGER', IntegerDetector)
-registry.register('FLOAT', FloatDetector)
+registry.register_lazy('NUMERIC', 'detectors.numeric:NumericDetector')
+registry.register_lazy('INTEGER', 'detectors.numeric:IntegerDetector')
+registry.register_lazy('FLOAT', 'detectors.numeric:FloatDetector')
 
 # Register text detectors
-registry.register('TEXT', TextDetector)
-registry.register('CATEGORY', CategoryDetector)
+registry.register_lazy('TEXT', 'detectors.text:TextDetector')
+registry.register_lazy('CATEGORY', 'detectors.text:CategoryDetector')
+registry.register_lazy('TEXT_NEAR_DUPLICATE', 'detectors.text:TextNearDuplicateDetector')
+
+# Register duplicate detectors
+registry.register_lazy('DUPLICATE_ROW', 'detectors.duplicate:DuplicateRowDetector')
+
+# Register referential integrity detectors
+registry.register_lazy('REFERENCE', 'detectors.reference:ReferenceDetector')
+
+# Register drift detectors
+registry.register_lazy('DRIFT', 'detectors.drift:DriftDetector')
 
 # Register image detectors
-registry.register('IMAGE_RESOLUTION', ImageResolutionDetector)
-registry.register('IMAGE_BLUR', ImageBlurDetector)
-registry.register('IMAGE_ASPECT_RATIO', ImageAspectRatioDetector)
-registry.register('IMAGE_FACE_COUNT', ImageFaceCountDetector)
-registry.register('IMAGE_FORMAT', ImageFormatDetector)
-registry.register('IMAGE_SIZE', ImageSizeDetector)
+registry.register_lazy('IMAGE_RESOLUTION', 'detectors.image:ImageResolutionDetector')
+registry.register_lazy('IMAGE_BLUR', 'detectors.image:ImageBlurDetector')
+registry.register_lazy('IMAGE_ASPECT_RATIO', 'detectors.image:ImageAspectRatioDetector')
+registry.register_lazy('IMAGE_FACE_COUNT', 'detectors.image:ImageFaceCountDetector')
+registry.register_lazy('IMAGE_FORMAT', 'detectors.image:ImageFormatDetector')
+registry.register_lazy('IMAGE_SIZE', 'detectors.image:ImageSizeDetector')
+registry.register_lazy('IMAGE_NEAR_DUPLICATE', 'detectors.image:ImageNearDuplicateDetector')
 
 # Register audio detectors
-registry.register('AUDIO', AudioDetector)
+registry.register_lazy('AUDIO', 'detectors.audio:AudioDetector')
+
+# Register video detectors
+registry.register_lazy('VIDEO', 'detectors.video:VideoDetector')
 
 # Export registry for easy access
 __all__ = ['registry']
@@ -2,16 +2,16 @@
 from typing import Any, Dict, List
 import daft
 from daft import col
-import soundfile as sf
-import numpy as np
 from validation.base import BaseDetector, ConstraintEvaluator
-import io
+from udfs.audio import AudioInfo, AudioContent
 
 class AudioDetector(BaseDetector):
     """
     Detector for audio data validation using soundfile.
     """
 
+    USES_MEDIA = True
+
     def detect(self, df: daft.DataFrame) -> daft.DataFrame:
         column = col(self.on_column)
 
@@ -40,6 +40,10 @@ class AudioDetector(BaseDetector):
         if 'channels' in self.config:
             df = self._validate_channels(df)
 
+        # Silence, clipping and DC offset validation
+        if 'content' in self.config:
+            df = self._validate_content(df)
+
         return df
 
     def _ensure_audio_file(self, df: daft.DataFrame) -> daft.DataFrame:
@@ -49,88 +53,96 @@ class AudioDetector(BaseDetector):
         bytes_col = f'__{self.on_column}_BYTES__'
 
         if bytes_col not in df.column_names:
-            df = df.with_column(bytes_col, col(self.on_column).url.download(on_error='null'))
+            df = df.with_column(bytes_col, self._download(self.on_column))
 
         return df, bytes_col
 
-    def _validate_audio_files(self, df: daft.DataFrame) -> daft.DataFrame:
-        """Validate that audio files can be read by soundfile."""
+    def intermediate_columns(self) -> List[str]:
+        """
+        Downloaded audio bytes, dropped once the last audio detector has run.
+        """
+        return [f'__{self.on_column}_BYTES__']
+
+    def _ensure_audio_info(self, df: daft.DataFrame) -> daft.DataFrame:
+        """
+        Ensure the decoded audio header column exists, reading each file once.
+        """
         df, bytes_col = self._ensure_audio_file(df)
+        info_col = f'__{self.on_column}_AUDIO_INFO__'
+
+        if info_col not in df.column_names:
+            df = df.with_column(info_col, self._with_resources(AudioInfo)(col(bytes_col)))
 
-        def is_valid_audio(file_bytes):
-            try:
-                if file_bytes is None or file_bytes == b"":
-                    return False
-                info = sf.info(io.BytesIO(file_bytes))
-                return True
-            except Exception:
-                return False
+        return df, info_col
+
+    def _validate_audio_files(self, df: daft.DataFrame) -> daft.DataFrame:
+        """Validate that audio files can be read by soundfile."""
+        df, info_col = self._ensure_audio_info(df)
 
-        validation_expr = col(bytes_col).apply(is_valid_audio, return_dtype=daft.DataType.bool())
+        validation_expr = col(info_col).struct.get('valid')
         return self._add_validation_column(df, "VALID_AUDIO_FILE", validation_expr)
 
     def _validate_duration(self, df: daft.DataFrame) -> daft.DataFrame:
         """Validate audio duration is within specified range."""
-        df, bytes_col = self._ensure_audio_file(df)
+        df, info_col = self._ensure_audio_info(df)
 
         duration_config = self.config['duration_range']
         min_duration = duration_config.get('min', 0)
         max_duration = duration_config.get('max', float('inf'))
 
-        def get_duration(file_bytes):
-            try:
-                if file_bytes is None or file_bytes == b"":
-                    return 0
-                info = sf.info(io.BytesIO(file_bytes))
-                return info.duration
-            except Exception:
-                return 0
-
-        duration_expr = col(bytes_col).apply(get_duration, return_dtype=daft.DataType.float64())
+        duration_expr = col(info_col).struct.get('duration')
         validation_expr = (duration_expr >= min_duration) & (duration_expr <= max_duration)
 
         return self._add_validation_column(df, "DURATION_RANGE", validation_expr)
 
     def _validate_sample_rate(self, df: daft.DataFrame) -> daft.DataFrame:
         """Validate audio sample rate matches expected value."""
-        df, bytes_col = self._ensure_audio_file(df)
+        df, info_col = self._ensure_audio_info(df)
 
         expected_rate = self.config['sample_rate']
 
-        def get_sample_rate(file_bytes):
-            try:
-                if file_bytes is None or file_bytes == b"":
-                    return 0
-                info = sf.info(io.BytesIO(file_bytes))
-                return info.samplerate
-            except Exception:
-                return 0
-
-        rate_expr = col(bytes_col).apply(get_sample_rate, return_dtype=daft.DataType.int64())
+        rate_expr = col(info_col).struct.get('samplerate')
         validation_expr = rate_expr == expected_rate
 
         return self._add_validation_column(df, "SAMPLE_RATE", validation_expr)
 
     def _validate_channels(self, df: daft.DataFrame) -> daft.DataFrame:
         """Validate number of audio channels."""
-        df, bytes_col = self._ensure_audio_file(df)
+        df, info_col = self._ensure_audio_info(df)
 
         expected_channels = self.config['channels']
 
-        def get_channels(file_bytes):
-            try:
-                if file_bytes is None or file_bytes == b"":
-                    return 0
-                info = sf.info(io.BytesIO(file_bytes))
-                return info.channels
-            except Exception:
-                return 0
-
-        channels_expr = col(bytes_col).apply(get_channels, return_dtype=daft.DataType.int64())
+        channels_expr = col(info_col).struct.get('channels')
         validation_expr = channels_expr == expected_channels
 
         return self._add_validation_column(df, "CHANNELS", validation_expr)
 
+    def _validate_content(self, df: daft.DataFrame) -> daft.DataFrame:
+        """Validate silence ratio, clipping ratio and DC offset of the samples."""
+        df, bytes_col = self._ensure_audio_file(df)
+
+        content = self.config['content']
+        content_col = f'__{self.on_column}_AUDIO_CONTENT__'
+        if content_col not in df.column_names:
+            df = df.with_column(content_col, self._with_resources(AudioContent)(
+                col(bytes_col),
+                float(content.get('silence_db', -60.0)),
+                float(content.get('clip_level', 0.999)),
+                int(content.get('window', 2048)),
+            ))
+
+        checks = [
+            ('max_silence_ratio', 'silence_ratio', "SILENCE_RATIO"),
+            ('max_clipping_ratio', 'clipping_ratio', "CLIPPING_RATIO"),
+            ('max_dc_offset', 'dc_offset', "DC_OFFSET"),
+        ]
+        for key, field, check in checks:
+            if key in content:
+                validation_expr = col(content_col).struct.get(field) <= content[key]
+                df = self._add_validation_column(df, check, validation_expr)
+
+        return df
+
     def get_supported_constraints(self) -> List[str]:
         """Return supported constraint types for audio data."""
         return [
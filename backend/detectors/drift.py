@@ -0,0 +1,93 @@
+"""
+Drift detectors.
+"""
+import functools
+import itertools
+import operator
+from typing import List
+import daft
+from daft import col
+
+from validation.base import BaseDetector
+from snapshot import load_snapshot, histogram_bins, category_bins
+
+
+class DriftDetector(BaseDetector):
+    """
+    Detector for distribution drift of a column against a baseline snapshot.
+
+    The current data is binned with the baseline's histogram edges (or
+    categories), so the baseline data itself is not needed. The score is a
+    dataset-level result, aggregated lazily over the whole frame and joined
+    back to every row.
+    """
+
+    ROW_LOCAL = False
+
+    EPSILON = 1e-4
+
+    def detect(self, df: daft.DataFrame) -> daft.DataFrame:
+        if 'baseline' not in self.config:
+            raise ValueError("DRIFT detector requires a 'baseline' snapshot path")
+
+        baseline = load_snapshot(self.config['baseline'])
+        column_stats = baseline['columns'].get(self.on_column)
+        if column_stats is None:
+            raise ValueError(f"Column '{self.on_column}' not found in baseline snapshot")
+
+        method = self.config.get('method', 'PSI').upper()
+        threshold = self.config.get('threshold', 0.2 if method == 'PSI' else 0.1)
+
+        if column_stats['kind'] == 'numeric':
+            bins = histogram_bins(self.on_column, column_stats['edges'])
+        else:
+            bins = category_bins(self.on_column, column_stats['categories'])
+
+        # Current bin counts from a lazy aggregation, joined back to every row
+        # on a constant key, so the score stays part of the plan. Data columns
+        # are counted on a narrow branch of the input frame. The count is a
+        # grouped aggregation: a global one over a frame that already holds
+        # such a join counts its rows several times
+        key = f'__{self.name}_DRIFT_KEY__'
+        count_cols = [f'__{self.name}_BIN_{i}__' for i in range(len(bins))]
+        source = self._side_frame(df, self.on_column) if self._in_source(self.on_column) else df
+        totals = source.with_column(key, daft.lit(0)).groupby(key).agg(
+            *[expr.if_else(1, 0).sum().alias(name) for expr, name in zip(bins, count_cols)]
+        )
+        df = df.with_column(key, daft.lit(0)).join(totals, on=key, how='left')
+
+        counts = [col(name).fill_null(0).cast(daft.DataType.float64()) for name in count_cols]
+        total = functools.reduce(operator.add, counts)
+        actual = [(c + self.EPSILON) / (total + self.EPSILON * len(counts)) for c in counts]
+        expected = self._proportions(column_stats['counts'])
+
+        if method == 'PSI':
+            terms = [(q - p) * (q / p).ln() for q, p in zip(actual, expected)]
+            score = functools.reduce(operator.add, terms)
+        elif method == 'KS':
+            gaps = [
+                (q - p).abs()
+                for q, p in zip(itertools.accumulate(actual), itertools.accumulate(expected))
+            ]
+            score = functools.reduce(lambda a, b: (a >= b).if_else(a, b), gaps)
+        else:
+            raise ValueError(f"Unsupported drift method: {method}")
+
+        score_col = f'__DRIFT_{method}_{self.name}__'
+        df = df.with_column(score_col, score).exclude(key, *count_cols)
+
+        return self._add_validation_column(df, f"DRIFT_{method}", col(score_col) <= threshold)
+
+    def _in_source(self, column: str) -> bool:
+
+        return self.source is not None and column in self.source.column_names
+
+    def _proportions(self, counts: List[int]) -> List[float]:
+        total = sum(counts)
+        return [(c + self.EPSILON) / (total + self.EPSILON * len(counts)) for c in counts]
+
+    def get_supported_constraints(self) -> List[str]:
+        """
+        Drift detection takes no column constraints.
+        """
+        return []
@@ -6,7 +6,10 @@ import daft
 from daft import col
 
 from validation.base import BaseDetector, ConstraintEvaluator
-from udfs.image import image_dimension, image_blur_var, DetectFace
+from validation.lsh import flag_bucket_matches
+from udfs.download import RangeDownload
+from udfs.image import ImageDimension, ImageBlurVar, DetectFace, ImageDHash, ImageFormatSniff, SIGNATURE_BYTES
+from udfs.lsh import hash_bands, hamming_matches
 
 
 class ImageDetector(BaseDetector):
@@ -14,6 +17,8 @@ class ImageDetector(BaseDetector):
     Base detector for image data validation.
     """
 
+    USES_MEDIA = True
+
     def _ensure_image_bytes(self, df: daft.DataFrame) -> daft.DataFrame:
         """
         Ensure image bytes column exists for processing.
@@ -21,10 +26,16 @@ class ImageDetector(BaseDetector):
         bytes_col = f'__{self.on_column}_BYTES__'
 
         if bytes_col not in df.column_names:
-            df = df.with_column(bytes_col, col(self.on_column).url.download(on_error='null'))
+            df = df.with_column(bytes_col, self._download(self.on_column))
 
         return df, bytes_col
 
+    def intermediate_columns(self) -> List[str]:
+        """
+        Downloaded image bytes, dropped once the last image detector has run.
+        """
+        return [f'__{self.on_column}_BYTES__'] if self.USES_MEDIA else []
+
     def get_supported_constraints(self) -> List[str]:
         """
         Return supported constraint types for image data.
@@ -43,7 +54,7 @@ class ImageResolutionDetector(ImageDetector):
         # Add resolution column if not exists
         resolution_col = f'__{self.on_column}_RESOLUTION__'
         if resolution_col not in df.column_names:
-            df = df.with_column(resolution_col, image_dimension(col(bytes_col)))
+            df = df.with_column(resolution_col, self._with_resources(ImageDimension)(col(bytes_col)))
 
         # Determine if checking width (index 0) or height (index 1)
         dimension_type = self.config.get('dimension', 'width').lower()
@@ -74,8 +85,13 @@ class ImageBlurDetector(ImageDetector):
         # Get blur threshold
         threshold = self.config.get('threshold', 100.0)
 
+        # Add blur variance column if not exists
+        blur_col = f'__{self.on_column}_BLUR_VAR__'
+        if blur_col not in df.column_names:
+            df = df.with_column(blur_col, self._with_resources(ImageBlurVar)(col(bytes_col)))
+
         # Apply blur detection
-        blur_expr = image_blur_var(col(bytes_col)) >= threshold
+        blur_expr = col(blur_col) >= threshold
         df = self._add_validation_column(df, "BLUR", blur_expr)
 
         return df
@@ -92,7 +108,7 @@ class ImageAspectRatioDetector(ImageDetector):
         # Add resolution column if not exists
         resolution_col = f'__{self.on_column}_RESOLUTION__'
         if resolution_col not in df.column_names:
-            df = df.with_column(resolution_col, image_dimension(col(bytes_col)))
+            df = df.with_column(resolution_col, self._with_resources(ImageDimension)(col(bytes_col)))
 
         # Calculate aspect ratio (width/height)
         aspect_col = f'__{self.on_column}_ASPECT_RATIO__'
@@ -123,8 +139,13 @@ class ImageFaceCountDetector(ImageDetector):
         # Get expected face count (default: 0 for no faces)
         expected_count = self.config.get('expected_count', 0)
 
+        # Add face count column if not exists
+        face_col = f'__{self.on_column}_FACE_COUNT__'
+        if face_col not in df.column_names:
+            df = df.with_column(face_col, self._with_resources(DetectFace)(col(bytes_col)))
+
         # Apply face detection
-        face_count_expr = DetectFace(col(bytes_col)) == expected_count
+        face_count_expr = col(face_col) == expected_count
         df = self._add_validation_column(df, "FACE_COUNT", face_count_expr)
 
         return df
@@ -133,8 +154,33 @@ class ImageFaceCountDetector(ImageDetector):
 class ImageFormatDetector(ImageDetector):
     """
     Detector for image format validation.
+
+    With `check_content`, the format is also sniffed from the file's magic
+    bytes and must match its suffix, catching mislabelled files (e.g. a JPEG
+    or an HTML error page named `.png`). Only the first bytes are fetched,
+    unless the downloaded image bytes are already in the frame. Files that
+    cannot be read fail the check; empty paths are not checked.
     """
 
+    USES_MEDIA = False
+
+    # Suffix to the format its content must have
+    EXTENSION_FORMATS = {
+        '.jpg': 'jpeg', '.jpeg': 'jpeg', '.png': 'png', '.gif': 'gif', '.webp': 'webp',
+        '.bmp': 'bmp', '.tif': 'tiff', '.tiff': 'tiff', '.ico': 'ico',
+        '.avif': 'avif', '.heic': 'heif', '.heif': 'heif',
+    }
+
+    def intermediate_columns(self) -> List[str]:
+        """
+        The fetched file heads and sniffed formats, and any image bytes
+        downloaded by earlier detectors, which are kept until the content
+        check has read them.
+        """
+        if not self.config.get('check_content'):
+            return []
+        return [f'__{self.on_column}_HEAD__', f'__{self.on_column}_FORMAT__', f'__{self.on_column}_BYTES__']
+
     def detect(self, df: daft.DataFrame) -> daft.DataFrame:
         # For format detection, we can work with the URL/path directly
         column = col(self.on_column)
@@ -155,6 +201,38 @@ class ImageFormatDetector(ImageDetector):
 
             df = self._add_validation_column(df, "FORMAT", final_expr)
 
+        if self.config.get('check_content'):
+            df = self._check_content(df, allowed_formats)
+
+        return df
+
+    def _check_content(self, df: daft.DataFrame, allowed_formats: List[str]) -> daft.DataFrame:
+
+        # Reuse downloaded image bytes, otherwise fetch only the file head
+        bytes_col = f'__{self.on_column}_BYTES__'
+        head_col = f'__{self.on_column}_HEAD__'
+        if bytes_col in df.column_names:
+            head_col = bytes_col
+        elif head_col not in df.column_names:
+            udf = RangeDownload.with_init_args(num_bytes=SIGNATURE_BYTES, io_config=self.io_config)
+            df = df.with_column(head_col, self._with_io_resources(udf)(col(self.on_column)))
+
+        format_col = f'__{self.on_column}_FORMAT__'
+        if format_col not in df.column_names:
+            df = df.with_column(format_col, self._with_resources(ImageFormatSniff)(col(head_col)))
+
+        # Format named by the suffix; unknown suffixes never match
+        path = col(self.on_column).str.lower()
+        expected = daft.lit('')
+        for extension, fmt in self.EXTENSION_FORMATS.items():
+            if extension in [f.lower() for f in allowed_formats]:
+                expected = path.str.endswith(extension).if_else(daft.lit(fmt), expected)
+
+        # A failed download has no format: it fails rather than being skipped,
+        # while empty paths stay unchecked
+        no_path = col(self.on_column).fill_null(daft.lit('')) == ''
+        sniffed = no_path.if_else(col(format_col), col(format_col).fill_null(daft.lit('missing')))
+        df = self._add_validation_column(df, "CONTENT_FORMAT", sniffed == expected)
         return df
 
 
@@ -190,3 +268,48 @@ class ImageSizeDetector(ImageDetector):
             df = self._add_validation_column(df, f"SIZE_{constraint_type}_{i}", expression)
 
         return df
+
+
+class ImageNearDuplicateDetector(ImageDetector):
+    """
+    Detector for visually near-duplicate images using dHash and LSH banding.
+    """
+
+    ROW_LOCAL = False
+
+    def detect(self, df: daft.DataFrame) -> daft.DataFrame:
+        df, id_col = self._ensure_row_id(df)
+
+        # Hash on a narrow side branch; only the flags are joined back
+        hash_col = f'__{self.on_column}_DHASH__'
+        signatures, bytes_col = self._ensure_image_bytes(self._side_frame(df, self.on_column))
+        signatures = signatures.select(
+            col(id_col), self._with_resources(ImageDHash)(col(bytes_col)).alias(hash_col)
+        )
+
+        # With max_distance + 1 bands, any pair within max_distance shares a band
+        max_distance = self.config.get('max_distance', 4)
+        bands = self.config.get('bands', max_distance + 1)
+        if not 1 <= bands <= 32:
+            raise ValueError(f"bands must be between 1 and 32, got {bands}")
+
+        flag_col = f'__{self.name}_NEAR_DUPLICATE__'
+        df = flag_bucket_matches(
+            df,
+            signatures,
+            id_col=id_col,
+            signature_col=hash_col,
+            band_keys=hash_bands(col(hash_col), bands),
+            match_udf=lambda ids, hashes: hamming_matches(ids, hashes, max_distance),
+            flag_col=flag_col,
+            max_bucket_size=self.config.get('max_bucket_size', 1000),
+        )
+
+        df = self._add_validation_column(df, "NEAR_DUPLICATE", col(flag_col).is_null())
+        return df.exclude(flag_col)
+
+    def intermediate_columns(self) -> List[str]:
+        """
+        None: the images are downloaded on the side branch, not in the main frame.
+        """
+        return []
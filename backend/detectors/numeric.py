@@ -1,7 +1,9 @@
 """
 Numeric detectors.
 """
-from typing import Any, Dict, List
+import operator
+from functools import reduce
+from typing import Any, Dict, List, Tuple
 import daft
 from daft import col
 
@@ -11,11 +13,45 @@ from validation.base import BaseDetector, ConstraintEvaluator
 class NumericDetector(BaseDetector):
     """
     Detector for numeric data validation.
+
+    With `on_columns` (a list of columns or a regex), the checks apply to
+    every column of the group, and `group_checks` add row-wise checks across
+    the group.
     """
 
+    SUPPORTS_COLUMN_GROUPS = True
+
+    MONOTONIC = {
+        'increasing': operator.gt,
+        'decreasing': operator.lt,
+        'non_decreasing': operator.ge,
+        'non_increasing': operator.le,
+    }
+
+    @property
+    def ROW_LOCAL(self) -> bool:
+        # Outlier statistics are computed over the whole column
+        return 'statistics' not in self.config
+
     def detect(self, df: daft.DataFrame) -> daft.DataFrame:
 
-        column = col(self.on_column)
+        # Checks of every column in the group are added in one projection
+        checks = {}
+        for column_name in self._resolve_columns(df):
+            for check, expression in self._column_checks(col(column_name)):
+                checks[self._validation_column_name(check, column_name)] = expression
+
+        if self.on_columns is not None:
+            for check, expression in self._group_checks(df):
+                checks[self._validation_column_name(check, 'GROUP')] = expression
+
+        return df.with_columns(checks) if checks else df
+
+    def _column_checks(self, column: Any) -> List[Tuple[str, Any]]:
+        """
+        (check name, expression) of each configured check on one column.
+        """
+        checks = []
 
         # Handle constraints
         constraints = self.config.get('constraints', [])
@@ -33,23 +69,11 @@ class NumericDetector(BaseDetector):
             else:
                 expression = ConstraintEvaluator.evaluate_constraint(column, constraint_type, value)
 
-            df = self._add_validation_column(df, f"{constraint_type}", expression)
+            checks.append((f"{constraint_type}", expression))
 
         # Handle range validation
         if 'range' in self.config:
-            range_config = self.config['range']
-            min_val = range_config.get('min')
-            max_val = range_config.get('max')
-
-            if min_val is not None and max_val is not None:
-                expression = (column >= min_val) & (column <= max_val)
-                df = self._add_validation_column(df, "RANGE", expression)
-            elif min_val is not None:
-                expression = column >= min_val
-                df = self._add_validation_column(df, "MIN_RANGE", expression)
-            elif max_val is not None:
-                expression = column <= max_val
-                df = self._add_validation_column(df, "MAX_RANGE", expression)
+            checks.extend(self._range_checks(column, self.config['range'], ''))
 
         # Handle statistical validation
         if 'statistics' in self.config:
@@ -62,7 +86,7 @@ class NumericDetector(BaseDetector):
                 std_val = column.std()
                 z_score = abs((column - mean_val) / std_val)
                 expression = z_score <= threshold
-                df = self._add_validation_column(df, "Z_SCORE_OUTLIER", expression)
+                checks.append(("Z_SCORE_OUTLIER", expression))
 
             # IQR outlier detection
             if 'iqr_multiplier' in stats_config:
@@ -73,9 +97,66 @@ class NumericDetector(BaseDetector):
                 lower_bound = q1 - (multiplier * iqr)
                 upper_bound = q3 + (multiplier * iqr)
                 expression = (column >= lower_bound) & (column <= upper_bound)
-                df = self._add_validation_column(df, "IQR_OUTLIER", expression)
+                checks.append(("IQR_OUTLIER", expression))
 
-        return df
+        return checks
+
+    def _range_checks(self, value: Any, range_config: Dict[str, Any], prefix: str) -> List[Tuple[str, Any]]:
+
+        min_val = range_config.get('min')
+        max_val = range_config.get('max')
+
+        if min_val is not None and max_val is not None:
+            return [(f"{prefix}RANGE", (value >= min_val) & (value <= max_val))]
+        elif min_val is not None:
+            return [(f"{prefix}MIN_RANGE", value >= min_val)]
+        elif max_val is not None:
+            return [(f"{prefix}MAX_RANGE", value <= max_val)]
+        return []
+
+    def _group_checks(self, df: daft.DataFrame) -> List[Tuple[str, Any]]:
+        """
+        Row-wise checks across the whole column group (`group_checks`):
+        `sum` and `mean` ranges, and `monotonic` (increasing, decreasing,
+        non_decreasing or non_increasing) in column order over the values
+        present.
+        """
+        group_config = self.config.get('group_checks') or {}
+        columns = [col(name) for name in self._resolve_columns(df)]
+        checks = []
+
+        if 'sum' in group_config or 'mean' in group_config:
+            # Missing values count as 0 in the sum; the mean is over present values
+            total = reduce(operator.add, [column.fill_null(0) for column in columns])
+            present = reduce(operator.add, [column.not_null().cast(daft.DataType.int64()) for column in columns])
+            if 'sum' in group_config:
+                checks.extend(self._range_checks(total, group_config['sum'], 'SUM_'))
+            if 'mean' in group_config:
+                mean = (present > 0).if_else(total / present, daft.lit(None))
+                checks.extend(self._range_checks(mean, group_config['mean'], 'MEAN_'))
+
+        if 'monotonic' in group_config:
+            direction = str(group_config['monotonic']).lower()
+            compare = self.MONOTONIC[direction]
+            # Missing values are skipped: each value is compared with the last
+            # present one before it, so (3, null, 1) is not increasing
+            pairs, last = [], columns[0]
+            for following in columns[1:]:
+                pairs.append((following.not_null() & last.not_null()).if_else(compare(following, last), daft.lit(True)))
+                last = following.fill_null(last)
+            checks.append((f"MONOTONIC_{direction.upper()}", reduce(operator.and_, pairs, daft.lit(True))))
+
+        return checks
+
+    def validate_config(self) -> List[str]:
+
+        errors = super().validate_config()
+        group_config = self.config.get('group_checks') or {}
+        if group_config and self.on_columns is None:
+            errors.append("'group_checks' needs 'on_columns'")
+        if 'monotonic' in group_config and str(group_config['monotonic']).lower() not in self.MONOTONIC:
+            errors.append(f"'monotonic' must be one of {list(self.MONOTONIC)}")
+        return errors
 
     def get_supported_constraints(self) -> List[str]:
         """
@@ -92,17 +173,16 @@ class IntegerDetector(NumericDetector):
     Specialized detector for integer validation.
     """
 
-    def detect(self, df: daft.DataFrame) -> daft.DataFrame:
+    def _column_checks(self, column: Any) -> List[Tuple[str, Any]]:
 
-        df = super().detect(df)
-        column = col(self.on_column)
+        checks = super()._column_checks(column)
 
         # Check if values are actually integers
         if self.config.get('strict_integer', False):
             expression = (column % 1) == 0
-            df = self._add_validation_column(df, "IS_INTEGER", expression)
+            checks.append(("IS_INTEGER", expression))
 
-        return df
+        return checks
 
 
 class FloatDetector(NumericDetector):
@@ -110,25 +190,25 @@ class FloatDetector(NumericDetector):
     Specialized detector for float validation.
     """
 
-    def detect(self, df: daft.DataFrame) -> daft.DataFrame:
-        df = super().detect(df)
-        column = col(self.on_column)
+    def _column_checks(self, column: Any) -> List[Tuple[str, Any]]:
+
+        checks = super()._column_checks(column)
 
         # Check for infinity values
         if self.config.get('check_infinity', False):
             expression = ~column.is_inf()
-            df = self._add_validation_column(df, "NOT_INFINITY", expression)
+            checks.append(("NOT_INFINITY", expression))
 
         # Check for NaN values
         if self.config.get('check_nan', False):
             expression = ~column.is_nan()
-            df = self._add_validation_column(df, "NOT_NAN", expression)
+            checks.append(("NOT_NAN", expression))
 
         # Decimal precision validation
         if 'decimal_places' in self.config:
             precision = self.config['decimal_places']
             multiplier = 10 ** precision
             expression = ((column * multiplier) % 1) == 0
-            df = self._add_validation_column(df, f"DECIMAL_PRECISION_{precision}", expression)
+            checks.append((f"DECIMAL_PRECISION_{precision}", expression))
 
-        return df
+        return checks
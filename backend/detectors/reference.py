@@ -0,0 +1,31 @@
+"""
+Referential integrity detectors.
+"""
+from typing import List
+import daft
+
+from validation.base import BaseDetector
+from validation.reference import reference_errors
+
+
+class ReferenceDetector(BaseDetector):
+    """
+    Detector for referential integrity: every non-null value of the column
+    must exist in a reference set file, such as the key column of another
+    input CSV or an exported table of valid IDs.
+    """
+
+    def validate_config(self) -> List[str]:
+        errors = super().validate_config()
+        errors.extend(reference_errors(self.config.get('reference')))
+        return errors
+
+    def detect(self, df: daft.DataFrame) -> daft.DataFrame:
+
+        return self._add_reference_column(df, "REFERENCE", self.config['reference'])
+
+    def get_supported_constraints(self) -> List[str]:
+        """
+        Reference checks take no column constraints.
+        """
+        return []
@@ -7,6 +7,9 @@ import daft
 from daft import col
 
 from validation.base import BaseDetector, ConstraintEvaluator
+from validation.lsh import flag_bucket_matches
+from validation.reference import reference_errors
+from udfs.lsh import MinHashSignatures, minhash_bands, jaccard_matches
 
 
 class TextDetector(BaseDetector):
@@ -24,8 +27,14 @@ class TextDetector(BaseDetector):
         constraints = self.config.get('constraints', [])
         for i, constraint in enumerate(constraints):
             constraint_type = constraint['type']
-            value = constraint['value']
 
+            # IN / NOT_IN against a reference set file instead of a literal list
+            if 'reference' in constraint:
+                negate = constraint_type.upper() == 'NOT_IN'
+                df = self._add_reference_column(df, f"{constraint_type}_{i}", constraint['reference'], negate)
+                continue
+
+            value = constraint['value']
             expression = ConstraintEvaluator.evaluate_constraint(column, constraint_type, value)
             df = self._add_validation_column(df, f"{constraint_type}_{i}", expression)
 
@@ -127,8 +136,17 @@ class TextDetector(BaseDetector):
 class CategoryDetector(TextDetector):
     """
     Specialized detector for categorical data validation.
+
+    Large category lists (e.g. valid SKUs) can be read from a CSV or Parquet
+    file with `reference` instead of `valid_categories`.
     """
 
+    def validate_config(self) -> List[str]:
+        errors = super().validate_config()
+        if 'reference' in self.config:
+            errors.extend(reference_errors(self.config['reference']))
+        return errors
+
     def detect(self, df: daft.DataFrame) -> daft.DataFrame:
         """
         Apply categorical validation.
@@ -141,5 +159,83 @@ class CategoryDetector(TextDetector):
             valid_cats = self.config['valid_categories']
             expression = column.is_in(valid_cats)
             df = self._add_validation_column(df, "VALID_CATEGORY", expression)
+        elif 'reference' in self.config:
+            df = self._add_reference_column(df, "VALID_CATEGORY", self.config['reference'])
 
         return df
+
+
+class TextNearDuplicateDetector(BaseDetector):
+    """
+    Detector for near-duplicate texts using MinHash signatures and LSH banding.
+
+    Signatures are split into bands and only texts sharing a band are
+    compared, so the cost grows with the number of rows rather than pairs.
+    """
+
+    ROW_LOCAL = False
+
+    def _lsh_params(self):
+        """
+        Return `(threshold, num_perm, bands)`. Unless configured, the band count
+        is the divisor of `num_perm` whose LSH threshold `(1/b)^(b/num_perm)`
+        lies closest below `threshold`, favouring recall.
+        """
+        threshold = float(self.config.get('threshold', 0.8))
+        num_perm = int(self.config.get('num_perm', 128))
+
+        bands = self.config.get('bands')
+        if bands is None:
+            divisors = [b for b in range(1, num_perm + 1) if num_perm % b == 0]
+            below = [b for b in divisors if (1 / b) ** (b / num_perm) <= threshold]
+            bands = min(below, key=lambda b: threshold - (1 / b) ** (b / num_perm)) if below else num_perm
+
+        return threshold, num_perm, int(bands)
+
+    def validate_config(self) -> List[str]:
+        errors = super().validate_config()
+
+        threshold, num_perm, bands = self._lsh_params()
+        if not 0 < threshold <= 1:
+            errors.append(f"threshold must be in (0, 1], got {threshold}")
+        if num_perm < 1 or num_perm % bands != 0:
+            errors.append(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+        return errors
+
+    def detect(self, df: daft.DataFrame) -> daft.DataFrame:
+        df, id_col = self._ensure_row_id(df)
+        threshold, num_perm, bands = self._lsh_params()
+
+        # Sign on a narrow side branch; only the flags are joined back
+        signature_col = f'__{self.on_column}_MINHASH__'
+        minhash = MinHashSignatures.with_init_args(
+            num_perm=num_perm,
+            shingle_size=int(self.config.get('shingle_size', 5)),
+            seed=int(self.config.get('seed', 1)),
+        )
+        signatures = self._side_frame(df, self.on_column).select(
+            col(id_col),
+            self._with_resources(minhash)(col(self.on_column).cast(daft.DataType.string())).alias(signature_col),
+        )
+
+        flag_col = f'__{self.name}_NEAR_DUPLICATE__'
+        df = flag_bucket_matches(
+            df,
+            signatures,
+            id_col=id_col,
+            signature_col=signature_col,
+            band_keys=minhash_bands(col(signature_col), bands),
+            match_udf=lambda ids, sigs: jaccard_matches(ids, sigs, threshold),
+            flag_col=flag_col,
+            max_bucket_size=self.config.get('max_bucket_size', 1000),
+        )
+
+        df = self._add_validation_column(df, "NEAR_DUPLICATE", col(flag_col).is_null())
+        return df.exclude(flag_col)
+
+    def get_supported_constraints(self) -> List[str]:
+        """
+        Near-duplicate detection takes no column constraints.
+        """
+        return []
@@ -0,0 +1,185 @@
+"""
+Video detectors.
+"""
+from typing import Any, Dict, List
+import daft
+from daft import col
+
+from validation.base import BaseDetector, ConstraintEvaluator
+from udfs.video import VideoInfo, VideoFrameScores
+
+
+class VideoDetector(BaseDetector):
+    """
+    Detector for video data validation.
+
+    Duration, resolution, fps and codec come from container metadata. Frame
+    checks (blur, face count) decode only a sparse sample of frames per file,
+    reached by seeking, and score the decoded frames with the image scorers.
+    """
+
+    USES_MEDIA = True
+
+    def detect(self, df: daft.DataFrame) -> daft.DataFrame:
+        column = col(self.on_column)
+
+        # Handle constraints
+        constraints = self.config.get('constraints', [])
+        for i, constraint in enumerate(constraints):
+            constraint_type = constraint['type']
+            value = constraint.get('value')
+
+            expression = ConstraintEvaluator.evaluate_constraint(column, constraint_type, value)
+            df = self._add_validation_column(df, f"{constraint_type}_{i}", expression)
+
+        # Video file validation
+        if self.config.get('validate_video_files', True):
+            df = self._validate_video_files(df)
+
+        if 'duration_range' in self.config:
+            df = self._validate_range(df, 'duration', self.config['duration_range'], "DURATION_RANGE")
+
+        if 'fps_range' in self.config:
+            df = self._validate_range(df, 'fps', self.config['fps_range'], "FPS_RANGE")
+
+        if 'resolution' in self.config:
+            df = self._validate_resolution(df)
+
+        if 'codecs' in self.config:
+            df = self._validate_codec(df)
+
+        if 'frames' in self.config:
+            df = self._validate_frames(df)
+
+        return df
+
+    def _ensure_video_file(self, df: daft.DataFrame) -> daft.DataFrame:
+        """
+        Ensure video bytes column exists for processing.
+        """
+        bytes_col = f'__{self.on_column}_BYTES__'
+
+        if bytes_col not in df.column_names:
+            df = df.with_column(bytes_col, self._download(self.on_column))
+
+        return df, bytes_col
+
+    def intermediate_columns(self) -> List[str]:
+        """
+        Downloaded video bytes and frame scores, dropped once the last video
+        detector has run.
+        """
+        return [f'__{self.on_column}_BYTES__', self._frame_scores_column()]
+
+    def _frame_scores_column(self) -> str:
+        """
+        Name of the frame scores column, by the metrics it holds, so
+        detectors asking for other metrics do not reuse it.
+        """
+        frames = self.config.get('frames', {})
+        metrics = ''.join(
+            f'_{metric}' for metric, key in (('BLUR', 'blur_threshold'), ('FACES', 'max_face_count')) if key in frames
+        )
+        return f'__{self.on_column}_FRAME_SCORES{metrics}__'
+
+    def _ensure_video_info(self, df: daft.DataFrame) -> daft.DataFrame:
+        """
+        Ensure the container metadata column exists, opening each file once.
+        """
+        df, bytes_col = self._ensure_video_file(df)
+        info_col = f'__{self.on_column}_VIDEO_INFO__'
+
+        if info_col not in df.column_names:
+            df = df.with_column(info_col, self._with_resources(VideoInfo)(col(bytes_col)))
+
+        return df, info_col
+
+    def _validate_video_files(self, df: daft.DataFrame) -> daft.DataFrame:
+        """Validate that video files can be opened."""
+        df, info_col = self._ensure_video_info(df)
+
+        validation_expr = col(info_col).struct.get('valid')
+        return self._add_validation_column(df, "VALID_VIDEO_FILE", validation_expr)
+
+    def _validate_range(self, df: daft.DataFrame, field: str, range_config: Dict[str, Any], check: str) -> daft.DataFrame:
+        """Validate a metadata field is within `{min, max}`."""
+        df, info_col = self._ensure_video_info(df)
+
+        min_value = range_config.get('min', 0)
+        max_value = range_config.get('max', float('inf'))
+
+        value_expr = col(info_col).struct.get(field)
+        validation_expr = (value_expr >= min_value) & (value_expr <= max_value)
+
+        return self._add_validation_column(df, check, validation_expr)
+
+    def _validate_resolution(self, df: daft.DataFrame) -> daft.DataFrame:
+        """Validate frame width and height against `min_/max_width` and `min_/max_height`."""
+        df, info_col = self._ensure_video_info(df)
+
+        resolution = self.config['resolution']
+        for dimension in ('width', 'height'):
+            value_expr = col(info_col).struct.get(dimension)
+            if f'min_{dimension}' in resolution:
+                df = self._add_validation_column(
+                    df, f"MIN_{dimension.upper()}", value_expr >= resolution[f'min_{dimension}']
+                )
+            if f'max_{dimension}' in resolution:
+                df = self._add_validation_column(
+                    df, f"MAX_{dimension.upper()}", value_expr <= resolution[f'max_{dimension}']
+                )
+
+        return df
+
+    def _validate_codec(self, df: daft.DataFrame) -> daft.DataFrame:
+        """Validate the video codec (FOURCC, e.g. 'avc1') is allowed."""
+        df, info_col = self._ensure_video_info(df)
+
+        codecs = [codec.lower() for codec in self.config['codecs']]
+        validation_expr = col(info_col).struct.get('codec').is_in(codecs)
+
+        return self._add_validation_column(df, "CODEC", validation_expr)
+
+    def _ensure_frame_scores(self, df: daft.DataFrame) -> daft.DataFrame:
+        """
+        Ensure the frame scores column exists: the configured frame metrics
+        over `frames.sample` evenly spaced frames per video (default 5),
+        computed as each frame is decoded.
+        """
+        df, bytes_col = self._ensure_video_file(df)
+        scores_col = self._frame_scores_column()
+
+        if scores_col not in df.column_names:
+            frames = self.config['frames']
+            sample_frames = int(frames.get('sample', 5))
+            df = df.with_column(scores_col, self._with_resources(VideoFrameScores)(
+                col(bytes_col), sample_frames, 'blur_threshold' in frames, 'max_face_count' in frames
+            ))
+
+        return df, scores_col
+
+    def _validate_frames(self, df: daft.DataFrame) -> daft.DataFrame:
+        """Validate mean blur and maximum face count over the sampled frames."""
+        frames = self.config['frames']
+
+        if 'blur_threshold' in frames:
+            df, scores_col = self._ensure_frame_scores(df)
+            blur_col = f'__{self.on_column}_FRAME_BLUR_VAR__'
+            if blur_col not in df.column_names:
+                df = df.with_column(blur_col, col(scores_col).struct.get('blur'))
+            df = self._add_validation_column(df, "FRAME_BLUR", col(blur_col) >= frames['blur_threshold'])
+
+        if 'max_face_count' in frames:
+            df, scores_col = self._ensure_frame_scores(df)
+            face_col = f'__{self.on_column}_FRAME_FACE_COUNT__'
+            if face_col not in df.column_names:
+                df = df.with_column(face_col, col(scores_col).struct.get('faces'))
+            df = self._add_validation_column(df, "FRAME_FACE_COUNT", col(face_col) <= frames['max_face_count'])
+
+        return df
+
+    def get_supported_constraints(self) -> List[str]:
+        """Return supported constraint types for video data."""
+        return [
+            'EQUAL', 'NOT_EQUAL', 'IS_NULL', 'IS_NOT_NULL'
+        ]
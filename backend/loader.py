@@ -1,30 +1,198 @@
 import daft
-from typing import List, Optional
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from daft import DataType, Window, col
+from daft.functions import row_number
+
+from cache import SchemaCache, dtype_from_name, fingerprint, s3_markers
+
+# Row ids hold the file's position in the high bits and the row's position
+# within the file in the low ones
+ROW_ID = '__ROW_ID__'
+FILE_ROW_BITS = 32
 
 class Loader:
 
+  def __init__(
+    self,
+    schema_hints: Optional[Dict[str, str]] = None,
+    schema_cache_dir: Optional[str] = None,
+    max_files: Optional[int] = None,
+    hive_partitioning: bool = True,
+  ):
+    """
+    Initialize Loader.
+
+    `schema_hints` maps column names to type names (e.g. `{'retail': 'float64'}`)
+    and is applied to every CSV. When `schema_cache_dir` is set, inferred schemas
+    are cached there so repeat runs skip inference.
+
+    Paths may also be globs (`s3://bucket/export/*.csv`) or prefixes ending in
+    `/`; `max_files` caps how many matching shards are read, and with
+    `hive_partitioning` `key=value` directories become columns.
+    """
+    self._schema_hints = dict(schema_hints or {})
+    self._schema_cache = SchemaCache(schema_cache_dir) if schema_cache_dir else None
+    self._max_files = max_files
+    self._hive_partitioning = hive_partitioning
+    # Listings and shard markers of each glob, taken once per loader (one run)
+    self._listings = {}
+    self._markers = {}
+
   def _is_s3_path(self, path: str) -> bool:
     """
     Check if a path is an S3 endpoint (s3:// or http:// with S3 endpoint pattern).
     """
     return path.startswith('s3://') or path.startswith('http://') or path.startswith('https://')
 
+  def is_glob(self, path: str) -> bool:
+    """
+    Check if a path names a set of shards (glob pattern or prefix) rather than one file.
+    """
+    return path.endswith('/') or any(char in path for char in '*?[')
+
+  def list_files(self, pattern: str, io_config: Optional[daft.io.IOConfig] = None) -> List[Tuple[str, int]]:
+    """
+    List the (path, size) of the files matching a glob or prefix, sorted by
+    path and capped at `max_files`. A prefix matches every CSV below it.
+
+    Listing uses daft's glob, which lists directories and S3 prefixes in
+    parallel. Each pattern is listed once per loader.
+    """
+    if pattern not in self._listings:
+      glob = pattern + '**/*.csv' if pattern.endswith('/') else pattern
+      listing = daft.from_glob_path(glob, io_config=io_config).select('path', 'size').to_pydict()
+      # Local paths lose daft's `file://` scheme, as in its file path columns
+      paths = [path.removeprefix('file://') for path in listing['path']]
+      files = sorted(zip(paths, listing['size']))
+      if self._max_files is not None:
+        files = files[:self._max_files]
+      self._listings[pattern] = files
+    return self._listings[pattern]
+
+  def shard_markers(
+    self, pattern: str, io_config: Optional[daft.io.IOConfig] = None
+  ) -> List[Tuple[str, Optional[str]]]:
+    """
+    The (path, change marker) of each shard matching `pattern`, in the format
+    of `fingerprint` (size and mtime, or ETag), taken once per loader.
+
+    S3 shards take their ETags from a listing of their common prefix rather
+    than a HEAD request each; other remote shards are asked in parallel.
+    """
+    if pattern in self._markers:
+      return self._markers[pattern]
+
+    paths = [file for file, _ in self.list_files(pattern, io_config)]
+    markers = {}
+    s3_paths = [path for path in paths if path.startswith('s3://')]
+    if s3_paths:
+      bucket = s3_paths[0][len('s3://'):].split('/', 1)[0]
+      keys = [path[len(f's3://{bucket}/'):] for path in s3_paths if path.startswith(f's3://{bucket}/')]
+      try:
+        listed = s3_markers(bucket, os.path.commonprefix(keys), io_config)
+        markers.update({f's3://{bucket}/{key}': listed[key] for key in keys if key in listed})
+      except Exception:
+        pass
+
+    remaining = [path for path in paths if path not in markers]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+      markers.update(zip(remaining, pool.map(lambda path: fingerprint(path, io_config), remaining)))
+
+    self._markers[pattern] = [(path, markers[path]) for path in paths]
+    return self._markers[pattern]
+
   def load_csv(self, path: str, io_config: Optional[daft.io.IOConfig] = None):
     """
     Load a CSV file from local path or S3 endpoint.
 
+    A glob or prefix loads all matching shards as one scan.
     """
     try:
       # For S3 paths, io_config should be provided
       if self._is_s3_path(path):
         if io_config is None:
           raise ValueError(f'S3 path detected but io_config is None. Path: {path}')
-        return daft.read_csv(path=path, io_config=io_config)
+        return self._read_csv(path, io_config)
       else:
-        return daft.read_csv(path=path, io_config=None)
+        return self._read_csv(path, None)
     except Exception as e:
       raise Exception(f'Error reading csv: {path}. {str(e)}')
 
+  def _read_csv(self, path: str, io_config: Optional[daft.io.IOConfig]) -> daft.DataFrame:
+    """
+    Read a CSV (or a glob of shards), using the cached schema when the files
+    are unchanged.
+    """
+    hints = {column: dtype_from_name(name) for column, name in self._schema_hints.items()}
+
+    source, files, hive, partition_columns = path, None, False, set()
+    if self.is_glob(path):
+      files = self.list_files(path, io_config)
+      if not files:
+        raise ValueError(f'No files match {path}')
+      source, hive = [file for file, _ in files], self._hive_partitioning
+      if hive:
+        partition_columns = {part.split('=', 1)[0] for part in source[0].split('/') if '=' in part}
+
+    marker = None
+    if self._schema_cache:
+      # A shard set changes whenever a shard is added, removed or rewritten
+      if files is not None:
+        markers = self.shard_markers(path, io_config)
+        if all(shard_marker is not None for _, shard_marker in markers):
+          marker = hashlib.sha256(repr(markers).encode('utf-8')).hexdigest()
+      else:
+        marker = fingerprint(path, io_config)
+    if marker is not None:
+      cached = self._schema_cache.get(path, marker, self._schema_hints)
+      if cached is not None:
+        df = daft.read_csv(
+          path=source, infer_schema=False, schema={**cached, **hints}, io_config=io_config, hive_partitioning=hive,
+          file_path_column='__FILE__' if files is not None else None,
+        )
+        return self._add_row_id(df, files)
+
+    df = daft.read_csv(
+      path=source, schema=hints or None, io_config=io_config, hive_partitioning=hive,
+      file_path_column='__FILE__' if files is not None else None,
+    )
+
+    if marker is not None:
+      # Partition columns come from the paths, not the files' schema
+      schema = {
+        field.name: field.dtype for field in df.schema() if field.name not in partition_columns | {'__FILE__'}
+      }
+      self._schema_cache.put(path, marker, self._schema_hints, schema)
+
+    return self._add_row_id(df, files)
+
+  def _add_row_id(self, df: daft.DataFrame, files: Optional[List[Tuple[str, int]]]) -> daft.DataFrame:
+    """
+    Add a `__ROW_ID__` that follows the input order and is the same in every
+    execution: the file's position in `files` (sorted by path), then the
+    row's position within the file.
+
+    daft numbers rows in the order they reach it, which is the file order
+    for one file but not for shards read in parallel, where it changes
+    between executions. Shard rows are therefore numbered per file (read
+    with its path in `__FILE__`), which needs all rows of a file at once.
+    """
+    if files is None:
+      return df._add_monotonically_increasing_id(ROW_ID)
+
+    paths = [file for file, _ in files]
+    ordinals = daft.from_pydict({'__FILE__': paths, '__FILE_ORDINAL__': list(range(len(paths)))})
+
+    row_in_file = row_number().over(Window().partition_by('__FILE__').order_by('__SCAN_ID__')) - 1
+    df = df._add_monotonically_increasing_id('__SCAN_ID__').with_column('__FILE_ROW__', row_in_file)
+    df = df.join(ordinals, on='__FILE__', how='left')
+    row_id = col('__FILE_ORDINAL__').cast(DataType.int64()) * (1 << FILE_ROW_BITS) + col('__FILE_ROW__').cast(DataType.int64())
+    return df.with_column(ROW_ID, row_id).exclude('__FILE__', '__SCAN_ID__', '__FILE_ROW__', '__FILE_ORDINAL__')
+
   def join_csvs(
     self,
     paths: List[str],
@@ -34,6 +202,9 @@ class Loader:
   ) -> daft.DataFrame:
     """
     Load and join multiple CSV files.
+
+    Each input's row ids are kept through the joins and combined into one
+    `__ROW_ID__` per joined row (see `_join_row_id`).
     """
     if not paths:
       raise ValueError('At least one CSV path must be provided')
@@ -43,9 +214,9 @@ class Loader:
 
     # Load all CSVs
     dataframes = []
-    for path in paths:
+    for i, path in enumerate(paths):
       df = self.load_csv(path, io_config)
-      dataframes.append(df)
+      dataframes.append(df.with_column_renamed(ROW_ID, f'__ROW_ID_{i}__'))
 
     # Determine join column
     if join_on is None:
@@ -64,7 +235,23 @@ class Loader:
 
       result = result.join(df, on=join_on, how=how)
 
-    return result
+    return self._join_row_id(result, [f'__ROW_ID_{i}__' for i in range(len(paths))])
+
+  def _join_row_id(self, df: daft.DataFrame, input_ids: List[str]) -> daft.DataFrame:
+    """
+    Number joined rows by their inputs' row ids, the first input's first.
+
+    A row keeps the file of its first non-null input id, and rows of one
+    file are numbered in the order of their input ids, so a row repeated by
+    several matches still gets its own id.
+    """
+    first = daft.coalesce(*[col(c) for c in input_ids]) if len(input_ids) > 1 else col(input_ids[0])
+    file_start = (first // (1 << FILE_ROW_BITS)) * (1 << FILE_ROW_BITS)
+    df = df.with_column('__FILE_START__', file_start)
+
+    row_in_file = row_number().over(Window().partition_by('__FILE_START__').order_by(*input_ids)) - 1
+    row_id = col('__FILE_START__') + row_in_file.cast(DataType.int64())
+    return df.with_column(ROW_ID, row_id).exclude('__FILE_START__', *input_ids)
 
   def load_image(self, path: str):
     try:
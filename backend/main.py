@@ -1,9 +1,17 @@
 import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
 from profile import Profile  # type: ignore
 from validation import Detector
 import daft
 import yaml
-from reporter import create_report
+from reporter import create_report, create_chunked_report, create_reports, create_chunked_reports
+from cache.counters import drop_counters
+from cache.media import media_cache_stats
+from udfs.pipeline import pipeline_stats, utilisation_summary
 
 
 def load_detector_config(config_path):
@@ -19,6 +27,81 @@ def load_detector_config(config_path):
     except Exception as e:
         raise Exception(f"Failed to load config file: {e}")
 
+def split_config(config):
+    """
+    Split a loaded config into its detector list and settings sections.
+
+    A config is either a plain list of detectors or a mapping with a
+    `detectors` list plus optional sections such as `schema`.
+    """
+    if config is None:
+        return [], {}
+    if isinstance(config, list):
+        return config, {}
+    if isinstance(config, dict):
+        settings = {k: v for k, v in config.items() if k != 'detectors'}
+        return config.get('detectors') or [], settings
+    raise ValueError("Config must be a list of detectors or a mapping with a 'detectors' key.")
+
+# Settings that can also be set per detector; when several configs are
+# combined, each config's value applies to its own detectors
+DETECTOR_SETTINGS = ('resources', 'media_cache', 'result_cache', 'pack_validation', 'media_pipeline')
+
+def config_name(config, index):
+    """Name of a config in report paths: its file name, or its position."""
+    if isinstance(config, str):
+        return os.path.splitext(os.path.basename(config))[0]
+    return f"config{index + 1}"
+
+def merge_configs(configs):
+    """
+    Combine several configs into one detector list, run over a single scan.
+
+    Load settings (`schema`, `input`, `snapshot`, `checkpoint`) come from the
+    first config. Detector names already used by an earlier config are
+    prefixed with the config's name. Returns the detectors, the settings and
+    each config's detector names.
+    """
+    names = []
+    for i, config in enumerate(configs):
+        name = config_name(config, i)
+        names.append(name if name not in names else f"{name}{i + 1}")
+
+    merged, merged_settings, owners = [], None, {}
+    for name, config in zip(names, configs):
+        if isinstance(config, str):
+            config = load_detector_config(config)
+        detectors, settings = split_config(config)
+        if merged_settings is None:
+            merged_settings = {k: v for k, v in settings.items() if k not in DETECTOR_SETTINGS}
+
+        owners[name] = []
+        used = {detector.get('name') for detector in merged}
+        for detector in detectors:
+            detector = dict(detector)
+            for key in DETECTOR_SETTINGS:
+                if key == 'resources' and settings.get(key):
+                    detector[key] = {**settings[key], **(detector.get(key) or {})}
+                elif key in settings:
+                    detector.setdefault(key, settings[key])
+            if detector.get('name') in used:
+                detector['name'] = f"{name}_{detector['name']}"
+            merged.append(detector)
+            owners[name].append(detector.get('name', detector.get('type')))
+
+    return merged, merged_settings or {}, owners
+
+def is_config_list(config):
+    """Whether `config` is a list of configs (paths or loaded) rather than one detector list."""
+    return isinstance(config, list) and bool(config) and all(
+        isinstance(c, (str, list)) or (isinstance(c, dict) and 'detectors' in c) for c in config
+    )
+
+def report_paths(report, names):
+    """One report path per config: `report.txt` becomes `report.<config>.txt`."""
+    base, ext = os.path.splitext(report)
+    return {name: f"{base}.{name}{ext}" for name in names}
+
 def main():
 
     parser = argparse.ArgumentParser(description="Process CSV files with detectors.")
@@ -26,12 +109,13 @@ def main():
         "--csv",
         nargs="+",
         required=True,
-        help="List of CSV file paths (local or S3)."
+        help="List of CSV file paths (local or S3); globs and prefixes ending in '/' read every matching shard."
     )
     parser.add_argument(
         "--config",
+        nargs="+",
         required=True,
-        help="Path to the detector YAML config file."
+        help="Path to the detector YAML config file; several configs share one scan and each gets its own report."
     )
     parser.add_argument(
         "--s3_endpoint",
@@ -48,33 +132,171 @@ def main():
         default="./validation_report.txt",
         help="Path to save the validation report."
     )
+    parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Optional path to save a statistics snapshot for DRIFT baselines."
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Optional directory for per-partition checkpoints; reruns resume from it."
+    )
+    parser.add_argument(
+        "--chunks",
+        type=int,
+        default=None,
+        help="Optional number of row chunks to process one at a time, bounding memory use."
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print the detector plan and config errors without running it."
+    )
     args = parser.parse_args()
 
+    config = args.config[0] if len(args.config) == 1 else args.config
+
+    if args.explain:
+        _, detector, _ = build_detector(
+            args.csv, config, s3_endpoint=args.s3_endpoint, join_on=args.join_on
+        )
+        explanation, errors = detector.explain()
+        print(explanation)
+        raise SystemExit(1 if errors else 0)
+
+    run_validation(
+        args.csv, config, args.report, s3_endpoint=args.s3_endpoint, join_on=args.join_on,
+        snapshot=args.snapshot, checkpoint=args.checkpoint, chunks=args.chunks
+    )
+
+def build_detector(csv, config, s3_endpoint=None, join_on=None, stats_scope=None):
+    """
+    Load the config and CSVs and create the Detector, without running it.
+
+    `config` may also be a list of configs, combined by `merge_configs`.
+    `stats_scope` keys the run's media cache and pipeline counters.
+    """
     # Load the detector YAML file
-    detectors = load_detector_config(args.config)
+    if is_config_list(config):
+        detectors, settings, _ = merge_configs(config)
+    else:
+        if isinstance(config, str):
+            config = load_detector_config(config)
+        detectors, settings = split_config(config)
 
     # Configure S3 if endpoint is provided
     io_config = None
-    if args.s3_endpoint:
+    if s3_endpoint:
         io_config = daft.io.IOConfig(
-            s3=daft.io.S3Config(endpoint_url=args.s3_endpoint, anonymous=True)
+            s3=daft.io.S3Config(endpoint_url=s3_endpoint, anonymous=True)
         )
 
-    print(f"Joining CSVs: {args.csv}")
-    print(f"S3 Endpoint: {args.s3_endpoint}")
-    print(f"Join on column: {args.join_on}")
+    print(f"Joining CSVs: {csv}")
+    print(f"S3 Endpoint: {s3_endpoint}")
+    print(f"Join on column: {join_on}")
 
     # Create a Profile instance and load data
-    profile = Profile(args.csv, io_config=io_config, join_on=args.join_on, detectors=detectors)
+    profile = Profile(
+        csv, io_config=io_config, join_on=join_on, detectors=detectors,
+        schema=settings.get('schema'), input=settings.get('input')
+    )
     profile._load_data()
 
-    # Run the detector
-    detector = Detector(profile._data, profile._detectors)
-    df = detector.detect_issues()
+    detector = Detector(
+        profile._data, profile._detectors,
+        resources=settings.get('resources'), media_cache=settings.get('media_cache'),
+        result_cache=settings.get('result_cache'), pack_validation=settings.get('pack_validation'),
+        media_pipeline=settings.get('media_pipeline'), join_key=profile.join_key(), stats_scope=stats_scope,
+        io_config=io_config
+    )
+    return profile, detector, settings
+
+def run_validation(csv, config, report, s3_endpoint=None, join_on=None, snapshot=None, checkpoint=None, chunks=None):
+    """
+    Load the CSVs, run the detectors and write the report.
+
+    `config` is a config file path or an already loaded config. With `chunks`,
+    rows are validated in that many chunks, one at a time. Returns the report
+    path.
+
+    `config` may also be a list of configs: they run over one load and one
+    media stage, and each gets its own report (see `report_paths`); the list
+    of report paths is returned.
+    """
+    if chunks and (checkpoint or snapshot):
+        raise ValueError("chunks cannot be combined with checkpoint or snapshot")
+
+    owners = None
+    if is_config_list(config):
+        detectors, settings, owners = merge_configs(config)
+        config = {**settings, 'detectors': detectors}
+
+    # Counters of this run are kept apart, so concurrent server jobs do not mix
+    stats_scope = uuid.uuid4().hex
+    profile, detector, settings = build_detector(
+        csv, config, s3_endpoint=s3_endpoint, join_on=join_on, stats_scope=stats_scope
+    )
+    started = time.perf_counter()
+
+    if chunks:
+        chunked = detector.detect_issues_chunked(chunks)
+    else:
+        # Run the detector
+        checkpoint_config = None
+        if checkpoint:
+            checkpoint_config = {**(settings.get('checkpoint') or {}), 'dir': checkpoint, 'run_key': profile.fingerprint()}
+        df = detector.detect_issues(checkpoint=checkpoint_config)
+        if snapshot:
+            # Execute once, streaming the results to disk: the report and the
+            # snapshot's aggregation passes all read them back
+            results_dir = tempfile.mkdtemp(prefix='dvt_results_')
+            df.write_parquet(results_dir)
+            df = daft.read_parquet(os.path.join(results_dir, '*.parquet'))
+
+    # Generate the report(s)
+    if owners is None:
+        if chunks:
+            create_chunked_report(*chunked, report, check_columns=detector.check_columns)
+        else:
+            create_report(df, report, check_columns=detector.check_columns)
+        print(f"Validation report saved to {report}")
+    else:
+        paths = report_paths(report, owners)
+        outputs = {
+            paths[name]: [c for detector_name in names for c in detector.result_columns.get(detector_name, [])]
+            for name, names in owners.items()
+        }
+        if chunks:
+            create_chunked_reports(*chunked, outputs, check_columns=detector.check_columns)
+        else:
+            create_reports(df, outputs, check_columns=detector.check_columns)
+        report = list(outputs)
+        print(f"Validation reports saved to {', '.join(report)}")
+
+    if settings.get('media_cache'):
+        media_cache_dir = settings['media_cache'].get('dir', './.dvt_cache/media')
+        stats = media_cache_stats(media_cache_dir, stats_scope)
+        drop_counters(media_cache_dir, stats_scope)
+        print(f"Media cache: {', '.join(f'{k}={v}' for k, v in stats.items())}")
+
+    pipeline = settings.get('media_pipeline')
+    if pipeline:
+        pipeline_dir = pipeline.get('stats_dir', './.dvt_cache/pipeline')
+        stats = pipeline_stats(pipeline_dir, stats_scope)
+        drop_counters(pipeline_dir, stats_scope)
+        summary = utilisation_summary(
+            stats, time.perf_counter() - started, int(pipeline.get('prefetch_batches', 2)), os.cpu_count() or 1
+        )
+        print(f"Media pipeline: {summary}")
+
+    # Save a statistics snapshot for future drift checks
+    if snapshot:
+        profile.save_snapshot(df, snapshot, **(settings.get('snapshot') or {}))
+        shutil.rmtree(results_dir, ignore_errors=True)
+        print(f"Statistics snapshot saved to {snapshot}")
 
-    # Generate the report
-    create_report(df, args.report)
-    print(f"Validation report saved to {args.report}")
+    return report
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,8 @@
 # type: ignore
 import daft
 from loader import Loader
+from cache import fingerprint
+from snapshot import build_snapshot, load_snapshot, save_snapshot
 import uuid
 import datetime
 from dataclasses import dataclass
@@ -18,14 +20,26 @@ class Profile:
   _detectors = None
   _stats = None
 
-  def __init__(self, path: Union[str, List[str]], io_config: Optional[daft.io.IOConfig] = None, detectors=None, join_on: Optional[str] = None):
+  def __init__(self, path: Union[str, List[str]], io_config: Optional[daft.io.IOConfig] = None, detectors=None, join_on: Optional[str] = None, schema: Optional[dict] = None, input: Optional[dict] = None):
     """
     Initialize Profile.
+
+    `schema` is the optional `schema` section of the config, with `hints`
+    (column name to type name) and `cache_dir` for inferred schemas. `input`
+    is the optional `input` section, with `max_files` and `hive_partitioning`
+    for glob and prefix paths, and `join_how` for combining several CSVs.
     """
     self._path = path
     self._io_config = io_config
     self._detectors = detectors
     self._join_on = join_on
+    schema = schema or {}
+    input = input or {}
+    self._join_how = input.get('join_how', 'inner')
+    self._loader = Loader(
+      schema_hints=schema.get('hints'), schema_cache_dir=schema.get('cache_dir'),
+      max_files=input.get('max_files'), hive_partitioning=input.get('hive_partitioning', True)
+    )
 
 
   def _load_data(self):
@@ -34,12 +48,35 @@ class Profile:
       self._data = self._loader.join_csvs(
         paths=self._path,
         io_config=self._io_config,
-        join_on=self._join_on
+        join_on=self._join_on,
+        how=self._join_how
       )
     else:
       self._data = self._loader.load_csv(self._path, self._io_config)
 
 
+  def join_key(self) -> Optional[str]:
+    """
+    Column the inputs are joined on, or None for a single input.
+    """
+    if not isinstance(self._path, list) or len(self._path) < 2:
+      return None
+    # join_csvs defaults to the first column, which the join keeps first
+    return self._join_on or self._data.column_names[0]
+
+
+  def fingerprint(self) -> list:
+    """
+    Identify the inputs by path and file fingerprint (size/mtime or ETag).
+    Globs and prefixes are identified by the markers of their matching files,
+    shared with the loader's schema cache.
+    """
+    paths = self._path if isinstance(self._path, list) else [self._path]
+    return [
+      [path, self._loader.shard_markers(path, self._io_config) if self._loader.is_glob(path) else fingerprint(path, self._io_config)]
+      for path in paths
+    ] + [self._join_on] + ([self._join_how] if self._join_how != 'inner' else [])
+
   def _load_schema(self):
     self._schema = { col.name : col.dtype for col in self._data.schema()}
 
@@ -54,4 +91,19 @@ class Profile:
 
       self._stats[col] = { k : summary[k][i] for k in summary if k != 'column' }
 
-    print(self._stats)
\ No newline at end of file
+    print(self._stats)
+
+  def save_snapshot(self, df: daft.DataFrame, path: str, columns: Optional[List[str]] = None, bins: int = 10, top_k: int = 20, align_to: Optional[str] = None):
+    """
+    Save a statistics snapshot of `df` (typically the detector output, so
+    derived media metrics are included) for later DRIFT comparisons. Pass a
+    frame read back from stored results: each aggregation pass re-executes a
+    lazy one.
+
+    `align_to` is the path of an earlier snapshot whose bins are reused so the
+    two snapshots can be merged.
+    """
+    baseline = load_snapshot(align_to) if align_to else None
+    snapshot = build_snapshot(df, columns=columns, bins=bins, top_k=top_k, align_to=baseline)
+    save_snapshot(snapshot, path)
+    return snapshot
@@ -2,39 +2,165 @@
 Reporter module for generating validation reports from detector outputs.
 """
 import daft
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
 
+import numpy as np
+import pyarrow.compute as pc
+
+from validation.bitmask import failed_rows
+
 
 class Reporter:
     """
     Generates text reports from validation results.
+
+    Results can be added in several parts (e.g. one per chunk of rows); row
+    indexes are then taken from `__ROW_ID__` so they match a single-pass run.
+    Packed `__CHECKS_...__` bitmask columns are decoded with the side table
+    `check_columns` (mask column to check column names in bit order).
     """
 
-    def __init__(self, df: daft.DataFrame):
-        self.df = df
-        self.validation_columns = self._identify_validation_columns()
+    def __init__(self, df: Optional[daft.DataFrame] = None, check_columns: Optional[Dict[str, List[str]]] = None):
+        self.check_columns = dict(check_columns or {})
+        self.validation_columns = []
+        self.group_size_columns = []
+        self.drift_columns = []
 
-    def _identify_validation_columns(self) -> List[str]:
-        return [col for col in self.df.column_names if col.startswith('__VALID_')]
+        self.total_rows = 0
+        self.false_rows = {}
+        self.false_indices = {}
+        self.group_rows = {}
+        self.drift_scores = {}
+        self._row_ids = []
 
-    def generate_report(self, output_path: str) -> None:
+        if df is not None:
+            self.add(df)
+
+    def _identify_validation_columns(self, df: daft.DataFrame) -> List[str]:
+        return [col for col in df.column_names if col.startswith('__VALID_')]
+
+    def _identify_check_columns(self, df: daft.DataFrame) -> List[str]:
+        return [col for col in df.column_names if col.startswith('__CHECKS_')]
+
+    def _identify_group_size_columns(self, df: daft.DataFrame) -> List[str]:
+        return [col for col in df.column_names if col.startswith('__GROUP_SIZE_')]
+
+    def _identify_drift_columns(self, df: daft.DataFrame) -> List[str]:
+        return [col for col in df.column_names if col.startswith('__DRIFT_')]
+
+    def add(self, df: daft.DataFrame, count_rows: bool = True) -> None:
         """
-        Generate a text report file with validation results for each detector.
+        Stream the result columns of `df` into the report counters, one Arrow
+        batch at a time.
+
+        Pass `count_rows=False` for a part covering rows already added (e.g.
+        dataset-level results computed after the chunks): only its result
+        columns not seen before are read, and its column order is kept.
         """
-        total_rows = 0
-        false_rows = {col: 0 for col in self.validation_columns}
-        false_indices = {col: [] for col in self.validation_columns}
+        validation_columns = self._identify_validation_columns(df)
+        check_columns = self._identify_check_columns(df)
+        group_size_columns = self._identify_group_size_columns(df)
+        drift_columns = self._identify_drift_columns(df)
+
+        for column in check_columns:
+            if column not in self.check_columns:
+                raise ValueError(f"No check names for packed column '{column}'")
+
+        # Report order follows the columns; packed checks take their mask's place
+        position = {column: (i, 0) for i, column in enumerate(df.column_names)}
+        for column in check_columns:
+            for bit, check in enumerate(self.check_columns[column]):
+                position[check] = (position[column][0], bit)
+
+        if not count_rows:
+            known = set(self.false_rows) | set(self.group_rows) | set(self.drift_scores)
+            validation_columns = [c for c in validation_columns if c not in known]
+            check_columns = [c for c in check_columns if not set(self.check_columns[c]) <= known]
+            group_size_columns = [c for c in group_size_columns if c not in known]
+            drift_columns = [c for c in drift_columns if c not in known]
+
+        for column in validation_columns + [check for c in check_columns for check in self.check_columns[c]]:
+            if column not in self.false_rows:
+                self.validation_columns.append(column)
+                self.false_rows[column] = 0
+                self.false_indices[column] = []
+        for column in group_size_columns:
+            if column not in self.group_rows:
+                self.group_size_columns.append(column)
+                self.group_rows[column] = {}
+        for column in drift_columns:
+            if column not in self.drift_scores:
+                self.drift_columns.append(column)
+                self.drift_scores[column] = None
 
-        # Select validation columns
-        df = self.df.select(*self.validation_columns)
+        for columns in (self.validation_columns, self.group_size_columns, self.drift_columns):
+            columns.sort(key=lambda column: position.get(column, (-1, 0)))
 
-        for idx, row in enumerate(df.iter_rows()):
-            for column in self.validation_columns:
-                if row[column] == False:
-                    false_rows[column] += 1
-                    false_indices[column].append(idx)
-            total_rows += 1
+        # Select result columns (and row ids, to index rows across parts)
+        has_row_id = '__ROW_ID__' in df.column_names
+        df = df.select(
+            *validation_columns, *check_columns, *group_size_columns, *drift_columns,
+            *(['__ROW_ID__'] if has_row_id else [])
+        )
+
+        rows = 0
+        for batch in df.to_arrow_iter():
+            if batch.num_rows == 0:
+                continue
+            if has_row_id:
+                row_ids = batch.column('__ROW_ID__').to_numpy(zero_copy_only=False).astype(np.int64)
+            else:
+                row_ids = np.arange(self.total_rows + rows, self.total_rows + rows + batch.num_rows, dtype=np.int64)
+
+            for column in validation_columns:
+                # Only False fails; null results are not counted
+                failed = pc.fill_null(pc.invert(batch.column(column)), False).to_numpy(zero_copy_only=False)
+                self._add_failures(column, row_ids[failed])
+            for column in check_columns:
+                masks = pc.fill_null(batch.column(column), 0).to_numpy(zero_copy_only=False)
+                for bit, check in enumerate(self.check_columns[column]):
+                    self._add_failures(check, row_ids[failed_rows(masks, bit)])
+            for column in group_size_columns:
+                sizes = pc.fill_null(batch.column(column), 0).to_numpy(zero_copy_only=False)
+                values, counts = np.unique(sizes[sizes > 1], return_counts=True)
+                for size, count in zip(values.tolist(), counts.tolist()):
+                    self.group_rows[column][size] = self.group_rows[column].get(size, 0) + count
+            for column in drift_columns:
+                self.drift_scores[column] = batch.column(column)[-1].as_py()
+
+            rows += batch.num_rows
+            if count_rows:
+                self._row_ids.append(row_ids)
+
+        if count_rows:
+            self.total_rows += rows
+
+    def _add_failures(self, column: str, row_ids: np.ndarray) -> None:
+
+        if len(row_ids):
+            self.false_rows[column] += len(row_ids)
+            self.false_indices[column].append(row_ids)
+
+    def _row_indexes(self) -> Dict[str, List[int]]:
+        """
+        Map the recorded row ids of each validation column to row positions.
+        """
+        all_ids = np.sort(np.concatenate(self._row_ids)) if self._row_ids else np.empty(0, dtype=np.int64)
+        return {
+            col: np.searchsorted(all_ids, np.sort(np.concatenate(ids))).tolist() if ids else []
+            for col, ids in self.false_indices.items()
+        }
+
+    def generate_report(self, output_path: str) -> None:
+        """
+        Generate a text report file with validation results for each detector.
+        """
+        total_rows = self.total_rows
+        false_rows = self.false_rows
+        false_indices = self._row_indexes()
+        group_rows = self.group_rows
+        drift_scores = self.drift_scores
 
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
@@ -72,6 +198,27 @@ class Reporter:
 
                 f.write("\n")
 
+            for col in self.group_size_columns:
+                # Parse column name: Ignore __GROUP_SIZE_ and the last __
+                stripped_col = col[len('__GROUP_SIZE_'):-2]
+                sizes = group_rows[col]
+
+                f.write(f"{stripped_col} duplicate groups\n")
+                f.write("-" * 80 + "\n")
+                f.write(f"Duplicate groups: {sum(rows // size for size, rows in sizes.items())}\n")
+                f.write(f"Rows in duplicate groups: {sum(sizes.values())}\n")
+                for size in sorted(sizes):
+                    f.write(f"Groups of size {size}: {sizes[size] // size}\n")
+                f.write("\n")
+
+            for col in self.drift_columns:
+                # Parse column name: __DRIFT_<method>_<detector>__
+                method, _, name = col[len('__DRIFT_'):-2].partition('_')
+                f.write(f"{name} drift\n")
+                f.write("-" * 80 + "\n")
+                f.write(f"{method} score: {drift_scores[col]}\n")
+                f.write("\n")
+
             f.write("=" * 80 + "\n")
             f.write("END OF REPORT\n")
             f.write("=" * 80 + "\n")
@@ -79,7 +226,80 @@ class Reporter:
         print(f"Report generated successfully: {output_path}")
 
 
-def create_report(df: daft.DataFrame, output_path: str) -> None:
+def create_report(df: daft.DataFrame, output_path: str, check_columns: Optional[Dict[str, List[str]]] = None) -> None:
 
-    reporter = Reporter(df)
+    reporter = Reporter(df, check_columns=check_columns)
     reporter.generate_report(output_path)
+
+
+def create_chunked_report(
+    chunks: List[daft.DataFrame],
+    dataset_df: Optional[daft.DataFrame],
+    output_path: str,
+    check_columns: Optional[Dict[str, List[str]]] = None,
+) -> None:
+    """
+    Execute the chunks one at a time, streaming each into the report before
+    the next starts, then add the dataset-level results.
+    """
+    reporter = Reporter(check_columns=check_columns)
+    for i, chunk in enumerate(chunks):
+        reporter.add(chunk)
+        print(f"[Chunked] Chunk {i + 1}/{len(chunks)} done")
+
+    if dataset_df is not None:
+        reporter.add(dataset_df, count_rows=False)
+
+    reporter.generate_report(output_path)
+
+
+def _select_results(df: daft.DataFrame, columns: List[str]) -> daft.DataFrame:
+    """
+    Select the given result columns present in `df`, plus the row ids.
+    """
+    present = [c for c in columns if c in df.column_names]
+    return df.select(*present, *(['__ROW_ID__'] if '__ROW_ID__' in df.column_names else []))
+
+
+def create_reports(
+    df: daft.DataFrame,
+    outputs: Dict[str, List[str]],
+    check_columns: Optional[Dict[str, List[str]]] = None,
+) -> None:
+    """
+    Write one report per output path, each over its own result columns.
+    The plan runs once; only its result columns are kept in memory.
+    """
+    columns = list(dict.fromkeys(c for output_columns in outputs.values() for c in output_columns))
+    results = _select_results(df, columns).collect()
+
+    for output_path, output_columns in outputs.items():
+        create_report(_select_results(results, output_columns), output_path, check_columns=check_columns)
+
+
+def create_chunked_reports(
+    chunks: List[daft.DataFrame],
+    dataset_df: Optional[daft.DataFrame],
+    outputs: Dict[str, List[str]],
+    check_columns: Optional[Dict[str, List[str]]] = None,
+) -> None:
+    """
+    Like `create_chunked_report`, for several reports: each chunk runs once
+    and its results are added to every report.
+    """
+    columns = list(dict.fromkeys(c for output_columns in outputs.values() for c in output_columns))
+    reporters = {output_path: Reporter(check_columns=check_columns) for output_path in outputs}
+
+    for i, chunk in enumerate(chunks):
+        results = _select_results(chunk, columns).collect()
+        for output_path, reporter in reporters.items():
+            reporter.add(_select_results(results, outputs[output_path]))
+        print(f"[Chunked] Chunk {i + 1}/{len(chunks)} done")
+
+    if dataset_df is not None:
+        results = _select_results(dataset_df, columns).collect()
+        for output_path, reporter in reporters.items():
+            reporter.add(_select_results(results, outputs[output_path]), count_rows=False)
+
+    for output_path, reporter in reporters.items():
+        reporter.generate_report(output_path)
@@ -0,0 +1,268 @@
+"""
+Long-lived validation service.
+
+Keeps the detector plugins and media libraries of one process imported and
+runs validation jobs from a bounded queue. UDF instances (and the models they
+load) are still started per job; each job's cache and pipeline counters are
+kept apart:
+
+    POST /jobs       {"csv": [...], "config": "path.yml" | {...} | [...], "report": "...",
+                      "join_on": ..., "s3_endpoint": ..., "snapshot": ..., "checkpoint": ...,
+                      "chunks": ...}
+    GET  /jobs/<id>  job status and report location
+    GET  /health     queue and worker status
+
+Reports, snapshots and checkpoints are written inside `output_dir`, and
+config files are read from `config_dir` when one is set. Finished jobs are
+forgotten after `finished_ttl_s` seconds, or once more than `max_finished`
+have accumulated.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from main import run_validation
+from validation import registry
+
+
+def inside(directory: str, path: str, field: str) -> str:
+    """
+    Resolve `path` (relative paths against `directory`) and check that it
+    stays inside `directory`, symlinks included.
+    """
+    if not isinstance(path, str) or not path:
+        raise ValueError(f"'{field}' must be a path")
+    base = os.path.realpath(directory)
+    resolved = os.path.realpath(os.path.join(base, path))
+    if os.path.commonpath([base, resolved]) != base:
+        raise ValueError(f"'{field}' must be inside {directory}")
+    return resolved
+
+
+class JobQueue:
+    """
+    Bounded job queue consumed by a fixed pool of worker threads.
+    """
+
+    # Request fields naming files or directories the job writes
+    OUTPUT_FIELDS = ('report', 'snapshot', 'checkpoint')
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queued: int = 16,
+        output_dir: str = './reports',
+        config_dir: Optional[str] = None,
+        max_finished: int = 1000,
+        finished_ttl_s: float = 24 * 3600,
+    ):
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # Finished job ids -> finish time, oldest first
+        self._finished: Dict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.output_dir = output_dir
+        self.config_dir = config_dir
+        self.max_finished = max_finished
+        self.finished_ttl_s = finished_ttl_s
+        self._workers = [
+            threading.Thread(target=self._work, name=f'dvt-worker-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Queue a job and return its id, or None if the queue is full.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("Job request must be a JSON object")
+        for field in ('csv', 'config'):
+            if field not in request:
+                raise ValueError(f"Job request must include '{field}'")
+
+        job_id = uuid.uuid4().hex
+        request = {**request, 'config': self._config_paths(request['config'])}
+        request.setdefault('report', f'{job_id}.txt')
+        for field in self.OUTPUT_FIELDS:
+            if request.get(field) is not None:
+                request[field] = inside(self.output_dir, request[field], field)
+
+        with self._lock:
+            self._jobs[job_id] = {'id': job_id, 'status': 'queued', 'report': request['report']}
+        try:
+            self._queue.put_nowait((job_id, request))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+            return None
+        return job_id
+
+    def _config_paths(self, config: Any) -> Any:
+        """
+        Check that config file paths (alone or in a list) are inside
+        `config_dir`; inline configs are kept as they are.
+        """
+        if isinstance(config, list):
+            return [self._config_paths(item) for item in config]
+        if isinstance(config, str) and self.config_dir is not None:
+            return inside(self.config_dir, config, 'config')
+        return config
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self) -> Dict[str, Any]:
+
+        with self._lock:
+            self._expire()
+            statuses = [job['status'] for job in self._jobs.values()]
+        return {
+            'workers': len(self._workers),
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running'),
+            'done': statuses.count('done'),
+            'failed': statuses.count('failed'),
+        }
+
+    def _update(self, job_id: str, **fields):
+
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            if fields.get('status') in ('done', 'failed'):
+                self._finished[job_id] = time.monotonic()
+                self._expire()
+
+    def _expire(self):
+        """
+        Forget the oldest finished jobs past `max_finished` or
+        `finished_ttl_s`. Call with the lock held.
+        """
+        cutoff = time.monotonic() - self.finished_ttl_s
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_finished and finished_at >= cutoff:
+                break
+            del self._finished[job_id]
+            del self._jobs[job_id]
+
+    def _work(self):
+
+        while True:
+            job_id, request = self._queue.get()
+            self._update(job_id, status='running')
+            try:
+                csv = request['csv'] if isinstance(request['csv'], list) else [request['csv']]
+                report = run_validation(
+                    csv, request['config'], request['report'],
+                    s3_endpoint=request.get('s3_endpoint'),
+                    join_on=request.get('join_on'),
+                    snapshot=request.get('snapshot'),
+                    checkpoint=request.get('checkpoint'),
+                    chunks=request.get('chunks'),
+                )
+                self._update(job_id, status='done', report=report)
+            except Exception as e:
+                traceback.print_exc()
+                self._update(job_id, status='failed', error=str(e))
+            finally:
+                self._queue.task_done()
+
+
+def warm_up() -> None:
+    """
+    Import every registered detector plugin (and with it cv2, PIL, soundfile)
+    once, so jobs do not pay the import cost.
+    """
+    for detector_type in registry.list_detectors():
+        try:
+            registry.get_detector(detector_type)
+        except Exception as e:
+            print(f'[Warning] Could not load detector \'{detector_type}\': {str(e)}')
+
+
+def make_handler(jobs: JobQueue):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _send(self, status: int, body: Dict[str, Any]):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == '/health':
+                return self._send(200, jobs.stats())
+
+            if self.path.startswith('/jobs/'):
+                job = jobs.get(self.path[len('/jobs/'):])
+                if job is None:
+                    return self._send(404, {'error': 'Unknown job'})
+                return self._send(200, job)
+
+            self._send(404, {'error': 'Not found'})
+
+        def do_POST(self):
+            if self.path != '/jobs':
+                return self._send(404, {'error': 'Not found'})
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                job_id = jobs.submit(request)
+            except (ValueError, json.JSONDecodeError) as e:
+                return self._send(400, {'error': str(e)})
+
+            if job_id is None:
+                return self._send(503, {'error': 'Job queue is full'})
+            self._send(202, {'id': job_id, 'status': 'queued'})
+
+    return Handler
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Run the validation service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument("--workers", type=int, default=2, help="Jobs run concurrently.")
+    parser.add_argument("--max_queued", type=int, default=16, help="Jobs waiting before requests are rejected.")
+    parser.add_argument("--output_dir", default="./reports", help="Directory reports, snapshots and checkpoints are written in.")
+    parser.add_argument("--config_dir", default=None, help="Optional directory config files must be read from.")
+    parser.add_argument("--max_finished", type=int, default=1000, help="Finished jobs kept for status requests.")
+    parser.add_argument("--finished_ttl_s", type=float, default=24 * 3600, help="Seconds finished jobs are kept.")
+    args = parser.parse_args()
+
+    warm_up()
+    jobs = JobQueue(
+        workers=args.workers, max_queued=args.max_queued, output_dir=args.output_dir, config_dir=args.config_dir,
+        max_finished=args.max_finished, finished_ttl_s=args.finished_ttl_s,
+    )
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(jobs))
+    print(f"Validation service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
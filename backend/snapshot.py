@@ -0,0 +1,215 @@
+"""
+Compact, mergeable statistics snapshots used as drift baselines.
+
+A snapshot stores per-column counts, moments and a histogram (numeric columns)
+or top-k value counts (string columns). Histograms share bin edges with the
+snapshot they were aligned to, so snapshots of the same dataset can be merged
+and compared without the data they were built from.
+"""
+import datetime
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import daft
+from daft import DataType, col
+
+SNAPSHOT_VERSION = 1
+
+# Engine bookkeeping columns, never profiled
+_INTERNAL_PREFIXES = ('__VALID_', '__CHECKS_', '__GROUP_SIZE_', '__DRIFT_')
+_INTERNAL_COLUMNS = ('__ROW_HASH__', '__ROW_ID__')
+
+
+def snapshot_columns(df: daft.DataFrame) -> List[str]:
+    """
+    Numeric and string columns worth profiling, including derived media metrics
+    such as `__image_path_BLUR_VAR__`.
+    """
+    columns = []
+    for field in df.schema():
+        if field.name in _INTERNAL_COLUMNS or field.name.startswith(_INTERNAL_PREFIXES):
+            continue
+        if field.name.endswith('_BYTES__'):
+            continue
+        if field.dtype.is_numeric() or field.dtype == DataType.string():
+            columns.append(field.name)
+    return columns
+
+
+def histogram_bins(column: str, edges: List[float]) -> List[Any]:
+    """
+    Boolean expressions for the bins (-inf, e1), [e1, e2), ..., [en, inf).
+    """
+    c = col(column)
+    if not edges:
+        return [c.not_null()]
+
+    bins = [c < edges[0]]
+    for lo, hi in zip(edges, edges[1:]):
+        bins.append((c >= lo) & (c < hi))
+    bins.append(c >= edges[-1])
+    return bins
+
+
+def category_bins(column: str, categories: List[str]) -> List[Any]:
+    """
+    Boolean expressions for each known category plus an "other" bin.
+    """
+    c = col(column)
+    bins = [c == value for value in categories]
+    other = c.not_null()
+    if categories:
+        other = other & ~c.is_in(categories)
+    return bins + [other]
+
+
+def _count_bins(df: daft.DataFrame, bins: Dict[str, List[Any]]) -> Dict[str, List[int]]:
+    aggs = [
+        expr.if_else(1, 0).sum().alias(f'{name}__{i}')
+        for name, exprs in bins.items()
+        for i, expr in enumerate(exprs)
+    ]
+    if not aggs:
+        return {}
+
+    row = df.agg(*aggs).to_pydict()
+    return {
+        name: [row[f'{name}__{i}'][0] or 0 for i in range(len(exprs))]
+        for name, exprs in bins.items()
+    }
+
+
+def build_snapshot(
+    df: daft.DataFrame,
+    columns: Optional[List[str]] = None,
+    bins: int = 10,
+    top_k: int = 20,
+    align_to: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build a snapshot of `df` in two aggregation passes (moments, then bins).
+
+    With `align_to`, histogram edges and categories are taken from that
+    snapshot so the two can be merged.
+    """
+    columns = columns or snapshot_columns(df)
+    schema = {field.name: field.dtype for field in df.schema()}
+    aligned = (align_to or {}).get('columns', {})
+    quantiles = [i / bins for i in range(1, bins)]
+
+    numeric = [c for c in columns if schema[c].is_numeric()]
+    strings = [c for c in columns if c not in numeric]
+
+    aggs = [col(columns[0]).count('all').alias('__rows__')] if columns else []
+    for c in columns:
+        aggs.append(col(c).count().alias(f'{c}__count'))
+    for c in numeric:
+        value = col(c).cast(DataType.float64())
+        aggs += [
+            value.sum().alias(f'{c}__sum'),
+            (value * value).sum().alias(f'{c}__sum_sq'),
+            value.min().alias(f'{c}__min'),
+            value.max().alias(f'{c}__max'),
+        ]
+        if c not in aligned:
+            aggs.append(value.approx_percentiles(quantiles).alias(f'{c}__edges'))
+    moments = {k: v[0] for k, v in df.agg(*aggs).to_pydict().items()} if aggs else {'__rows__': 0}
+
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'created': datetime.datetime.now().isoformat(),
+        'rows': moments['__rows__'],
+        'columns': {},
+    }
+
+    bin_exprs = {}
+    for c in numeric:
+        if c in aligned:
+            edges = aligned[c]['edges']
+        else:
+            edges = sorted(set(e for e in (moments[f'{c}__edges'] or []) if e is not None))
+        snapshot['columns'][c] = {
+            'kind': 'numeric',
+            'count': moments[f'{c}__count'],
+            'sum': moments[f'{c}__sum'] or 0.0,
+            'sum_sq': moments[f'{c}__sum_sq'] or 0.0,
+            'min': moments[f'{c}__min'],
+            'max': moments[f'{c}__max'],
+            'edges': edges,
+        }
+        bin_exprs[c] = histogram_bins(c, edges)
+
+    for c in strings:
+        if c in aligned:
+            categories = aligned[c]['categories']
+        else:
+            top = (
+                df.where(col(c).not_null())
+                .groupby(c)
+                .agg(col(c).count().alias('__n__'))
+                .sort('__n__', desc=True)
+                .limit(top_k)
+                .to_pydict()
+            )
+            categories = top[c]
+        snapshot['columns'][c] = {
+            'kind': 'categorical',
+            'count': moments[f'{c}__count'],
+            'categories': categories,
+        }
+        bin_exprs[c] = category_bins(c, categories)
+
+    for c, counts in _count_bins(df, bin_exprs).items():
+        snapshot['columns'][c]['counts'] = counts
+
+    return snapshot
+
+
+def merge_snapshots(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge two snapshots built with the same bins (see `align_to`).
+    """
+    merged = {
+        'version': SNAPSHOT_VERSION,
+        'created': datetime.datetime.now().isoformat(),
+        'rows': a['rows'] + b['rows'],
+        'columns': {},
+    }
+
+    for name in a['columns'].keys() & b['columns'].keys():
+        x, y = a['columns'][name], b['columns'][name]
+        if x['kind'] != y['kind'] or x.get('edges') != y.get('edges') or x.get('categories') != y.get('categories'):
+            raise ValueError(f"Cannot merge column '{name}': snapshots use different bins")
+
+        column = dict(x)
+        column['count'] = x['count'] + y['count']
+        column['counts'] = [i + j for i, j in zip(x['counts'], y['counts'])]
+        if x['kind'] == 'numeric':
+            column['sum'] = x['sum'] + y['sum']
+            column['sum_sq'] = x['sum_sq'] + y['sum_sq']
+            column['min'] = min(v for v in (x['min'], y['min']) if v is not None) if x['count'] or y['count'] else None
+            column['max'] = max(v for v in (x['max'], y['max']) if v is not None) if x['count'] or y['count'] else None
+        merged['columns'][name] = column
+
+    return merged
+
+
+def save_snapshot(snapshot: Dict[str, Any], path: str) -> None:
+
+    os.makedirs(os.path.dirname(path) if os.path.dirname(path) else '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(snapshot, f, indent=2, default=str)
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+
+    try:
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Snapshot file '{path}' not found.")
+
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version in '{path}': {snapshot.get('version')}")
+    return snapshot
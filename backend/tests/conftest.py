@@ -0,0 +1,69 @@
+"""
+Shared fixtures for the backend tests.
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """
+    Small CSV with a duplicated row, repeated categories and a negative price.
+    """
+    path = tmp_path / 'data.csv'
+    path.write_text(
+        'id,retail,cat,name\n'
+        '0,10.0,A,apple\n'
+        '1,-5.0,B,banana\n'
+        '2,60.0,A,cherry\n'
+        '3,45.0,C,apple\n'
+        '4,10.0,A,apple\n'
+        '5,70.0,B,durian\n'
+    )
+    return str(path)
+
+
+def read_sections(path):
+    """
+    Parse a text report into {section title: section lines}, ignoring order.
+    """
+    with open(path) as f:
+        lines = f.read().splitlines()
+
+    sections = {}
+    for i, line in enumerate(lines):
+        if line.startswith('-' * 80):
+            body = []
+            for next_line in lines[i + 1:]:
+                if not next_line:
+                    break
+                body.append(next_line)
+            sections[lines[i - 1]] = body
+    sections['Total rows'] = [line for line in lines if line.startswith('Total rows:')]
+    return sections
+
+
+@pytest.fixture
+def sharded_text(tmp_path):
+    """
+    400 rows of random words, as 8 CSV shards and as one file. Rows 55, 120,
+    205, 300 and 380 copy row 10's text; `id` runs 0..399 in file order.
+    """
+    rng = random.Random(7)
+    texts = [' '.join(''.join(rng.choice('abcdefghij') for _ in range(6)) for _ in range(30)) for _ in range(400)]
+    for row in (55, 120, 205, 300, 380):
+        texts[row] = texts[10]
+    lines = [f'{i},{text}\n' for i, text in enumerate(texts)]
+
+    shards = tmp_path / 'shards'
+    shards.mkdir()
+    for shard in range(8):
+        (shards / f'part{shard}.csv').write_text('id,txt\n' + ''.join(lines[shard * 50:(shard + 1) * 50]))
+    single = tmp_path / 'single.csv'
+    single.write_text('id,txt\n' + ''.join(lines))
+    return str(shards / '*.csv'), str(single)
@@ -0,0 +1,87 @@
+"""
+AUDIO content statistics (silence, clipping, DC offset) on synthetic WAVs.
+"""
+import io
+
+import daft
+import numpy as np
+import pytest
+import soundfile as sf
+
+from conftest import read_sections
+from main import run_validation
+from udfs.audio import AudioContent
+
+RATE = 16000
+
+
+def _tone(seconds, amplitude=0.5, offset=0.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return amplitude * np.sin(2 * np.pi * 440 * t) + offset
+
+
+def _wav(samples):
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, RATE, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def recordings():
+    """
+    Clean tone, half silence, clipped tone, DC offset, a stereo file with the
+    offset on one channel only, and a file that is not audio. Most lengths are
+    not multiples of the window, so trailing partial windows are exercised.
+    """
+    # Eight silent and eight sounding 1024-frame windows
+    silent_half = np.concatenate([np.zeros(8 * 1024), _tone(8 * 1024 / RATE)])
+    stereo = np.stack([_tone(1.01), _tone(1.01, amplitude=0.3, offset=0.25)], axis=1)
+    return [
+        _wav(_tone(1.01)),
+        _wav(silent_half),
+        _wav(np.clip(_tone(1.01, amplitude=2.0), -1, 1)),
+        _wav(_tone(1.01, amplitude=0.3, offset=0.2)),
+        _wav(stereo),
+        b'not a wav file',
+    ]
+
+
+def _content(recordings, block_windows):
+    series = daft.Series.from_pylist(recordings + [None])
+    return AudioContent.inner()(series, -60.0, 0.999, 1024, block_windows).to_pylist()
+
+
+def test_content_statistics(recordings):
+    clean, silent_half, clipped, offset, stereo, broken, missing = _content(recordings, 4)
+
+    assert clean['silence_ratio'] == 0 and clean['clipping_ratio'] == 0
+    assert clean['dc_offset'] < 1e-3
+    assert silent_half['silence_ratio'] == 0.5
+    # |2 sin| >= 1 for two thirds of each period
+    assert clipped['clipping_ratio'] == pytest.approx(2 / 3, abs=0.05)
+    assert offset['dc_offset'] == pytest.approx(0.2, abs=1e-3)
+    assert stereo['dc_offset'] == pytest.approx(0.25, abs=1e-3)
+    assert broken is None and missing is None
+
+
+def test_block_size_does_not_change_results(recordings):
+    assert _content(recordings, 1) == _content(recordings, 32)
+
+
+def test_content_checks_in_report(recordings, tmp_path):
+    rows = []
+    for i, data in enumerate(recordings):
+        path = tmp_path / f'audio{i}.wav'
+        path.write_bytes(data)
+        rows.append(f'{i},{path}\n')
+    csv = tmp_path / 'audio.csv'
+    csv.write_text('id,audio_path\n' + ''.join(rows))
+    config = {'detectors': [{
+        'name': 'voice', 'type': 'AUDIO', 'on_column': 'audio_path',
+        'content': {'max_silence_ratio': 0.25, 'max_clipping_ratio': 0.001, 'max_dc_offset': 0.05},
+    }]}
+    sections = read_sections(run_validation([str(csv)], config, str(tmp_path / 'report.txt')))
+
+    assert sections['voice_SILENCE_RATIO_audio_path'][-1] == 'Invalid rows indexes: [1]'
+    assert sections['voice_CLIPPING_RATIO_audio_path'][-1] == 'Invalid rows indexes: [2]'
+    assert sections['voice_DC_OFFSET_audio_path'][-1] == 'Invalid rows indexes: [3, 4]'
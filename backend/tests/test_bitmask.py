@@ -0,0 +1,55 @@
+"""
+Packing check columns into bitmasks and decoding them in the Reporter.
+"""
+import daft
+import numpy as np
+
+from conftest import read_sections
+from main import run_validation
+from validation.bitmask import BITS_PER_MASK, failed_rows, pack_checks
+
+
+def test_pack_checks_round_trip():
+    columns = [f'__VALID_d_C{i}_x__' for i in range(BITS_PER_MASK + 2)]
+    data = {c: [True, False, None] if i % 2 else [False, True, True] for i, c in enumerate(columns)}
+    df, packed = pack_checks(daft.from_pydict(data), 'd', columns)
+
+    assert list(packed) == ['__CHECKS_d_0__', '__CHECKS_d_1__']
+    assert packed['__CHECKS_d_1__'] == columns[BITS_PER_MASK:]
+    assert not any(c.startswith('__VALID_') for c in df.column_names)
+
+    result = df.to_pydict()
+    for mask_col, checks in packed.items():
+        masks = np.array(result[mask_col], dtype=np.int64)
+        for bit, check in enumerate(checks):
+            # Only False fails; null never does
+            expected = [value is False for value in data[check]]
+            assert failed_rows(masks, bit).tolist() == expected
+
+
+def test_packed_report_matches_unpacked(csv_path, tmp_path):
+    config = {'detectors': [
+        {'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0, 'max': 50}},
+    ]}
+    expected = run_validation([csv_path], config, str(tmp_path / 'plain.txt'))
+    packed = run_validation([csv_path], {**config, 'pack_validation': True}, str(tmp_path / 'packed.txt'))
+
+    assert read_sections(packed) == read_sections(expected)
+
+
+def test_packed_checkpoint_resume(csv_path, tmp_path):
+    config = {
+        'pack_validation': True,
+        'detectors': [
+            {'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0, 'max': 50}},
+            {'name': 'dup', 'type': 'DUPLICATE_ROW'},
+        ],
+    }
+    checkpoint = str(tmp_path / 'ckpt')
+    expected = run_validation([csv_path], config, str(tmp_path / 'plain.txt'))
+
+    first = run_validation([csv_path], config, str(tmp_path / 'first.txt'), checkpoint=checkpoint)
+    resumed = run_validation([csv_path], config, str(tmp_path / 'resumed.txt'), checkpoint=checkpoint)
+
+    assert read_sections(first) == read_sections(expected)
+    assert read_sections(resumed) == read_sections(expected)
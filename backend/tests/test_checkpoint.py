@@ -0,0 +1,64 @@
+"""
+Checkpointed runs, including runs resumed with every partition complete.
+"""
+import os
+import shutil
+
+from conftest import read_sections
+from main import run_validation
+
+
+CONFIG_A = {'detectors': [{'name': 'retail', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 40}}]}
+CONFIG_B = {
+    'detectors': [
+        {'name': 'retail', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'max': 50}},
+        {'name': 'dup', 'type': 'DUPLICATE_ROW', 'key_columns': ['cat']},
+    ],
+}
+
+
+def test_resume_matches_single_pass(csv_path, tmp_path):
+    checkpoint = str(tmp_path / 'ckpt')
+    expected = run_validation([csv_path], CONFIG_B, str(tmp_path / 'plain.txt'))
+
+    first = run_validation([csv_path], CONFIG_B, str(tmp_path / 'first.txt'), checkpoint=checkpoint)
+    resumed = run_validation([csv_path], CONFIG_B, str(tmp_path / 'resumed.txt'), checkpoint=checkpoint)
+
+    assert read_sections(first) == read_sections(expected)
+    assert read_sections(resumed) == read_sections(expected)
+
+
+def test_resume_multi_config_keeps_row_local_results(csv_path, tmp_path):
+    checkpoint = str(tmp_path / 'ckpt')
+    configs = [CONFIG_A, CONFIG_B]
+    first = run_validation([csv_path], configs, str(tmp_path / 'first.txt'), checkpoint=checkpoint)
+    resumed = run_validation([csv_path], configs, str(tmp_path / 'resumed.txt'), checkpoint=checkpoint)
+
+    for first_path, resumed_path in zip(first, resumed):
+        assert read_sections(resumed_path) == read_sections(first_path)
+
+    assert 'retail_MIN_RANGE_retail' in read_sections(resumed[0])
+    assert 'config2_retail_MAX_RANGE_retail' in read_sections(resumed[1])
+
+
+def test_sharded_resume_matches_single_file(sharded_text, tmp_path):
+    shards, single = sharded_text
+    checkpoint = str(tmp_path / 'ckpt')
+    config = {
+        'checkpoint': {'partitions': 4},
+        'detectors': [
+            {'name': 'rng', 'type': 'NUMERIC', 'on_column': 'id', 'range': {'min': 0, 'max': 99}},
+            {'name': 'nd', 'type': 'TEXT_NEAR_DUPLICATE', 'on_column': 'txt', 'threshold': 0.8},
+        ],
+    }
+    expected = read_sections(run_validation([single], config, str(tmp_path / 'plain.txt')))
+
+    first = run_validation([shards], config, str(tmp_path / 'first.txt'), checkpoint=checkpoint)
+    # Drop one partition so the resumed run recomputes it in a new execution
+    store = os.path.join(checkpoint, os.listdir(checkpoint)[0])
+    shutil.rmtree(os.path.join(store, 'part-00002'))
+    resumed = run_validation([shards], config, str(tmp_path / 'resumed.txt'), checkpoint=checkpoint)
+
+    assert read_sections(first) == expected
+    assert read_sections(resumed) == expected
+    assert expected['rng_RANGE_id'][-1] == f'Invalid rows indexes: {list(range(100, 400))}'
@@ -0,0 +1,58 @@
+"""
+Numeric checks over column groups (`on_columns`) and row-wise group checks.
+"""
+import pytest
+
+from conftest import read_sections
+from main import run_validation
+
+
+@pytest.fixture
+def weeks_csv(tmp_path):
+    """
+    Week columns stored out of order (2, 0, 1), with a gap and an empty row.
+    """
+    path = tmp_path / 'weeks.csv'
+    path.write_text(
+        'id,2,0,1\n'
+        '0,3,1,2\n'
+        '1,1,3,\n'
+        '2,,,\n'
+        '3,2,1,1\n'
+        '4,7,5,6\n'
+    )
+    return str(path)
+
+
+def _group(name, on_columns, **group_checks):
+    return {'name': name, 'type': 'NUMERIC', 'on_columns': on_columns, 'group_checks': group_checks}
+
+
+def test_monotonic_follows_list_or_data_order(weeks_csv, tmp_path):
+    config = {'detectors': [
+        _group('listed', ['0', '1', '2'], monotonic='increasing'),
+        _group('matched', r'^\d+$', monotonic='increasing'),
+        _group('listed_nd', ['0', '1', '2'], monotonic='non_decreasing'),
+    ]}
+    sections = read_sections(run_validation([weeks_csv], config, str(tmp_path / 'report.txt')))
+
+    # (3, null, 1) compares 1 with 3; an all-null row has nothing to compare
+    assert sections['listed_MONOTONIC_INCREASING_GROUP'][-1] == 'Invalid rows indexes: [1, 3]'
+    # The regex takes the data's column order: 2, 0, 1
+    assert sections['matched_MONOTONIC_INCREASING_GROUP'][-1] == 'Invalid rows indexes: [0, 3, 4]'
+    assert sections['listed_nd_MONOTONIC_NON_DECREASING_GROUP'][-1] == 'Invalid rows indexes: [1]'
+
+
+def test_group_sum_mean_and_column_checks(weeks_csv, tmp_path):
+    config = {'detectors': [
+        {**_group('weeks', r'^\d+$', sum={'min': 1}, mean={'max': 2}), 'range': {'min': 2}},
+    ]}
+    sections = read_sections(run_validation([weeks_csv], config, str(tmp_path / 'report.txt')))
+
+    # Missing values count as 0 in the sum; the mean is over present values
+    assert sections['weeks_SUM_MIN_RANGE_GROUP'][-1] == 'Invalid rows indexes: [2]'
+    assert sections['weeks_MEAN_MAX_RANGE_GROUP'][-1] == 'Invalid rows indexes: [4]'
+    # Column checks run on every matched column
+    assert sections['weeks_MIN_RANGE_0'][-1] == 'Invalid rows indexes: [0, 3]'
+    assert sections['weeks_MIN_RANGE_1'][-1] == 'Invalid rows indexes: [3]'
+    assert sections['weeks_MIN_RANGE_2'][-1] == 'Invalid rows indexes: [1]'
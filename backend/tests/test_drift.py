@@ -0,0 +1,80 @@
+"""
+Statistics snapshots and DRIFT scores against them.
+"""
+from conftest import read_sections
+from main import run_validation
+from snapshot import load_snapshot
+
+
+def _drift_score(sections, name):
+    return float(sections[f'{name} drift'][0].split(': ')[1])
+
+
+def test_drift_against_own_snapshot(csv_path, tmp_path):
+    baseline = str(tmp_path / 'baseline.json')
+    config = {'detectors': [{'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0}}]}
+    run_validation([csv_path], config, str(tmp_path / 'first.txt'), snapshot=baseline)
+
+    snapshot = load_snapshot(baseline)
+    assert snapshot['rows'] == 6
+    assert snapshot['columns']['cat']['categories'][0] == 'A'
+
+    drift = {'detectors': [
+        {'name': 'price_drift', 'type': 'DRIFT', 'on_column': 'retail', 'baseline': baseline},
+        {'name': 'cat_drift', 'type': 'DRIFT', 'on_column': 'cat', 'baseline': baseline, 'method': 'KS'},
+    ]}
+    sections = read_sections(run_validation([csv_path], drift, str(tmp_path / 'drift.txt')))
+
+    assert _drift_score(sections, 'price_drift') < 1e-6
+    assert _drift_score(sections, 'cat_drift') < 1e-6
+    assert sections['price_drift_DRIFT_PSI_retail'][-1] == 'Invalid rows indexes: []'
+
+
+def test_drift_on_shifted_data(csv_path, tmp_path):
+    baseline = str(tmp_path / 'baseline.json')
+    config = {'detectors': [{'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0}}]}
+    run_validation([csv_path], config, str(tmp_path / 'first.txt'), snapshot=baseline)
+
+    shifted = tmp_path / 'shifted.csv'
+    shifted.write_text('id,retail,cat,name\n' + ''.join(f'{i},{1000 + i},Z,x\n' for i in range(6)))
+    drift = {'detectors': [
+        {'name': 'price_drift', 'type': 'DRIFT', 'on_column': 'retail', 'baseline': baseline},
+        {'name': 'cat_drift', 'type': 'DRIFT', 'on_column': 'cat', 'baseline': baseline, 'method': 'KS'},
+    ]}
+    sections = read_sections(run_validation([str(shifted)], drift, str(tmp_path / 'drift.txt')))
+
+    assert _drift_score(sections, 'price_drift') > 0.2
+    assert _drift_score(sections, 'cat_drift') > 0.9
+    assert sections['price_drift_DRIFT_PSI_retail'][-1] == 'Invalid rows indexes: [0, 1, 2, 3, 4, 5]'
+
+
+def test_drift_on_derived_column_after_other_drifts(tmp_path):
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(3)
+    rows = []
+    for i in range(6):
+        path = tmp_path / f'img{i}.png'
+        cv2.imwrite(str(path), (rng.random((32, 32)) * 40 * (i + 1)).astype(np.uint8))
+        rows.append(f'{i},{10 * i},{"AB"[i % 2]},{path}\n')
+    csv = tmp_path / 'images.csv'
+    csv.write_text('id,retail,cat,image_path\n' + ''.join(rows))
+
+    baseline = str(tmp_path / 'baseline.json')
+    blur = {'name': 'blur', 'type': 'IMAGE_BLUR', 'on_column': 'image_path', 'threshold': 0}
+    run_validation([str(csv)], {'detectors': [blur]}, str(tmp_path / 'first.txt'), snapshot=baseline)
+
+    # The derived blur column is counted on the full frame, after the
+    # earlier drift scores are joined to it
+    drift = {'detectors': [
+        blur,
+        {'name': 'price_drift', 'type': 'DRIFT', 'on_column': 'retail', 'baseline': baseline},
+        {'name': 'cat_drift', 'type': 'DRIFT', 'on_column': 'cat', 'baseline': baseline, 'method': 'KS'},
+        {'name': 'blur_drift', 'type': 'DRIFT', 'on_column': '__image_path_BLUR_VAR__', 'baseline': baseline},
+    ]}
+    sections = read_sections(run_validation([str(csv)], drift, str(tmp_path / 'drift.txt')))
+
+    assert sections['Total rows'] == ['Total rows: 6']
+    assert _drift_score(sections, 'price_drift') < 1e-6
+    assert _drift_score(sections, 'blur_drift') < 1e-6
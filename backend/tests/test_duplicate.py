@@ -0,0 +1,48 @@
+"""
+Exact duplicate grouping on the row hash or key columns.
+"""
+from conftest import read_sections
+from main import run_validation
+
+
+def test_duplicate_rows_and_key_groups(csv_path, tmp_path):
+    config = {'detectors': [
+        {'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0}},
+        {'name': 'dups', 'type': 'DUPLICATE_ROW'},
+        {'name': 'catdups', 'type': 'DUPLICATE_ROW', 'key_columns': ['cat']},
+    ]}
+    sections = read_sections(run_validation([csv_path], config, str(tmp_path / 'report.txt')))
+
+    # Rows differ in `id`, so no whole-row duplicates
+    assert sections['dups_DUPLICATE_ROW_ROW'][-1] == 'Invalid rows indexes: []'
+    assert sections['catdups_DUPLICATE_ROW_cat'][-1] == 'Invalid rows indexes: [0, 1, 2, 4, 5]'
+    assert sections['catdups duplicate groups'] == [
+        'Duplicate groups: 2',
+        'Rows in duplicate groups: 5',
+        'Groups of size 2: 1',
+        'Groups of size 3: 1',
+    ]
+    assert sections['price_MIN_RANGE_retail'][-1] == 'Invalid rows indexes: [1]'
+
+
+def test_whole_row_duplicates(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('a,b\n1,x\n2,y\n1,x\n1,x\n')
+    config = {'detectors': [{'name': 'dups', 'type': 'DUPLICATE_ROW'}]}
+    sections = read_sections(run_validation([str(path)], config, str(tmp_path / 'report.txt')))
+
+    assert sections['dups_DUPLICATE_ROW_ROW'][-1] == 'Invalid rows indexes: [0, 2, 3]'
+    assert sections['dups duplicate groups'][-1] == 'Groups of size 3: 1'
+
+
+def test_sharded_duplicates_with_unique_rows(sharded_text, tmp_path):
+    shards, single = sharded_text
+    config = {'detectors': [{'name': 'dups', 'type': 'DUPLICATE_ROW', 'key_columns': ['txt']}]}
+    reports = [
+        read_sections(run_validation([path], config, str(tmp_path / f'{name}.txt')))
+        for name, path in (('shards', shards), ('single', single))
+    ]
+
+    assert reports[0] == reports[1]
+    assert reports[0]['dups_DUPLICATE_ROW_txt'][-1] == 'Invalid rows indexes: [10, 55, 120, 205, 300, 380]'
+    assert reports[0]['dups duplicate groups'][-1] == 'Groups of size 6: 1'
@@ -0,0 +1,38 @@
+"""
+Detector plan summaries from `--explain`.
+"""
+import daft
+import pytest
+
+from main import build_detector, run_validation
+
+
+def refuse_execution(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError('explain executed the plan')
+
+    for method in ('collect', 'iter_partitions', 'to_arrow_iter', '_materialize_results'):
+        monkeypatch.setattr(daft.DataFrame, method, refuse)
+
+
+def test_explain_counts_registered_downloads_and_decodes(csv_path, tmp_path):
+    baseline = str(tmp_path / 'baseline.json')
+    run_validation([csv_path], {'detectors': []}, str(tmp_path / 'first.txt'), snapshot=baseline)
+
+    images = tmp_path / 'images.csv'
+    images.write_text('id,retail,image_path\n' + ''.join(f'{i},{i}.0,{tmp_path}/{i}.png\n' for i in range(3)))
+    config = {'detectors': [
+        {'name': 'res', 'type': 'IMAGE_RESOLUTION', 'on_column': 'image_path', 'min_width': 1},
+        {'name': 'blur', 'type': 'IMAGE_BLUR', 'on_column': 'image_path'},
+        {'name': 'fmt', 'type': 'IMAGE_FORMAT', 'on_column': 'image_path', 'allowed_formats': ['.png'], 'check_content': True},
+        {'name': 'drift', 'type': 'DRIFT', 'on_column': 'retail', 'baseline': baseline},
+    ]}
+    _, detector, _ = build_detector([str(images)], config)
+
+    with pytest.MonkeyPatch.context() as patch:
+        refuse_execution(patch)
+        explanation, errors = detector.explain()
+
+    assert errors == []
+    assert 'Downloads per column:\n  image_path: 1\n' in explanation
+    assert 'image_path: 3 (ImageDimension, ImageBlurVar, ImageFormatSniff)' in explanation
@@ -0,0 +1,56 @@
+"""
+IMAGE_FORMAT content checks.
+"""
+from conftest import read_sections
+from main import run_validation
+
+
+def test_content_format(tmp_path):
+    images = tmp_path / 'images'
+    images.mkdir()
+    (images / 'good.png').write_bytes(b'\x89PNG\r\n\x1a\n' + b'\x00' * 32)
+    (images / 'page.png').write_bytes(b'<html>not found</html>')
+    (images / 'empty.png').write_bytes(b'')
+    (images / 'photo.jpg').write_bytes(b'\xff\xd8\xff\xe0' + b'\x00' * 32)
+    paths = ['good.png', 'page.png', 'empty.png', 'missing.png', 'photo.jpg']
+
+    csv = tmp_path / 'images.csv'
+    csv.write_text('id,image_path\n' + ''.join(f'{i},{images / name}\n' for i, name in enumerate(paths)) + '5,\n')
+    config = {'detectors': [
+        {'name': 'fmt', 'type': 'IMAGE_FORMAT', 'on_column': 'image_path',
+         'allowed_formats': ['.jpg', '.png'], 'check_content': True},
+    ]}
+    sections = read_sections(run_validation([str(csv)], config, str(tmp_path / 'report.txt')))
+
+    # Unreadable and mislabelled files fail; the empty path is not checked
+    assert sections['fmt_CONTENT_FORMAT_image_path'][-1] == 'Invalid rows indexes: [1, 2, 3]'
+
+
+def _ftyp(major, *compatible):
+    body = major + b'\x00\x00\x00\x00' + b''.join(compatible)
+    return (8 + len(body)).to_bytes(4, 'big') + b'ftyp' + body + b'\x00' * 32
+
+
+def test_heif_family_brands(tmp_path):
+    files = {
+        'generic.heic': _ftyp(b'mif1', b'mif1', b'heic'),
+        'photo.heic': _ftyp(b'heic', b'mif1', b'heic'),
+        'photo.heif': _ftyp(b'heic', b'mif1', b'heic'),
+        'generic.avif': _ftyp(b'mif1', b'mif1', b'avif'),
+        'avif.heic': _ftyp(b'mif1', b'mif1', b'avif'),
+        'sequence.heif': _ftyp(b'msf1', b'msf1', b'hevc'),
+    }
+    rows = []
+    for i, (name, data) in enumerate(files.items()):
+        (tmp_path / name).write_bytes(data)
+        rows.append(f'{i},{tmp_path / name}\n')
+    csv = tmp_path / 'images.csv'
+    csv.write_text('id,image_path\n' + ''.join(rows))
+    config = {'detectors': [
+        {'name': 'fmt', 'type': 'IMAGE_FORMAT', 'on_column': 'image_path',
+         'allowed_formats': ['.heic', '.heif', '.avif'], 'check_content': True},
+    ]}
+    sections = read_sections(run_validation([str(csv)], config, str(tmp_path / 'report.txt')))
+
+    # Only the AVIF (told apart by its compatible brands) named .heic fails
+    assert sections['fmt_CONTENT_FORMAT_image_path'][-1] == 'Invalid rows indexes: [4]'
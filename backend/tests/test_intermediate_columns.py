@@ -0,0 +1,45 @@
+"""
+Media bytes columns are projected away after their last consumer.
+"""
+import cv2
+import numpy as np
+
+from main import build_detector
+from validation import registry
+
+
+def test_bytes_dropped_after_last_consumer(tmp_path, monkeypatch):
+    rows = []
+    for i in range(3):
+        path = tmp_path / f'img{i}.png'
+        cv2.imwrite(str(path), np.full((8, 8, 3), 40 * i, dtype=np.uint8))
+        rows.append(f'{i},{path},{i}\n')
+    csv = tmp_path / 'images.csv'
+    csv.write_text('id,image_path,retail\n' + ''.join(rows))
+
+    # Columns each detector receives, by detector name
+    seen = {}
+    for detector_type in ('IMAGE_BLUR', 'IMAGE_FACE_COUNT', 'NUMERIC'):
+        detector_class = registry.get_detector(detector_type)
+        detect = detector_class.detect
+
+        def recording(self, df, detect=detect):
+            seen[self.name] = df.column_names
+            return detect(self, df)
+        monkeypatch.setattr(detector_class, 'detect', recording)
+
+    config = {'detectors': [
+        {'name': 'blur', 'type': 'IMAGE_BLUR', 'on_column': 'image_path', 'threshold': 100},
+        {'name': 'faces', 'type': 'IMAGE_FACE_COUNT', 'on_column': 'image_path', 'expected_count': 0},
+        {'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0}},
+    ]}
+    _, detector, _ = build_detector([str(csv)], config)
+    df = detector.detect_issues()
+
+    bytes_col = '__image_path_BYTES__'
+    assert bytes_col in seen['faces']
+    assert bytes_col not in seen['price']
+    assert bytes_col not in df.column_names
+    # Derived metrics stay
+    assert '__image_path_BLUR_VAR__' in df.column_names
+    assert len(df.to_pydict()['__ROW_ID__']) == 3
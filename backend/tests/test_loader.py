@@ -0,0 +1,61 @@
+"""
+Shard-set loading and schema caching.
+"""
+import os
+
+import loader
+from conftest import read_sections
+from loader import Loader
+from main import run_validation
+
+
+def test_cached_shard_schema_follows_rewritten_shard(tmp_path):
+    shards = tmp_path / 'shards'
+    shards.mkdir()
+    (shards / 'a.csv').write_text('id,code\n1,10\n')
+    (shards / 'b.csv').write_text('id,code\n2,20\n')
+    df = Loader(schema_cache_dir=str(tmp_path / 'schemas')).load_csv(str(shards / '*.csv'))
+    assert str(df.schema()['code'].dtype) == 'Int64'
+    assert len(os.listdir(tmp_path / 'schemas')) == 1
+
+    # Same size and path, new content: only the shard's mtime tells them apart
+    (shards / 'a.csv').write_text('id,code\n1,xy\n')
+    os.utime(shards / 'a.csv', ns=(1, 1))
+    # A new run (a new loader) lists and marks the shards again
+    df = Loader(schema_cache_dir=str(tmp_path / 'schemas')).load_csv(str(shards / '*.csv'))
+    assert str(df.schema()['code'].dtype) == 'String'
+    assert sorted(df.to_pydict()['code']) == ['20', 'xy']
+    assert len(os.listdir(tmp_path / 'schemas')) == 2
+
+
+def test_hive_shards_with_detectors(tmp_path):
+    for region, rows in (('us', ['3,-1.0', '4,8.0']), ('eu', ['1,5.0', '2,-2.0'])):
+        shard = tmp_path / 'export' / f'region={region}'
+        shard.mkdir(parents=True)
+        (shard / 'part0.csv').write_text('id,retail\n' + ''.join(f'{row}\n' for row in rows))
+    config = {'detectors': [
+        {'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0}},
+        {'name': 'region', 'type': 'CATEGORY', 'on_column': 'region', 'valid_categories': ['eu']},
+    ]}
+    sections = read_sections(run_validation([str(tmp_path / 'export') + '/'], config, str(tmp_path / 'report.txt')))
+
+    # Rows count in path order: region=eu first
+    assert sections['price_MIN_RANGE_retail'][-1] == 'Invalid rows indexes: [1, 2]'
+    assert sections['region_VALID_CATEGORY_region'][-1] == 'Invalid rows indexes: [2, 3]'
+
+
+def test_shards_are_listed_and_marked_once_per_run(monkeypatch, tmp_path):
+    shards = tmp_path / 'shards'
+    shards.mkdir()
+    for i in range(3):
+        (shards / f'part{i}.csv').write_text(f'id,retail\n{i},1.0\n')
+    calls = []
+    monkeypatch.setattr(loader, 'fingerprint', lambda path, io_config=None: calls.append(path) or 'marker')
+
+    config = {
+        'schema': {'cache_dir': str(tmp_path / 'schemas')},
+        'detectors': [{'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0}}],
+    }
+    run_validation([str(shards / '*.csv')], config, str(tmp_path / 'report.txt'), checkpoint=str(tmp_path / 'ckpt'))
+
+    assert sorted(calls) == [str(shards / f'part{i}.csv') for i in range(3)]
@@ -0,0 +1,117 @@
+"""
+Local media cache validation and counters.
+"""
+import os
+
+import pytest
+
+from cache import media
+from cache.counters import read_counters
+from cache.media import MediaCache, media_cache_stats
+from udfs.resources import IO_NUM_CPUS, io_resources
+
+
+@pytest.fixture
+def counted_fingerprints(monkeypatch):
+    calls = []
+    fingerprint = media.fingerprint
+
+    def counting(url, io_config=None):
+        calls.append(url)
+        return fingerprint(url, io_config)
+
+    monkeypatch.setattr(media, 'fingerprint', counting)
+    return calls
+
+
+def test_revalidates_every_access_by_default(tmp_path, counted_fingerprints):
+    path = tmp_path / 'a.bin'
+    path.write_bytes(b'first')
+    cache = MediaCache(str(tmp_path / 'cache'), 1024 * 1024)
+
+    assert cache.load(str(path)) == b'first'
+    assert cache.load(str(path)) == b'first'
+    assert len(counted_fingerprints) == 2
+
+    # A rewritten file gets a new marker and is downloaded again
+    path.write_bytes(b'second!')
+    os.utime(path, ns=(1, 1))
+    assert cache.load(str(path)) == b'second!'
+
+    cache.flush_stats()
+    stats = media_cache_stats(str(tmp_path / 'cache'))
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_max_age_skips_revalidation(tmp_path, counted_fingerprints):
+    path = tmp_path / 'a.bin'
+    path.write_bytes(b'first')
+    cache = MediaCache(str(tmp_path / 'cache'), 1024 * 1024, max_age_s=float('inf'))
+
+    assert cache.load(str(path)) == b'first'
+    assert cache.load(str(path)) == b'first'
+    assert cache.load(str(path)) == b'first'
+    assert len(counted_fingerprints) == 1
+
+
+def test_missing_file_gives_none(tmp_path):
+    cache = MediaCache(str(tmp_path / 'cache'), 1024 * 1024)
+    assert cache.load(str(tmp_path / 'missing.bin')) is None
+
+
+def _stored(cache_dir):
+    return read_counters(cache_dir, [MediaCache.SIZE_KEY])[MediaCache.SIZE_KEY]
+
+
+def _disk_size(cache):
+    return sum(entry[2] for entry in cache._entries())
+
+
+def test_workers_share_the_size_limit(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    first, second = MediaCache(cache_dir, 100), MediaCache(cache_dir, 100)
+
+    first.put('a', 'm', b'x' * 40)
+    second.put('b', 'm', b'x' * 40)
+    assert _stored(cache_dir) == 80
+    first.put('c', 'm', b'x' * 40)
+
+    # Either worker's put evicts once their entries together pass the limit
+    assert _disk_size(first) <= 90
+    assert _stored(cache_dir) == _disk_size(first)
+    assert first.get('a', 'm') is None
+
+
+def test_size_excludes_markers_and_eviction_resets_it(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    for name in ('a', 'b'):
+        (tmp_path / name).write_bytes(b'x' * 30)
+    cache = MediaCache(cache_dir, 100, max_age_s=float('inf'))
+    cache.load(str(tmp_path / 'a'))
+    cache.load(str(tmp_path / 'b'))
+    assert cache._entries(markers=True)
+    assert _stored(cache_dir) == _disk_size(cache) == 60
+
+    walks = []
+    entries = MediaCache._entries
+    monkeypatch.setattr(MediaCache, '_entries', lambda self, markers=False: walks.append(markers) or entries(self, markers))
+    cache.put('c', 'm', b'x' * 50)
+    assert walks == [False]
+    assert _stored(cache_dir) == _disk_size(cache) == 80
+
+    # After an eviction, puts within the limit do not walk the directory
+    walks.clear()
+    cache.put('d', 'm', b'x' * 10)
+    cache.put('e', 'm', b'x' * 10)
+    assert walks == []
+    assert _stored(cache_dir) == 100
+
+    # A new instance picks the size up from the shared counter
+    MediaCache(cache_dir, 100)
+    assert walks == []
+
+
+def test_io_resources():
+    resources = {'batch_size': 32, 'concurrency': 4, 'num_cpus': 1}
+    assert io_resources(resources) == {'batch_size': 32, 'concurrency': 4, 'num_cpus': IO_NUM_CPUS}
+    assert io_resources({**resources, 'io_cpus': 0.5})['num_cpus'] == 0.5
@@ -0,0 +1,131 @@
+"""
+Near-duplicate detection: LSH banding, in-bucket matching and the detectors.
+"""
+import cv2
+import daft
+import numpy as np
+import pytest
+
+from conftest import read_sections
+from main import run_validation
+from udfs.lsh import MinHashSignatures, hamming_matches, hash_bands
+
+
+def _bucket(ids, hashes):
+    return daft.from_pydict({'ids': [ids], 'hashes': [hashes]})
+
+
+def test_hash_bands_share_key_within_distance():
+    a = 0x0123456789ABCDEF
+    b = a ^ 0b1011  # 3 bits apart
+    df = daft.from_pydict({'h': [a, b]}).select(hash_bands(daft.col('h'), 4).alias('keys'))
+    keys = df.to_pydict()['keys']
+
+    assert len(keys[0]) == 4
+    assert set(keys[0]) & set(keys[1])
+
+
+def test_hamming_matches_within_max_distance():
+    df = _bucket([10, 11, 12], [0, 0b111, -1]).select(
+        hamming_matches(daft.col('ids'), daft.col('hashes'), 3).alias('matched')
+    )
+    assert df.to_pydict()['matched'] == [[10, 11]]
+
+
+@pytest.fixture
+def image_csv(tmp_path):
+    """
+    Rows 0 and 2 hold near-identical gradients; row 1 a checkerboard and
+    row 3 a reversed gradient.
+    """
+    gradient = np.tile(np.linspace(0, 255, 64, dtype=np.uint8), (64, 1))
+    images = [
+        gradient,
+        (np.indices((64, 64)).sum(axis=0) // 8 % 2 * 255).astype(np.uint8),
+        np.clip(gradient.astype(int) + 3, 0, 255).astype(np.uint8),
+        gradient[:, ::-1],
+    ]
+    rows = ['id,image_path']
+    for i, image in enumerate(images):
+        path = tmp_path / f'{i}.png'
+        cv2.imwrite(str(path), image)
+        rows.append(f'{i},{path}')
+
+    path = tmp_path / 'images.csv'
+    path.write_text('\n'.join(rows) + '\n')
+    return str(path)
+
+
+def test_image_near_duplicates_after_other_detectors(image_csv, tmp_path):
+    config = {'detectors': [
+        {'name': 'blur', 'type': 'IMAGE_BLUR', 'on_column': 'image_path', 'threshold': 0},
+        {'name': 'dups', 'type': 'DUPLICATE_ROW', 'key_columns': ['image_path']},
+        {'name': 'neardup', 'type': 'IMAGE_NEAR_DUPLICATE', 'on_column': 'image_path', 'max_distance': 4},
+    ]}
+    sections = read_sections(run_validation([image_csv], config, str(tmp_path / 'report.txt')))
+
+    assert sections['neardup_NEAR_DUPLICATE_image_path'][-1] == 'Invalid rows indexes: [0, 2]'
+    assert sections['dups_DUPLICATE_ROW_image_path'][-1] == 'Invalid rows indexes: []'
+
+
+def test_minhash_blocks_match_single_block():
+    texts = [f'product number {i} with a long description text' for i in range(10)] + [None, '']
+    df = daft.from_pydict({'text': texts})
+    signatures = {}
+    for block in (3, 256):
+        udf = type('MinHashBlock', (MinHashSignatures.inner,), {'ROW_BLOCK': block})
+        result = udf(num_perm=16, shingle_size=5, seed=1)(daft.Series.from_pylist(texts))
+        signatures[block] = result.to_pylist()
+
+    assert signatures[3] == signatures[256]
+    assert signatures[3][-2:] == [None, None]
+    assert all(len(s) == 16 for s in signatures[3][:10])
+
+
+def _text_report(tmp_path, texts, **config):
+    path = tmp_path / 'texts.csv'
+    path.write_text('id,desc\n' + ''.join(f'{i},{text}\n' for i, text in enumerate(texts)))
+    detector = {'name': 'textdup', 'type': 'TEXT_NEAR_DUPLICATE', 'on_column': 'desc', **config}
+    report = run_validation([str(path)], {'detectors': [detector]}, str(tmp_path / 'report.txt'))
+    return read_sections(report)['textdup_NEAR_DUPLICATE_desc'][-1]
+
+
+def test_text_near_duplicates(tmp_path):
+    texts = [
+        'a sturdy oak dining table with four matching chairs',
+        'stainless steel kettle with automatic shut off',
+        'a sturdy oak dining table with four matching chair',
+        'wireless noise cancelling headphones in black',
+    ]
+    assert _text_report(tmp_path, texts, threshold=0.8) == 'Invalid rows indexes: [0, 2]'
+
+
+def test_oversized_buckets_match_exact_copies(tmp_path):
+    texts = ['the same copied description'] * 5 + ['something else entirely different']
+    assert _text_report(tmp_path, texts, max_bucket_size=2) == 'Invalid rows indexes: [0, 1, 2, 3, 4]'
+
+    # A near copy sharing the oversized buckets is not compared pairwise
+    texts = [
+        'a sturdy oak dining table with four matching chairs',
+        'a sturdy oak dining table with four matching chair',
+        'a sturdy oak dining table with four matching chair',
+        'a sturdy oak dining table with four matching chair',
+    ]
+    assert _text_report(tmp_path, texts, threshold=0.8) == 'Invalid rows indexes: [0, 1, 2, 3]'
+    assert _text_report(tmp_path, texts, threshold=0.8, max_bucket_size=2) == 'Invalid rows indexes: [1, 2, 3]'
+
+
+def test_sharded_input_matches_single_file(sharded_text, tmp_path):
+    shards, single = sharded_text
+    config = {'detectors': [
+        {'name': 'nd', 'type': 'TEXT_NEAR_DUPLICATE', 'on_column': 'txt', 'threshold': 0.8},
+        {'name': 'rng', 'type': 'NUMERIC', 'on_column': 'id', 'range': {'min': 0, 'max': 99}},
+    ]}
+    reports = [
+        read_sections(run_validation([path], config, str(tmp_path / f'{name}.txt')))
+        for name, path in (('shards', shards), ('single', single))
+    ]
+
+    assert reports[0] == reports[1]
+    assert reports[0]['nd_NEAR_DUPLICATE_txt'][-1] == 'Invalid rows indexes: [10, 55, 120, 205, 300, 380]'
+    assert reports[0]['rng_RANGE_id'][-1] == f'Invalid rows indexes: {list(range(100, 400))}'
@@ -0,0 +1,91 @@
+"""
+Media pipeline downloads, batch sizing and stage counters.
+"""
+import gc
+import os
+
+import cv2
+import daft
+import numpy as np
+
+from cache.counters import BufferedCounters
+from main import run_validation
+from udfs import pipeline
+
+
+def test_pipeline_download_uses_io_config(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(pipeline, 'fetch', lambda url, length=None, io_config=None: calls.append((url, io_config)) or b'x')
+    io_config = daft.io.IOConfig(s3=daft.io.S3Config(endpoint_url='http://localhost:4566', anonymous=True))
+
+    download = pipeline.PipelineDownload.inner(stats_dir=str(tmp_path), io_config=io_config)
+    assert download._load('s3://bucket/a.png') == b'x'
+    assert calls == [('s3://bucket/a.png', io_config)]
+
+    cached = pipeline.PipelineDownload.inner(
+        stats_dir=str(tmp_path), cache_dir=str(tmp_path / 'cache'), max_age_s=60, io_config=io_config
+    )
+    assert cached.cache.io_config is io_config
+    assert cached.cache.max_age_s == 60
+
+
+def test_buffered_counters_flush_on_interval_and_teardown(tmp_path):
+    counters = BufferedCounters(str(tmp_path), 'run', interval_s=3600)
+    counters.add(download_files=2, download_bytes=10)
+    counters.add(download_files=1)
+    assert pipeline.pipeline_stats(str(tmp_path))['download_files'] == 0
+
+    counters.flush()
+    assert pipeline.pipeline_stats(str(tmp_path))['download_files'] == 3
+    assert pipeline.pipeline_stats(str(tmp_path), 'run')['download_bytes'] == 10
+
+    # With no interval every increment is written at once
+    BufferedCounters(str(tmp_path), interval_s=0).add(download_files=1)
+    assert pipeline.pipeline_stats(str(tmp_path))['download_files'] == 4
+
+
+def test_download_counters_written_at_teardown(tmp_path):
+    files = []
+    for i in range(3):
+        path = tmp_path / f'f{i}.bin'
+        path.write_bytes(b'x' * (100 * (i + 1)))
+        files.append(str(path))
+    stats_dir = str(tmp_path / 'stats')
+
+    download = pipeline.PipelineDownload.inner(stats_dir=stats_dir, stats_interval_s=3600)
+    data = download(daft.Series.from_pylist(files + [str(tmp_path / 'missing.bin'), None]))
+    assert [len(item) if item else None for item in data.to_pylist()] == [100, 200, 300, None, None]
+    assert pipeline.pipeline_stats(stats_dir)['download_files'] == 0
+
+    del download
+    gc.collect()
+    stats = pipeline.pipeline_stats(stats_dir)
+    assert (stats['download_files'], stats['download_bytes']) == (3, 600)
+
+
+def test_pipeline_run_counts_both_stages(tmp_path):
+    rows = []
+    for i in range(6):
+        path = tmp_path / f'img{i}.png'
+        cv2.imwrite(str(path), np.full((16, 16, 3), 30 * i, dtype=np.uint8))
+        rows.append(f'{i},{path}\n')
+    csv = tmp_path / 'images.csv'
+    csv.write_text('id,image_path\n' + ''.join(rows))
+    total_bytes = sum(os.path.getsize(tmp_path / f'img{i}.png') for i in range(6))
+
+    stats_dir = str(tmp_path / 'stats')
+    # No measurements yet: batches assume 1 MB files
+    assert pipeline.download_batch_size(stats_dir, memory_mb=4, prefetch_batches=2) == 2
+
+    config = {
+        'media_pipeline': {'stats_dir': stats_dir, 'prefetch_batches': 2, 'memory_mb': 4},
+        'detectors': [{'name': 'blur', 'type': 'IMAGE_BLUR', 'on_column': 'image_path', 'threshold': 0}],
+    }
+    run_validation([str(csv)], config, str(tmp_path / 'report.txt'))
+
+    stats = pipeline.pipeline_stats(stats_dir)
+    assert (stats['download_files'], stats['download_bytes']) == (6, total_bytes)
+    assert stats['decode_rows'] == 6
+    # The next run sizes its batches from the measured mean file size
+    expected = min(1024, 2 * 1024 * 1024 // (total_bytes / 6))
+    assert pipeline.download_batch_size(stats_dir, memory_mb=4, prefetch_batches=2) == expected
@@ -0,0 +1,39 @@
+"""
+Membership checks against reference set files.
+"""
+import daft
+
+from conftest import read_sections
+from main import run_validation
+from validation import reference
+
+
+def test_reference_membership(csv_path, tmp_path):
+    cats = tmp_path / 'cats.parquet'
+    daft.from_pydict({'cat': ['A', 'C']}).write_parquet(str(cats))
+    blocked = tmp_path / 'blocked.csv'
+    blocked.write_text('name\napple\n')
+    ids = tmp_path / 'ids.csv'
+    ids.write_text('store_id\n0\n1\n2\n3\n')
+
+    config = {'detectors': [
+        {'name': 'catref', 'type': 'CATEGORY', 'on_column': 'cat',
+         'reference': {'path': str(cats / '*.parquet'), 'format': 'parquet', 'join_strategy': 'broadcast'}},
+        {'name': 'names', 'type': 'TEXT', 'on_column': 'name',
+         'constraints': [{'type': 'NOT_IN', 'reference': {'path': str(blocked)}}]},
+        {'name': 'fk', 'type': 'REFERENCE', 'on_column': 'id', 'reference': {'path': str(ids), 'column': 'store_id'}},
+    ]}
+    sections = read_sections(run_validation([csv_path], config, str(tmp_path / 'report.txt')))
+
+    assert sections['catref_VALID_CATEGORY_cat'][-1] == 'Invalid rows indexes: [1, 5]'
+    assert sections['names_NOT_IN_0_name'][-1] == 'Invalid rows indexes: [0, 3, 4]'
+    assert sections['fk_REFERENCE_id'][-1] == 'Invalid rows indexes: [4, 5]'
+
+
+def test_read_reference_uses_io_config(monkeypatch):
+    calls = []
+    monkeypatch.setattr(reference.daft, 'read_csv', lambda path, **kwargs: calls.append((path, kwargs)) or daft.from_pydict({'k': [1]}))
+    io_config = daft.io.IOConfig(s3=daft.io.S3Config(endpoint_url='http://localhost:4566', anonymous=True))
+
+    reference.read_reference({'path': 's3://bucket/ids.csv'}, io_config)
+    assert calls == [('s3://bucket/ids.csv', {'io_config': io_config})]
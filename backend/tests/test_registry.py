@@ -0,0 +1,38 @@
+"""
+Lazy detector registry: media libraries are imported only when a config
+uses a media detector.
+"""
+import os
+import subprocess
+import sys
+
+from validation import registry
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEDIA_MODULES = ('cv2', 'PIL', 'soundfile')
+
+
+def _imported_media_modules(csv_path, detector_type):
+    # A fresh interpreter, so modules imported by other tests do not count
+    script = (
+        'import sys\n'
+        'from main import run_validation\n'
+        f'config = {{"detectors": [{{"name": "d", "type": "{detector_type}", "on_column": "retail"}}]}}\n'
+        f'run_validation([{csv_path!r}], config, {os.devnull!r})\n'
+        f'print(sorted(m for m in {MEDIA_MODULES!r} if m in sys.modules))\n'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script], cwd=BACKEND, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_numeric_config_does_not_import_media_libraries(csv_path):
+    assert _imported_media_modules(csv_path, 'NUMERIC') == '[]'
+
+
+def test_media_detector_is_imported_on_first_use():
+    assert 'IMAGE_BLUR' in registry.list_detectors()
+    assert registry.get_detector('image_blur').__name__ == 'ImageBlurDetector'
+    assert registry.get_detector('NOT_A_DETECTOR') is None
@@ -0,0 +1,44 @@
+"""
+Scheduling options of media UDFs: machine defaults, config and detector
+overrides.
+"""
+import os
+
+import daft
+
+from udfs.image import ImageBlurVar
+from udfs.resources import DEFAULT_BATCH_SIZE, default_resources, with_resources
+from validation.engine import Detector
+
+
+def test_defaults_share_cores_between_media_detectors(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+    assert default_resources() == {'batch_size': DEFAULT_BATCH_SIZE, 'num_cpus': 1, 'concurrency': 8}
+    assert default_resources(3)['concurrency'] == 2
+    assert default_resources(16)['concurrency'] == 1
+
+
+def test_detector_resources_override_config_and_defaults(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+    detectors = [
+        {'name': 'blur', 'type': 'IMAGE_BLUR', 'on_column': 'path', 'threshold': 100},
+        {'name': 'faces', 'type': 'IMAGE_FACE_COUNT', 'on_column': 'path', 'expected_count': 1,
+         'resources': {'batch_size': 4}},
+        {'name': 'price', 'type': 'NUMERIC', 'on_column': 'price'},
+    ]
+    data = daft.from_pydict({'path': ['a.png'], 'price': [1.0]})
+    engine = Detector(data, detectors, resources={'num_cpus': 2})
+    errors = []
+    blur, faces, price = engine._build_detectors(errors)
+    assert errors == []
+
+    # Cores are split between the two media detectors only
+    assert blur.resources == {'batch_size': DEFAULT_BATCH_SIZE, 'num_cpus': 2, 'concurrency': 4}
+    assert faces.resources == {'batch_size': 4, 'num_cpus': 2, 'concurrency': 4}
+
+
+def test_with_resources_applies_options():
+    udf = with_resources(ImageBlurVar, {'batch_size': 8, 'num_cpus': 2, 'concurrency': 3})
+    assert (udf.batch_size, udf.concurrency, udf.resource_request.num_cpus) == (8, 3, 2)
+    # The shared UDF definition is not modified
+    assert ImageBlurVar.batch_size is None and ImageBlurVar.concurrency is None
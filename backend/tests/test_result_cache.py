@@ -0,0 +1,78 @@
+"""
+Cached media UDF results: hits, misses and invalidation.
+"""
+import sqlite3
+
+import cv2
+import daft
+import numpy as np
+import pyarrow as pa
+from daft import DataType
+
+from main import run_validation
+from udfs.cached import is_cacheable, with_result_cache
+
+
+@daft.udf(return_dtype=DataType.int64())
+class ByteLength:
+
+    CACHE_VERSION = 1
+    computed = []
+
+    def __init__(self):
+        pass
+
+    def __call__(self, data, offset=0):
+        values = data.to_pylist()
+        ByteLength.computed.extend(values)
+        return pa.array([None if v is None else len(v) + offset for v in values], type=pa.int64())
+
+
+def _run(udf, values, *params):
+    ByteLength.computed.clear()
+    return udf.inner()(daft.Series.from_pylist(values, dtype=DataType.binary()), *params).to_pylist()
+
+
+def test_hits_misses_and_invalidation(tmp_path, monkeypatch):
+    assert is_cacheable(ByteLength)
+    cached = with_result_cache(ByteLength, str(tmp_path / 'results.db'))
+
+    assert _run(cached, [b'ab', b'abc', None]) == [2, 3, None]
+    assert ByteLength.computed == [b'ab', b'abc', None]
+
+    # Hits are served without the UDF; only new content and nulls reach it
+    assert _run(cached, [b'abc', b'ab', b'abcd', None]) == [3, 2, 4, None]
+    assert ByteLength.computed == [b'abcd', None]
+
+    # Other parameters and a bumped version miss the old entries
+    assert _run(cached, [b'ab'], 10) == [12]
+    assert ByteLength.computed == [b'ab']
+    monkeypatch.setattr(ByteLength.inner, 'CACHE_VERSION', 2)
+    assert _run(cached, [b'ab', b'abc']) == [2, 3]
+    assert ByteLength.computed == [b'ab', b'abc']
+
+
+def test_cached_run_matches_uncached(tmp_path):
+    rng = np.random.default_rng(5)
+    rows = []
+    for i in range(4):
+        path = tmp_path / f'img{i}.png'
+        cv2.imwrite(str(path), (rng.random((16, 16)) * 60 * (i + 1)).astype(np.uint8))
+        rows.append(f'{i},{path}\n')
+    csv = tmp_path / 'images.csv'
+    csv.write_text('id,image_path\n' + ''.join(rows))
+
+    detectors = [{'name': 'blur', 'type': 'IMAGE_BLUR', 'on_column': 'image_path', 'threshold': 5000}]
+    db = tmp_path / 'results.db'
+    cached = {'detectors': detectors, 'result_cache': {'path': str(db)}}
+
+    reports = [
+        run_validation([str(csv)], {'detectors': detectors}, str(tmp_path / 'plain.txt')),
+        run_validation([str(csv)], cached, str(tmp_path / 'first.txt')),
+        run_validation([str(csv)], cached, str(tmp_path / 'second.txt')),
+    ]
+    plain, first, second = [open(path).read() for path in reports]
+    assert plain == first == second
+
+    with sqlite3.connect(db) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM results').fetchone()[0] == 4
@@ -0,0 +1,101 @@
+"""
+Validation service request handling.
+"""
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from server import JobQueue, make_handler
+
+NUMERIC = {'detectors': [{'name': 'price', 'type': 'NUMERIC', 'on_column': 'retail', 'range': {'min': 0}}]}
+
+
+@pytest.fixture
+def service():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(JobQueue(workers=1, max_queued=1)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url, body):
+    request = urllib.request.Request(url, data=body, method='POST', headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize('body', [b'[]', b'"csv"', b'{"csv": ["a.csv"]}', b'not json'])
+def test_bad_requests_get_400(service, body):
+    status, response = _post(f'{service}/jobs', body)
+    assert status == 400
+    assert 'error' in response
+
+
+@pytest.mark.parametrize('field, path', [
+    ('report', '../outside.txt'), ('report', '/tmp/outside.txt'), ('snapshot', 'a/../../b.json'), ('checkpoint', ''),
+])
+def test_output_paths_must_stay_in_output_dir(service, field, path):
+    body = {'csv': ['a.csv'], 'config': NUMERIC, field: path}
+    status, response = _post(f'{service}/jobs', json.dumps(body).encode())
+    assert status == 400
+    assert field in response['error']
+
+
+def test_config_files_must_stay_in_config_dir(tmp_path):
+    jobs = JobQueue(workers=1, output_dir=str(tmp_path), config_dir=str(tmp_path / 'configs'))
+    for config in ('/etc/passwd', '../detectors.yml', ['configs.yml', '../other.yml']):
+        with pytest.raises(ValueError, match='config'):
+            jobs.submit({'csv': ['a.csv'], 'config': config})
+
+
+def test_reports_written_in_output_dir(csv_path, tmp_path):
+    out = tmp_path / 'out'
+    jobs = JobQueue(workers=1, output_dir=str(out))
+    default = jobs.submit({'csv': [csv_path], 'config': NUMERIC})
+    named = jobs.submit({'csv': [csv_path], 'config': NUMERIC, 'report': 'sub/named.txt'})
+    jobs._queue.join()
+
+    assert jobs.get(default)['report'] == str(out / f'{default}.txt')
+    assert jobs.get(named)['report'] == str(out / 'sub' / 'named.txt')
+    assert (out / 'sub' / 'named.txt').exists()
+
+
+def test_finished_jobs_are_forgotten(csv_path, tmp_path):
+    jobs = JobQueue(workers=1, output_dir=str(tmp_path), max_finished=2)
+    ids = [jobs.submit({'csv': [csv_path], 'config': NUMERIC}) for _ in range(3)]
+    jobs._queue.join()
+
+    assert jobs.get(ids[0]) is None
+    assert [jobs.get(job_id)['status'] for job_id in ids[1:]] == ['done', 'done']
+    assert jobs.stats()['done'] == 2
+
+    expiring = JobQueue(workers=1, output_dir=str(tmp_path), finished_ttl_s=0)
+    job_id = expiring.submit({'csv': [csv_path], 'config': NUMERIC})
+    expiring._queue.join()
+    assert expiring.get(job_id) is None
+
+
+def test_counters_scoped_per_run(tmp_path):
+    from cache.counters import add_counters, drop_counters, read_counters
+
+    directory = str(tmp_path)
+    add_counters(directory, {'hits': 2}, 'job-a')
+    add_counters(directory, {'hits': 3}, 'job-b')
+    add_counters(directory, {'hits': 1})
+
+    assert read_counters(directory, ['hits']) == {'hits': 6}
+    assert read_counters(directory, ['hits'], 'job-a') == {'hits': 2}
+
+    drop_counters(directory, 'job-a')
+    assert read_counters(directory, ['hits'], 'job-a') == {'hits': 0}
+    assert read_counters(directory, ['hits'], 'job-b') == {'hits': 3}
+    assert read_counters(directory, ['hits']) == {'hits': 6}
@@ -0,0 +1,56 @@
+"""
+Media UDFs return typed Arrow arrays, with nulls for unreadable files.
+"""
+import io
+
+import cv2
+import daft
+import numpy as np
+import pyarrow as pa
+import soundfile as sf
+from daft import DataType
+
+from udfs.arrow import fixed_size_list_array, masked_array
+from udfs.audio import AudioInfo
+from udfs.image import DetectFace, ImageBlurVar, ImageDimension
+
+
+def _call(udf, values):
+    return udf.inner()(daft.Series.from_pylist(values, dtype=DataType.binary()))
+
+
+def _png(width, height):
+    ok, png = cv2.imencode('.png', np.zeros((height, width, 3), dtype=np.uint8))
+    return png.tobytes()
+
+
+def test_arrow_helpers():
+    values = masked_array(np.array([1.5, 2.5], dtype=np.float32), np.array([True, False]))
+    assert values.type == pa.float32() and values.to_pylist() == [1.5, None]
+
+    dims = fixed_size_list_array(np.array([[3, 4], [0, 0]]), np.array([True, False]), pa.int64())
+    assert dims.type == pa.list_(pa.int64(), 2) and dims.to_pylist() == [[3, 4], None]
+
+
+def test_image_udfs():
+    images = [_png(8, 6), b'not an image', None]
+
+    dims = _call(ImageDimension, images)
+    assert isinstance(dims, pa.FixedSizeListArray) and dims.type.value_type == pa.int64()
+    assert dims.to_pylist() == [[8, 6], None, None]
+
+    blur = _call(ImageBlurVar, images)
+    assert blur.type == pa.float32() and blur.to_pylist() == [0.0, None, None]
+
+    faces = _call(DetectFace, images)
+    assert faces.type == pa.int32() and faces.to_pylist() == [0, None, None]
+
+
+def test_audio_info():
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros((8000, 2)), 8000, format='WAV')
+
+    info = _call(AudioInfo, [buffer.getvalue(), b'not audio'])
+    assert isinstance(info, pa.StructArray)
+    assert info.to_pylist()[0] == {'valid': True, 'duration': 1.0, 'samplerate': 8000, 'channels': 2}
+    assert info.to_pylist()[1]['valid'] is False
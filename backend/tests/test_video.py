@@ -0,0 +1,73 @@
+"""
+VIDEO container checks and sampled frame scores, on tiny generated videos.
+"""
+import cv2
+import daft
+import numpy as np
+import pytest
+
+from conftest import read_sections
+from main import run_validation
+from udfs.video import VideoFrameScores
+
+
+def _write_video(path, frames, fps=10, noise=True):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (64, 48))
+    rng = np.random.default_rng(0)
+    for _ in range(frames):
+        if noise:
+            frame = (rng.random((48, 64, 3)) * 255).astype(np.uint8)
+        else:
+            frame = np.full((48, 64, 3), 128, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def videos(tmp_path):
+    """
+    Sharp (noise) and flat two-second videos, a half-second one and a file
+    that is not a video.
+    """
+    broken = tmp_path / 'broken.mp4'
+    broken.write_bytes(b'<html>not found</html>')
+    return [
+        _write_video(tmp_path / 'sharp.mp4', 20),
+        _write_video(tmp_path / 'flat.mp4', 20, noise=False),
+        _write_video(tmp_path / 'short.mp4', 5),
+        str(broken),
+    ]
+
+
+def test_video_checks(videos, tmp_path):
+    csv = tmp_path / 'videos.csv'
+    csv.write_text('id,video_path\n' + ''.join(f'{i},{path}\n' for i, path in enumerate(videos)))
+    config = {'detectors': [{
+        'name': 'vid', 'type': 'VIDEO', 'on_column': 'video_path',
+        'duration_range': {'min': 1, 'max': 10},
+        'fps_range': {'min': 5, 'max': 30},
+        'resolution': {'min_width': 64, 'min_height': 48},
+        'codecs': ['fmp4', 'mp4v'],  # FFmpeg reports MPEG-4 Part 2 as fmp4
+        'frames': {'sample': 3, 'blur_threshold': 100, 'max_face_count': 0},
+    }]}
+    sections = read_sections(run_validation([str(csv)], config, str(tmp_path / 'report.txt')))
+
+    assert sections['vid_VALID_VIDEO_FILE_video_path'][-1] == 'Invalid rows indexes: [3]'
+    assert sections['vid_DURATION_RANGE_video_path'][-1] == 'Invalid rows indexes: [2, 3]'
+    assert sections['vid_FPS_RANGE_video_path'][-1] == 'Invalid rows indexes: [3]'
+    assert sections['vid_MIN_WIDTH_video_path'][-1] == 'Invalid rows indexes: [3]'
+    assert sections['vid_CODEC_video_path'][-1] == 'Invalid rows indexes: []'
+    # The flat video is blurry; the unreadable file has no frames to score
+    assert sections['vid_FRAME_BLUR_video_path'][-1] == 'Invalid rows indexes: [1]'
+    assert sections['vid_FRAME_FACE_COUNT_video_path'][-1] == 'Invalid rows indexes: []'
+
+
+def test_frame_scores_only_requested_metrics(videos):
+    files = [open(path, 'rb').read() for path in videos]
+    scores = VideoFrameScores.inner()(daft.Series.from_pylist(files + [None]), 3, True, False).to_pylist()
+
+    assert [row['faces'] for row in scores] == [None] * 5
+    blur = [row['blur'] for row in scores]
+    assert blur[0] > 1000 and blur[1] == 0 and blur[2] > 1000
+    assert blur[3:] == [None, None]
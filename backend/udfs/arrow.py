@@ -0,0 +1,23 @@
+"""
+Helpers for building Arrow arrays directly from NumPy buffers in UDFs.
+"""
+import numpy as np
+import pyarrow as pa
+
+
+def masked_array(values: np.ndarray, valid: np.ndarray) -> pa.Array:
+  """
+  Wrap a NumPy array as an Arrow array, with nulls where `valid` is False.
+  """
+  return pa.array(values, mask=~valid)
+
+
+def fixed_size_list_array(values: np.ndarray, valid: np.ndarray, value_type: pa.DataType) -> pa.Array:
+  """
+  Wrap a 2D NumPy array (rows x size) as an Arrow fixed-size-list array,
+  with nulls where `valid` is False.
+  """
+  rows, size = values.shape
+  children = pa.array(values.reshape(-1), type=value_type)
+  validity = pa.array(valid, type=pa.bool_()).buffers()[1]
+  return pa.Array.from_buffers(pa.list_(value_type, size), rows, [validity], children=[children])
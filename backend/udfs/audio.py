@@ -0,0 +1,111 @@
+import daft
+from daft import DataType
+
+import soundfile as sf
+import numpy as np
+import pyarrow as pa
+
+import io
+
+AUDIO_INFO_DTYPE = DataType.struct({
+  'valid': DataType.bool(),
+  'duration': DataType.float64(),
+  'samplerate': DataType.int64(),
+  'channels': DataType.int64(),
+})
+
+@daft.udf(return_dtype=AUDIO_INFO_DTYPE)
+class AudioInfo:
+
+  CACHE_VERSION = 1
+
+  def __init__(self):
+    pass
+
+  def __call__(self, audio_bytes):
+    files = audio_bytes.to_pylist()
+    valid = np.zeros(len(files), dtype=bool)
+    duration = np.zeros(len(files), dtype=np.float64)
+    samplerate = np.zeros(len(files), dtype=np.int64)
+    channels = np.zeros(len(files), dtype=np.int64)
+
+    for i, file_bytes in enumerate(files):
+      try:
+        if file_bytes is None or file_bytes == b"":
+          continue
+        info = sf.info(io.BytesIO(file_bytes))
+        duration[i] = info.duration
+        samplerate[i] = info.samplerate
+        channels[i] = info.channels
+        valid[i] = True
+      except Exception:
+        pass
+
+    return pa.StructArray.from_arrays(
+      [pa.array(valid), pa.array(duration), pa.array(samplerate), pa.array(channels)],
+      names=['valid', 'duration', 'samplerate', 'channels'],
+    )
+
+
+AUDIO_CONTENT_DTYPE = DataType.struct({
+  'silence_ratio': DataType.float64(),
+  'clipping_ratio': DataType.float64(),
+  'dc_offset': DataType.float64(),
+})
+
+@daft.udf(return_dtype=AUDIO_CONTENT_DTYPE)
+class AudioContent:
+  """
+  Content statistics of each recording, read in fixed-size blocks so memory
+  stays bounded however long the file is:
+
+  - silence_ratio: share of `window`-frame windows with RMS below `silence_db` dBFS
+  - clipping_ratio: share of samples at or above `clip_level` full scale
+  - dc_offset: largest per-channel mean
+  """
+
+  CACHE_VERSION = 1
+
+  def __init__(self):
+    pass
+
+  def __call__(self, audio_bytes, silence_db, clip_level, window, block_windows=32):
+    files = audio_bytes.to_pylist()
+    valid = np.zeros(len(files), dtype=bool)
+    silence = np.zeros(len(files), dtype=np.float64)
+    clipping = np.zeros(len(files), dtype=np.float64)
+    dc_offset = np.zeros(len(files), dtype=np.float64)
+    silence_rms = 10 ** (silence_db / 20)
+
+    for i, file_bytes in enumerate(files):
+      try:
+        if file_bytes is None or file_bytes == b"":
+          continue
+        windows = silent = samples = clipped = 0
+        channel_sums = None
+        for block in sf.blocks(io.BytesIO(file_bytes), blocksize=window * block_windows, dtype='float32', always_2d=True):
+          # RMS per window over all channels; a trailing partial window counts too
+          starts = np.arange(0, len(block), window)
+          energy = np.add.reduceat(np.square(block).sum(axis=1), starts)
+          rms = np.sqrt(energy / (np.minimum(window, len(block) - starts) * block.shape[1]))
+
+          windows += len(rms)
+          silent += int((rms < silence_rms).sum())
+          samples += block.size
+          clipped += int((np.abs(block) >= clip_level).sum())
+          channel_sums = block.sum(axis=0, dtype=np.float64) + (0 if channel_sums is None else channel_sums)
+
+        if samples == 0:
+          continue
+        silence[i] = silent / windows
+        clipping[i] = clipped / samples
+        dc_offset[i] = float(np.abs(channel_sums / (samples // len(channel_sums))).max())
+        valid[i] = True
+      except Exception:
+        pass
+
+    return pa.StructArray.from_arrays(
+      [pa.array(silence), pa.array(clipping), pa.array(dc_offset)],
+      names=['silence_ratio', 'clipping_ratio', 'dc_offset'],
+      mask=pa.array(~valid),
+    )
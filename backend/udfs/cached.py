@@ -0,0 +1,69 @@
+"""
+Result caching for media UDFs that declare a `CACHE_VERSION`.
+"""
+import inspect
+
+import daft
+from daft import DataType
+
+import pyarrow as pa
+
+from cache.results import ResultCache, content_hash, result_key
+
+
+def is_cacheable(udf):
+  """
+  Whether `udf` is a class UDF whose results depend only on its inputs,
+  marked by a `CACHE_VERSION` attribute (bumped whenever its output changes).
+  """
+  return isinstance(getattr(udf, 'inner', None), type) and hasattr(udf.inner, 'CACHE_VERSION')
+
+
+def with_result_cache(udf, cache_path):
+  """
+  Wrap a cacheable class UDF so each batch is looked up in a `ResultCache`
+  first, keyed by the content hash of the first (bytes) argument plus the UDF
+  name, `CACHE_VERSION` and the remaining arguments. Only the misses are
+  passed to the wrapped UDF, and their results are stored.
+  """
+  inner = udf.inner
+  name = f'{inner.__module__}.{inner.__qualname__}'
+  arrow_type = udf.return_dtype.to_arrow_dtype()
+
+  class CachedResults:
+
+    def __init__(self):
+      self.udf = inner()
+      self.cache = ResultCache(cache_path)
+
+    def __call__(self, *args, **kwargs):
+      bound = signature.bind(self.udf, *args, **kwargs)
+      bound.apply_defaults()
+      data, *params = list(bound.arguments.values())[1:]
+
+      values = data.to_pylist()
+      keys = [
+        result_key(digest, name, inner.CACHE_VERSION, params) if digest else None
+        for digest in map(content_hash, values)
+      ]
+      cached = self.cache.get_many([key for key in keys if key is not None])
+
+      results = [cached.get(key) for key in keys]
+      missing = [i for i, key in enumerate(keys) if key is None or key not in cached]
+      if missing:
+        batch = daft.Series.from_pylist([values[i] for i in missing], dtype=DataType.binary())
+        computed = self.udf(batch, *params)
+        computed = computed.to_pylist() if hasattr(computed, 'to_pylist') else list(computed)
+        for i, value in zip(missing, computed):
+          results[i] = value
+        self.cache.put_many([(keys[i], results[i]) for i in missing if keys[i] is not None])
+
+      return pa.array(results, type=arrow_type)
+
+  # Take the wrapped UDF's arguments, as daft binds them by name
+  signature = inspect.signature(inner.__call__)
+  CachedResults.__call__.__signature__ = signature
+
+  # Name it after the wrapped UDF, so plans read e.g. `CachedImageBlurVar`
+  CachedResults.__name__ = CachedResults.__qualname__ = f'Cached{inner.__name__}'
+  return daft.udf(return_dtype=udf.return_dtype)(CachedResults)
@@ -0,0 +1,60 @@
+import daft
+from daft import DataType
+
+import pyarrow as pa
+
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from cache.media import MediaCache, fetch
+
+@daft.udf(return_dtype=DataType.binary())
+class CachedDownload:
+  """
+  Download each URL through a local `MediaCache`; unreadable URLs give null,
+  like `url.download(on_error='null')`.
+  """
+
+  IO_BOUND = True
+
+  def __init__(
+    self, cache_dir='./.dvt_cache/media', max_bytes=10 * 1024**3, io_threads=16, stats_scope=None,
+    max_age_s=0, io_config=None,
+  ):
+    self.cache = MediaCache(cache_dir, max_bytes, stats_scope, max_age_s, io_config)
+    # Counters are buffered; write what is left when the instance goes away
+    weakref.finalize(self, self.cache.flush_stats)
+    # Downloads and HEAD requests are network-bound; overlap them within a batch
+    self.pool = ThreadPoolExecutor(max_workers=io_threads)
+
+  def __call__(self, urls):
+    paths = urls.to_pylist()
+    data = list(self.pool.map(lambda url: self.cache.load(url) if url else None, paths))
+    return pa.array(data, type=pa.binary())
+
+
+@daft.udf(return_dtype=DataType.binary())
+class RangeDownload:
+  """
+  Download only the first `num_bytes` of each URL (ranged GET); unreadable
+  URLs give null.
+  """
+
+  IO_BOUND = True
+
+  def __init__(self, num_bytes=64, io_threads=16, io_config=None):
+    self.num_bytes = num_bytes
+    self.io_config = io_config
+    self.pool = ThreadPoolExecutor(max_workers=io_threads)
+
+  def __call__(self, urls):
+    data = list(self.pool.map(self._fetch, urls.to_pylist()))
+    return pa.array(data, type=pa.binary())
+
+  def _fetch(self, url):
+    if not url:
+      return None
+    try:
+      return fetch(url, self.num_bytes, self.io_config)
+    except Exception:
+      return None
@@ -4,54 +4,129 @@ from daft import DataType
 from PIL import Image
 
 import io
+import threading
 
 
 import cv2
 import numpy as np
+import pyarrow as pa
+
+from udfs.arrow import masked_array, fixed_size_list_array
 
 @daft.udf(return_dtype=DataType.fixed_size_list(dtype=DataType.int64(), size=2))
-def image_dimension(image_bytes):
+class ImageDimension:
 
-  def get_dimension(bytes):
-    try:
+  # Bump whenever the output changes; invalidates cached results
+  CACHE_VERSION = 1
+
+  def __init__(self):
+    pass
+
+  def __call__(self, image_bytes):
+    images = image_bytes.to_pylist()
+    dims = np.zeros((len(images), 2), dtype=np.int64)
+    valid = np.zeros(len(images), dtype=bool)
+
+    for i, bytes in enumerate(images):
+      try:
+        # Image.open only parses the header, no pixel decode
         img = Image.open(io.BytesIO(bytes))
-        dim = [img.width, img.height]
-    except Exception:
-        dim = None
-    return dim
+        dims[i] = img.width, img.height
+        valid[i] = True
+      except Exception:
+        pass
 
-  return [ get_dimension(img) for img in image_bytes ]
+    return fixed_size_list_array(dims, valid, pa.int64())
+
+
+def blur_variance(img):
+  """
+  Laplacian variance of a decoded BGR image; low values mean blur.
+  """
+  gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+  laplacian = cv2.Laplacian(gray, cv2.CV_32F)  # Compute Laplacian
+  return laplacian.var() # Compute variance of the Laplacian
+
+
+def count_faces(classifier, img):
+  """
+  Number of faces the Haar cascade finds in a decoded BGR image.
+  """
+  gray_image = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+  faces = classifier.detectMultiScale(
+    gray_image, scaleFactor=1.2, minNeighbors=15
+  )
+  return len(faces)
 
 @daft.udf(return_dtype=DataType.float32())
-def image_blur_var(image_bytes):
+class ImageBlurVar:
+
+  CACHE_VERSION = 1
+
+  def __init__(self):
+    pass
+
+  def __call__(self, image_bytes):
+    images = image_bytes.to_pylist()
+    variances = np.zeros(len(images), dtype=np.float32)
+    valid = np.zeros(len(images), dtype=bool)
+
+    for i, bytes in enumerate(images):
+      variance = self._get_variance(bytes)
+      if variance is not None:
+        variances[i] = variance
+        valid[i] = True
 
-  def get_variance(bytes):
+    return masked_array(variances, valid)
+
+  def _get_variance(self, bytes):
     try:
       np_arr = np.frombuffer(bytes, np.uint8)
       img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
       if img is None:
          return None
 
-      gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-      laplacian = cv2.Laplacian(gray, cv2.CV_32F)  # Compute Laplacian
-      variance = laplacian.var() # Compute variance of the Laplacian
-      return variance
+      return blur_variance(img)
     except Exception as e:
       print(e)
       return None
 
-  return [ get_variance(img) for img in image_bytes ]
+
+_thread_local = threading.local()
+
+def face_classifier():
+  """
+  Load the Haar cascade once per thread (classifiers are not thread-safe).
+  UDF instances run in processes started per query, so this is shared
+  within a job, not across server jobs.
+  """
+  classifier = getattr(_thread_local, 'face_classifier', None)
+  if classifier is None:
+    classifier = _thread_local.face_classifier = cv2.CascadeClassifier(
+      cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+    )
+  return classifier
 
 
 @daft.udf(return_dtype=daft.DataType.int32())
 class DetectFace:
 
+  CACHE_VERSION = 1
+
   def __init__(self):
-    self.face_classifier = cv2.CascadeClassifier(
-      cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-    )
+    self.face_classifier = face_classifier()
   def __call__(self, images_bytes):
-    return [self._detect_faces(img) for img in images_bytes]
+    images = images_bytes.to_pylist()
+    counts = np.zeros(len(images), dtype=np.int32)
+    valid = np.zeros(len(images), dtype=bool)
+
+    for i, bytes_img in enumerate(images):
+      count = self._detect_faces(bytes_img)
+      if count is not None:
+        counts[i] = count
+        valid[i] = True
+
+    return masked_array(counts, valid)
 
   def _detect_faces(self, bytes_img):
       if bytes_img is None:
@@ -63,9 +138,119 @@ class DetectFace:
       if img is None:
          return None
 
-      gray_image = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-      faces = self.face_classifier.detectMultiScale(
-        gray_image, scaleFactor=1.2, minNeighbors=15
-      )
+      return count_faces(self.face_classifier, img)
+
+
+@daft.udf(return_dtype=DataType.int64())
+class ImageDHash:
+  """
+  64-bit difference hash (dHash) of each image, stored as int64 bits.
+  """
+
+  CACHE_VERSION = 1
+
+  def __init__(self):
+    pass
+
+  def __call__(self, images_bytes):
+    images = images_bytes.to_pylist()
+    bits = np.zeros((len(images), 64), dtype=bool)
+    valid = np.zeros(len(images), dtype=bool)
+
+    for i, bytes_img in enumerate(images):
+      try:
+        np_arr = np.frombuffer(bytes_img, np.uint8)
+        # Reduced decode: the hash only needs a 9x8 thumbnail
+        img = cv2.imdecode(np_arr, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        if img is None:
+          continue
+        small = cv2.resize(img, (9, 8), interpolation=cv2.INTER_AREA)
+        bits[i] = (small[:, 1:] > small[:, :-1]).reshape(-1)
+        valid[i] = True
+      except Exception:
+        pass
+
+    hashes = np.packbits(bits, axis=1).view('>u8').reshape(-1).astype(np.uint64).view(np.int64)
+    return masked_array(hashes, valid)
+
+
+# Magic signatures as (format, [(offset, bytes), ...]); every part must match
+IMAGE_SIGNATURES = [
+  ('jpeg', [(0, b'\xff\xd8\xff')]),
+  ('png', [(0, b'\x89PNG\r\n\x1a\n')]),
+  ('gif', [(0, b'GIF87a')]),
+  ('gif', [(0, b'GIF89a')]),
+  ('webp', [(0, b'RIFF'), (8, b'WEBP')]),
+  ('bmp', [(0, b'BM')]),
+  ('tiff', [(0, b'II*\x00')]),
+  ('tiff', [(0, b'MM\x00*')]),
+  ('ico', [(0, b'\x00\x00\x01\x00')]),
+  ('avif', [(4, b'ftypavif')]),
+  ('avif', [(4, b'ftypavis')]),
+  # HEIC files are HEIF with HEVC images, and either suffix carries any of
+  # these brands, so they are one format
+  ('heif', [(4, b'ftypheic')]),
+  ('heif', [(4, b'ftypheix')]),
+  ('heif', [(4, b'ftyphevc')]),
+  ('heif', [(4, b'ftyphevx')]),
+  ('heif', [(4, b'ftypmif1')]),
+  ('heif', [(4, b'ftypmsf1')]),
+]
+
+# Generic HEIF major brands, also used by AVIF files; their compatible brands
+# (after the 16-byte ftyp header) tell the two apart
+GENERIC_HEIF_BRANDS = (b'mif1', b'msf1')
+AVIF_BRANDS = {b'avif', b'avis'}
+FTYP_BYTES = 64
+
+# Bytes of each file the signatures and the ftyp compatible brands look at
+SIGNATURE_BYTES = max(FTYP_BYTES, *(offset + len(magic) for _, parts in IMAGE_SIGNATURES for offset, magic in parts))
+
+
+def compatible_brands(head):
+  """
+  Compatible brands listed in an ISO BMFF `ftyp` box at the start of `head`.
+  """
+  size = int.from_bytes(head[:4], 'big')
+  end = min(size, len(head))
+  return {head[i:i + 4] for i in range(16, end - 3, 4)}
+
+
+@daft.udf(return_dtype=DataType.string())
+class ImageFormatSniff:
+  """
+  Image format of each file from its leading magic bytes ('unknown' when no
+  signature matches). Only the first `SIGNATURE_BYTES` bytes are read, so a
+  ranged download of the file head is enough.
+  """
+
+  def __init__(self):
+    pass
+
+  def __call__(self, head_bytes):
+    heads = head_bytes.to_pylist()
+    valid = np.array([head is not None for head in heads], dtype=bool)
+
+    # One zero-padded row per file, compared against each signature at once
+    matrix = np.frombuffer(
+      b''.join((head or b'')[:SIGNATURE_BYTES].ljust(SIGNATURE_BYTES, b'\x00') for head in heads),
+      dtype=np.uint8,
+    ).reshape(len(heads), SIGNATURE_BYTES)
+
+    formats = np.full(len(heads), 'unknown', dtype=object)
+    unmatched = np.ones(len(heads), dtype=bool)
+    for name, parts in IMAGE_SIGNATURES:
+      matched = unmatched.copy()
+      for offset, magic in parts:
+        signature = np.frombuffer(magic, dtype=np.uint8)
+        matched &= (matrix[:, offset:offset + len(magic)] == signature).all(axis=1)
+      formats[matched] = name
+      unmatched &= ~matched
+
+    major = np.ascontiguousarray(matrix[:, 8:12]).view('S4').ravel()
+    generic = np.isin(major, GENERIC_HEIF_BRANDS) & (formats == 'heif')
+    for i in np.flatnonzero(generic):
+      if compatible_brands(heads[i]) & AVIF_BRANDS:
+        formats[i] = 'avif'
 
-      return len(faces)
+    return pa.array(formats.tolist(), type=pa.string(), mask=~valid)
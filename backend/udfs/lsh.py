@@ -0,0 +1,174 @@
+"""
+UDFs for locality-sensitive hashing (banding and in-bucket matching).
+"""
+import daft
+from daft import DataType
+
+import numpy as np
+import pyarrow as pa
+
+
+def _list_array(values: np.ndarray, width: int) -> pa.Array:
+  rows = len(values) // width if width else 0
+  offsets = np.arange(rows + 1, dtype=np.int32) * width
+  return pa.ListArray.from_arrays(pa.array(offsets), pa.array(values))
+
+
+@daft.udf(return_dtype=DataType.list(DataType.int64()))
+def hash_bands(hashes, bands):
+  """
+  Split each 64-bit hash into `bands` band keys, tagged with the band index.
+
+  Two hashes within Hamming distance `bands - 1` share at least one key.
+  """
+  values = hashes.to_arrow().to_numpy(zero_copy_only=False).astype(np.int64).view(np.uint64)
+  if bands <= 1:
+    return _list_array(values.view(np.int64), 1)
+
+  width = 64 // bands
+  mask = np.uint64((1 << width) - 1)
+  keys = np.empty((len(values), bands), dtype=np.uint64)
+  for band in range(bands):
+    keys[:, band] = (np.uint64(band) << np.uint64(32)) | ((values >> np.uint64(band * width)) & mask)
+
+  return _list_array(keys.reshape(-1).view(np.int64), bands)
+
+
+@daft.udf(return_dtype=DataType.list(DataType.int64()))
+def hamming_matches(ids, hashes, max_distance):
+  """
+  For each bucket, return the ids within `max_distance` bits of another member.
+  Null buckets give null.
+  """
+  result = []
+  for bucket_ids, bucket_hashes in zip(ids.to_pylist(), hashes.to_pylist()):
+    if bucket_ids is None:
+      result.append(None)
+      continue
+    bucket_ids = np.asarray(bucket_ids, dtype=np.int64)
+    h = np.asarray(bucket_hashes, dtype=np.int64).view(np.uint64)
+
+    # Pairwise XOR, then popcount via the bytes of each 64-bit word
+    xor = h[:, None] ^ h[None, :]
+    distance = np.unpackbits(xor.view(np.uint8), axis=-1).reshape(len(h), len(h), 64).sum(axis=-1)
+    np.fill_diagonal(distance, max_distance + 1)
+
+    result.append(bucket_ids[(distance <= max_distance).any(axis=1)].tolist())
+  return pa.array(result, type=pa.list_(pa.int64()))
+
+
+def _shingle_hashes(text, shingle_size):
+  """
+  64-bit polynomial hashes of the character shingles of `text`, after
+  lowercasing and collapsing whitespace.
+  """
+  data = np.frombuffer(' '.join(text.lower().split()).encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+  if len(data) == 0:
+    return data
+  if len(data) < shingle_size:
+    shingle_size = len(data)
+
+  powers = np.uint64(1099511628211) ** np.arange(shingle_size - 1, -1, -1, dtype=np.uint64)
+  windows = np.lib.stride_tricks.sliding_window_view(data, shingle_size)
+  return np.unique(windows @ powers)
+
+
+def minhash_permutations(num_perm, seed):
+  """
+  Coefficients of `num_perm` multiply-shift hash functions, fixed by `seed`
+  so every worker and every run produces comparable signatures.
+  """
+  rng = np.random.default_rng(seed)
+  a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+  b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+  return a, b
+
+
+@daft.udf(return_dtype=DataType.list(DataType.int64()))
+class MinHashSignatures:
+  """
+  MinHash signature (`num_perm` 32-bit minima) of each text's shingles.
+
+  Shingles of `ROW_BLOCK` rows are hashed at once and reduced per row with
+  `np.minimum.reduceat`; empty or null texts get a null signature.
+  """
+
+  # Rows hashed together; bounds the (shingles x num_perm) matrix whatever the batch size
+  ROW_BLOCK = 256
+
+  def __init__(self, num_perm, shingle_size, seed):
+    self.num_perm = num_perm
+    self.shingle_size = shingle_size
+    self.a, self.b = minhash_permutations(num_perm, seed)
+
+  def __call__(self, texts):
+    rows = texts.to_pylist()
+    signatures = np.zeros((len(rows), self.num_perm), dtype=np.int64)
+    valid = np.zeros(len(rows), dtype=bool)
+
+    for start in range(0, len(rows), self.ROW_BLOCK):
+      block = rows[start:start + self.ROW_BLOCK]
+      shingles = [_shingle_hashes(text, self.shingle_size) if text else np.empty(0, dtype=np.uint64) for text in block]
+      lengths = np.array([len(s) for s in shingles], dtype=np.int64)
+      block_valid = lengths > 0
+      if not block_valid.any():
+        continue
+
+      values = np.concatenate([s for s in shingles if len(s)])
+      permuted = (values[:, None] * self.a[None, :] + self.b[None, :]) >> np.uint64(32)
+      starts = np.concatenate([[0], np.cumsum(lengths[block_valid])[:-1]])
+
+      valid[start:start + len(block)] = block_valid
+      signatures[start:start + len(block)][block_valid] = np.minimum.reduceat(permuted, starts, axis=0).astype(np.int64)
+
+    offsets = np.arange(len(rows) + 1, dtype=np.int32) * self.num_perm
+    return pa.ListArray.from_arrays(
+      pa.array(offsets), pa.array(signatures.reshape(-1)), mask=pa.array(~valid)
+    )
+
+
+@daft.udf(return_dtype=DataType.list(DataType.int64()))
+def minhash_bands(signatures, bands):
+  """
+  Split each signature into `bands` bands and hash each band to a key,
+  tagged with the band index.
+
+  Two signatures agreeing on every value of any one band share a key.
+  """
+  # Callers drop null signatures first, so every row holds num_perm values
+  values = signatures.to_arrow().flatten().to_numpy(zero_copy_only=False).astype(np.int64)
+  rows = len(signatures)
+  width = len(values) // (rows * bands) if rows else 1
+
+  matrix = values.view(np.uint64).reshape(rows, bands, width)
+  powers = np.uint64(1099511628211) ** np.arange(width, dtype=np.uint64)
+  band_hashes = (matrix * powers).sum(axis=-1) & np.uint64((1 << 56) - 1)
+  keys = (np.arange(bands, dtype=np.uint64) << np.uint64(56)) | band_hashes
+
+  return _list_array(keys.reshape(-1).view(np.int64), bands)
+
+
+@daft.udf(return_dtype=DataType.list(DataType.int64()))
+def jaccard_matches(ids, signatures, threshold):
+  """
+  For each bucket, return the ids whose estimated Jaccard similarity (share
+  of equal MinHash values) with another member is at least `threshold`.
+  Null buckets give null.
+  """
+  result = []
+  for bucket_ids, bucket_signatures in zip(ids.to_pylist(), signatures.to_pylist()):
+    if bucket_ids is None:
+      result.append(None)
+      continue
+    bucket_ids = np.asarray(bucket_ids, dtype=np.int64)
+    s = np.asarray(bucket_signatures, dtype=np.int64)
+
+    # Compare in row blocks to bound the (block x bucket x num_perm) mask
+    matched = np.zeros(len(s), dtype=bool)
+    for start in range(0, len(s), 128):
+      similarity = (s[start:start + 128, None, :] == s[None, :, :]).mean(axis=-1)
+      np.fill_diagonal(similarity[:, start:], 0.0)
+      matched[start:start + 128] = (similarity >= threshold).any(axis=1)
+
+    result.append(bucket_ids[matched].tolist())
+  return pa.array(result, type=pa.list_(pa.int64()))
@@ -0,0 +1,148 @@
+"""
+Pipelined media stage: downloads run as their own small actor pool, ahead of
+the decode UDFs, and both stages record busy time for utilisation metrics.
+"""
+import inspect
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import daft
+from daft import DataType
+
+import pyarrow as pa
+
+from cache.counters import FLUSH_INTERVAL_S, BufferedCounters, read_counters
+from cache.media import MediaCache, fetch
+
+PIPELINE_STAT_KEYS = ('download_ms', 'download_files', 'download_bytes', 'decode_ms', 'decode_rows')
+
+# Assumed file size before any download has been measured
+DEFAULT_FILE_BYTES = 1024 * 1024
+
+
+def pipeline_stats(stats_dir, scope=None):
+  """
+  Busy time (ms), files and bytes of the download and decode stages, summed
+  over every worker and process (or, with `scope`, over one run).
+  """
+  return read_counters(stats_dir, PIPELINE_STAT_KEYS, scope)
+
+
+def download_batch_size(stats_dir, memory_mb, prefetch_batches):
+  """
+  Rows per download batch so that `prefetch_batches` batches in flight fit in
+  `memory_mb`, from the mean file size measured by earlier runs.
+  """
+  stats = pipeline_stats(stats_dir)
+  file_bytes = stats['download_bytes'] / stats['download_files'] if stats['download_files'] else DEFAULT_FILE_BYTES
+  budget = memory_mb * 1024 * 1024 / max(1, prefetch_batches)
+  return int(min(1024, max(1, budget // max(1, file_bytes))))
+
+
+@daft.udf(return_dtype=DataType.binary())
+class PipelineDownload:
+  """
+  Download each URL with `io_threads` concurrent requests, through the media
+  cache when `cache_dir` is set; unreadable URLs give null.
+
+  Each instance fetches one batch at a time, so the number of instances
+  bounds the batches in flight while the decode UDFs consume earlier ones.
+  Counters are kept in memory and written every `stats_interval_s` seconds
+  and when the instance is torn down.
+  """
+
+  IO_BOUND = True
+
+  def __init__(
+    self, stats_dir='./.dvt_cache/pipeline', io_threads=16, cache_dir=None, max_bytes=10 * 1024**3, stats_scope=None,
+    max_age_s=0, io_config=None, stats_interval_s=FLUSH_INTERVAL_S,
+  ):
+    self.io_config = io_config
+    self.cache = MediaCache(
+      cache_dir, max_bytes, stats_scope, max_age_s, io_config, stats_interval_s
+    ) if cache_dir else None
+    self.pool = ThreadPoolExecutor(max_workers=io_threads)
+    self.stats = BufferedCounters(stats_dir, stats_scope, stats_interval_s)
+    weakref.finalize(self, self.stats.flush)
+    if self.cache is not None:
+      weakref.finalize(self, self.cache.flush_stats)
+
+  def __call__(self, urls):
+    start = time.perf_counter()
+    data = list(self.pool.map(self._load, urls.to_pylist()))
+
+    fetched = [item for item in data if item is not None]
+    self.stats.add(
+      download_ms=(time.perf_counter() - start) * 1000,
+      download_files=len(fetched),
+      download_bytes=sum(map(len, fetched)),
+    )
+    return pa.array(data, type=pa.binary())
+
+  def _load(self, url):
+    if not url:
+      return None
+    if self.cache is not None:
+      return self.cache.load(url)
+    try:
+      return fetch(url, io_config=self.io_config)
+    except Exception:
+      return None
+
+
+def is_decode_udf(udf):
+  """
+  Whether `udf` is a class UDF doing CPU work (not marked `IO_BOUND`).
+  """
+  return isinstance(getattr(udf, 'inner', None), type) and not getattr(udf.inner, 'IO_BOUND', False)
+
+
+def with_stage_metrics(udf, stats_dir, stats_scope=None, stats_interval_s=FLUSH_INTERVAL_S):
+  """
+  Wrap a class UDF so each batch adds its busy time and row count to the
+  decode stage counters (and to the `stats_scope` ones), buffered like the
+  download counters. Init args, resources and results are unchanged.
+  """
+  inner = udf.inner
+
+  class Timed(inner):
+
+    def __init__(self, *args, **kwargs):
+      super().__init__(*args, **kwargs)
+      self._stage_stats = BufferedCounters(stats_dir, stats_scope, stats_interval_s)
+      weakref.finalize(self, self._stage_stats.flush)
+
+    def __call__(self, *args, **kwargs):
+      start = time.perf_counter()
+      try:
+        return super().__call__(*args, **kwargs)
+      finally:
+        rows = len(args[0]) if args else 0
+        self._stage_stats.add(decode_ms=(time.perf_counter() - start) * 1000, decode_rows=rows)
+
+  # daft binds arguments by name, so keep the wrapped signatures
+  Timed.__init__.__signature__ = inspect.signature(inner.__init__)
+  Timed.__call__.__signature__ = inspect.signature(inner.__call__)
+  Timed.__name__ = Timed.__qualname__ = inner.__name__
+
+  timed = daft.udf(return_dtype=udf.return_dtype)(Timed)
+  if udf.init_args is not None:
+    timed = timed.with_init_args(*udf.init_args[0], **udf.init_args[1])
+  return timed
+
+
+def utilisation_summary(stats, wall_seconds, prefetch_batches, cores):
+  """
+  One-line summary of a run's pipeline counters: how busy the download
+  instances and the cores were, as a share of the run's wall time.
+  """
+  wall_ms = max(wall_seconds * 1000, 1)
+  download = stats['download_ms'] / (wall_ms * max(1, prefetch_batches))
+  decode = stats['decode_ms'] / (wall_ms * max(1, cores))
+  return (
+    f"wall {wall_seconds:.1f}s, "
+    f"download busy {download:.0%} of {prefetch_batches} instances "
+    f"({stats['download_files']} files, {stats['download_bytes'] / 1024**2:.1f} MB), "
+    f"decode busy {decode:.0%} of {cores} cores ({stats['decode_rows']} rows)"
+  )
@@ -0,0 +1,49 @@
+"""
+Scheduling options (batch size, concurrency, CPUs) for media UDFs.
+"""
+import os
+from typing import Any, Dict
+
+RESOURCE_KEYS = ('batch_size', 'concurrency', 'num_cpus', 'io_cpus')
+
+DEFAULT_BATCH_SIZE = 64
+
+# CPUs requested per instance of IO-bound UDFs (downloads), which mostly wait
+# on the network
+IO_NUM_CPUS = 0.25
+
+
+def default_resources(media_detectors: int = 1) -> Dict[str, Any]:
+  """
+  Defaults derived from the machine's core count.
+
+  Each UDF instance requests one CPU and the cores are shared between the
+  media detectors of a run, so all actor pools together fill the host once.
+  """
+  cores = os.cpu_count() or 1
+  return {
+    'batch_size': DEFAULT_BATCH_SIZE,
+    'num_cpus': 1,
+    'concurrency': max(1, cores // max(1, media_detectors)),
+  }
+
+
+def io_resources(resources: Dict[str, Any]) -> Dict[str, Any]:
+  """
+  `resources` for an IO-bound UDF: the same batch size and concurrency, but
+  only `io_cpus` (default `IO_NUM_CPUS`) per instance, so downloads do not
+  hold the cores the decode UDFs need.
+  """
+  return {**resources, 'num_cpus': resources.get('io_cpus', IO_NUM_CPUS)}
+
+
+def with_resources(udf, resources: Dict[str, Any]):
+  """
+  Return `udf` with the given batch size, CPU request and concurrency applied.
+  """
+  options = {key: resources[key] for key in ('num_cpus', 'batch_size') if resources.get(key) is not None}
+  if options:
+    udf = udf.override_options(**options)
+  if resources.get('concurrency'):
+    udf = udf.with_concurrency(int(resources['concurrency']))
+  return udf
@@ -0,0 +1,168 @@
+import daft
+from daft import DataType
+
+import cv2
+import numpy as np
+import pyarrow as pa
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+from udfs.image import blur_variance, count_faces, face_classifier
+from udfs.arrow import masked_array
+
+VIDEO_INFO_DTYPE = DataType.struct({
+  'valid': DataType.bool(),
+  'duration': DataType.float64(),
+  'fps': DataType.float64(),
+  'width': DataType.int64(),
+  'height': DataType.int64(),
+  'frame_count': DataType.int64(),
+  'codec': DataType.string(),
+})
+
+
+@contextmanager
+def open_video(video_bytes):
+  """
+  Open downloaded video bytes with OpenCV.
+
+  The FFmpeg backend reads containers from a path, so the bytes are spilled
+  to a temporary file for as long as the capture is open.
+  """
+  fd, path = tempfile.mkstemp(prefix='dvt-video-')
+  capture = None
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(video_bytes)
+    capture = cv2.VideoCapture(path)
+    yield capture
+  finally:
+    if capture is not None:
+      capture.release()
+    os.remove(path)
+
+
+def fourcc_name(value):
+  """
+  Decode OpenCV's FOURCC code property (e.g. 'avc1', 'mp4v').
+  """
+  code = int(value)
+  return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ').lower()
+
+
+@daft.udf(return_dtype=VIDEO_INFO_DTYPE)
+class VideoInfo:
+  """
+  Container metadata of each video; no frame is decoded.
+  """
+
+  CACHE_VERSION = 1
+
+  def __init__(self):
+    pass
+
+  def __call__(self, video_bytes):
+    files = video_bytes.to_pylist()
+    valid = np.zeros(len(files), dtype=bool)
+    duration = np.zeros(len(files), dtype=np.float64)
+    fps = np.zeros(len(files), dtype=np.float64)
+    width = np.zeros(len(files), dtype=np.int64)
+    height = np.zeros(len(files), dtype=np.int64)
+    frame_count = np.zeros(len(files), dtype=np.int64)
+    codec = [None] * len(files)
+
+    for i, file_bytes in enumerate(files):
+      try:
+        if file_bytes is None or file_bytes == b"":
+          continue
+        with open_video(file_bytes) as capture:
+          if not capture.isOpened():
+            continue
+          fps[i] = capture.get(cv2.CAP_PROP_FPS)
+          frame_count[i] = max(0, int(capture.get(cv2.CAP_PROP_FRAME_COUNT)))
+          width[i] = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+          height[i] = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+          codec[i] = fourcc_name(capture.get(cv2.CAP_PROP_FOURCC))
+          duration[i] = frame_count[i] / fps[i] if fps[i] > 0 else 0.0
+          valid[i] = True
+      except Exception:
+        pass
+
+    return pa.StructArray.from_arrays(
+      [pa.array(valid), pa.array(duration), pa.array(fps), pa.array(width),
+       pa.array(height), pa.array(frame_count), pa.array(codec, type=pa.string())],
+      names=['valid', 'duration', 'fps', 'width', 'height', 'frame_count', 'codec'],
+    )
+
+
+FRAME_SCORES_DTYPE = DataType.struct({
+  'blur': DataType.float32(),
+  'faces': DataType.int32(),
+})
+
+
+@daft.udf(return_dtype=FRAME_SCORES_DTYPE)
+class VideoFrameScores:
+  """
+  Mean Laplacian variance (`blur`) and largest face count (`faces`) over a
+  sparse sample of each video's frames. A score is null when it was not
+  requested or no frame could be read.
+
+  Frames are spread evenly over the video and reached by seeking, so each
+  file costs `sample_frames` frame decodes instead of a full decode. They
+  are scored as decoded arrays with the image UDFs' scorers, without
+  encoding them to images first.
+  """
+
+  CACHE_VERSION = 1
+
+  def __init__(self):
+    pass
+
+  def __call__(self, video_bytes, sample_frames, blur, faces):
+    files = video_bytes.to_pylist()
+    blur_values = np.zeros(len(files), dtype=np.float32)
+    face_counts = np.zeros(len(files), dtype=np.int32)
+    scored = np.zeros(len(files), dtype=bool)
+    classifier = face_classifier() if faces else None
+
+    for i, file_bytes in enumerate(files):
+      try:
+        if file_bytes is None or file_bytes == b"":
+          continue
+        with open_video(file_bytes) as capture:
+          if not capture.isOpened():
+            continue
+          # Frames are scored as they are read, holding one at a time
+          blur_scores, face_scores = [], []
+          for frame in self._sample(capture, sample_frames):
+            blur_scores.append(blur_variance(frame) if blur else 0.0)
+            face_scores.append(count_faces(classifier, frame) if faces else 0)
+          if not blur_scores:
+            continue
+          blur_values[i] = np.mean(blur_scores)
+          face_counts[i] = max(face_scores)
+          scored[i] = True
+      except Exception:
+        pass
+
+    return pa.StructArray.from_arrays(
+      [masked_array(blur_values, scored & blur), masked_array(face_counts, scored & faces)],
+      names=['blur', 'faces'],
+    )
+
+  def _sample(self, capture, sample_frames):
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    if frame_count <= 0:
+      return
+
+    # Midpoints of equal segments, skipping the (often black) first frame
+    positions = np.unique(((np.arange(sample_frames) + 0.5) * frame_count / sample_frames).astype(np.int64))
+
+    for position in positions:
+      capture.set(cv2.CAP_PROP_POS_FRAMES, int(position))
+      ok, frame = capture.read()
+      if ok:
+        yield frame
@@ -1,21 +1,59 @@
 """
 Base classes for the generic detector system.
 """
+import re
 from abc import ABC, abstractmethod
+from importlib import import_module
+from importlib.metadata import entry_points
 from typing import Any, Dict, List, Optional, Union
 import daft
 from daft import col
 
+from udfs.resources import io_resources, with_resources
+from udfs.download import CachedDownload
+from udfs.cached import is_cacheable, with_result_cache
+from udfs.pipeline import PipelineDownload, download_batch_size, is_decode_udf, with_stage_metrics
+from .reference import flag_members, reference_errors
+
 
 class BaseDetector(ABC):
     """
     Abstract base class for all detectors.
     """
+
+    # Whether the detector downloads and decodes media with UDFs
+    USES_MEDIA = False
+
+    # Whether each row's result depends only on that row; dataset-level
+    # detectors (duplicates, drift, outlier statistics) set this to False
+    ROW_LOCAL = True
+
+    # Whether the detector accepts `on_columns` (a column list or regex)
+    SUPPORTS_COLUMN_GROUPS = False
     
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
         self.on_column = config.get('on_column')
+        self.on_columns = config.get('on_columns')
+        self.resources = dict(config.get('resources') or {})
+        self.media_cache = config.get('media_cache')
+        self.result_cache = config.get('result_cache')
+        self.pack_validation = config.get('pack_validation')
+        self.media_pipeline = config.get('media_pipeline')
+
+        # Frame before any detector ran, set by the engine; side branches
+        # joined back on `__ROW_ID__` are built from it
+        self.source = None
+        # Key under which this run's cache and pipeline counters are also
+        # kept, set by the engine
+        self.stats_scope = None
+        # IO config of the run's inputs (e.g. an S3 endpoint), set by the engine
+        self.io_config = None
+        # Columns downloaded and UDFs applied while building the plan, as
+        # (name, column, whether it decodes media); read by `explain`
+        self.downloads: List[str] = []
+        self.udfs: List[tuple] = []
         
     @abstractmethod
     def detect(self, df: daft.DataFrame) -> daft.DataFrame:
@@ -31,11 +69,178 @@ class BaseDetector(ABC):
         """
         pass
     
+    def validate_config(self) -> List[str]:
+        """
+        Return configuration errors found without touching any data.
+        """
+        errors = []
+        if self.on_columns is not None:
+            if not self.SUPPORTS_COLUMN_GROUPS:
+                errors.append("'on_columns' is not supported by this detector")
+            elif self.on_column:
+                errors.append("'on_column' and 'on_columns' cannot both be set")
+            elif isinstance(self.on_columns, str):
+                try:
+                    re.compile(self.on_columns)
+                except re.error as e:
+                    errors.append(f"invalid 'on_columns' regex: {e}")
+            elif not isinstance(self.on_columns, list) or not self.on_columns:
+                errors.append("'on_columns' must be a non-empty list of columns or a regex")
+        elif not self.on_column:
+            errors.append("missing 'on_column'")
+
+        supported = [c.upper() for c in self.get_supported_constraints()]
+        for i, constraint in enumerate(self.config.get('constraints', []) or []):
+            constraint_type = str(constraint.get('type', '')).upper()
+            if not constraint_type:
+                errors.append(f"constraint {i} is missing 'type'")
+            elif constraint_type not in supported:
+                errors.append(f"constraint {i} type '{constraint_type}' is not supported (supported: {supported})")
+            elif 'reference' in constraint:
+                if constraint_type not in ('IN', 'NOT_IN'):
+                    errors.append(f"constraint {i}: 'reference' is only supported by IN and NOT_IN")
+                errors.extend(f"constraint {i}: {e}" for e in reference_errors(constraint['reference']))
+
+        return errors
+
+    def intermediate_columns(self) -> List[str]:
+        """
+        Intermediate columns this detector reads or creates (e.g. downloaded
+        media bytes). The engine drops each one after its last consumer.
+        """
+        return []
+    
     def _add_validation_column(self, df: daft.DataFrame, column_name: str, expression: Any) -> daft.DataFrame:
        
-        validation_col = f'__VALID_{self.name}_{column_name}_{self.on_column}__'
+        validation_col = self._validation_column_name(column_name)
         return df.with_column(validation_col, expression)
 
+    def _validation_column_name(self, check: str, column: Optional[str] = None) -> str:
+
+        return f'__VALID_{self.name}_{check}_{column or self.on_column}__'
+
+    def _resolve_columns(self, df: daft.DataFrame) -> List[str]:
+        """
+        Data columns the detector applies to: `on_column`, or every column of
+        `on_columns` (a list, or a regex matched against the column names in
+        data order).
+        """
+        if self.on_columns is None:
+            return [self.on_column]
+
+        if isinstance(self.on_columns, str):
+            pattern = re.compile(self.on_columns)
+            columns = [c for c in df.column_names if not c.startswith('__') and pattern.search(c)]
+        else:
+            columns = list(self.on_columns)
+            missing = [c for c in columns if c not in df.column_names]
+            if missing:
+                raise ValueError(f"'on_columns' not found: {missing}")
+
+        if not columns:
+            raise ValueError(f"'on_columns' matches no columns: {self.on_columns!r}")
+        return columns
+
+    def _add_reference_column(
+        self, df: daft.DataFrame, column_name: str, reference: Dict[str, Any], negate: bool = False
+    ) -> daft.DataFrame:
+        """
+        Add a validation column checking `on_column` for membership (or, with
+        `negate`, non-membership) in a reference set file.
+        """
+        return flag_members(
+            df, self.on_column, reference, self._validation_column_name(column_name), negate, self.io_config
+        )
+
+    def _ensure_row_id(self, df: daft.DataFrame) -> daft.DataFrame:
+        """
+        Ensure a unique, order-preserving `__ROW_ID__` column exists.
+        """
+        if '__ROW_ID__' not in df.column_names:
+            df = df._add_monotonically_increasing_id('__ROW_ID__')
+
+        return df, '__ROW_ID__'
+
+    def _side_frame(self, df: daft.DataFrame, *columns: str) -> daft.DataFrame:
+        """
+        Narrow `__ROW_ID__` + `columns` frame for a side branch joined back on
+        `__ROW_ID__`. It is taken from `source` when set: daft does not share
+        repeated subplans, so a branch built from `df` would re-run every
+        upstream detector (and its downloads) once more.
+        """
+        source = self.source if self.source is not None else df
+        return source.select('__ROW_ID__', *columns)
+
+    def _download(self, column: str) -> Any:
+        """
+        Expression downloading the media at `column`, through the local media
+        cache (`dir`, `max_size_mb`) when one is configured.
+
+        With `media_pipeline`, downloads run in `prefetch_batches` light actors
+        ahead of the decode UDFs, with batches sized to fit `memory_mb`.
+        """
+        self.downloads.append(column)
+        if self.media_pipeline:
+            pipeline = self.media_pipeline
+            stats_dir = pipeline.get('stats_dir', './.dvt_cache/pipeline')
+            prefetch_batches = int(pipeline.get('prefetch_batches', 2))
+
+            init_args = {
+                'stats_dir': stats_dir,
+                'io_threads': int(pipeline.get('io_threads', 16)),
+                'stats_scope': self.stats_scope,
+                'io_config': self.io_config,
+            }
+            if self.media_cache:
+                init_args['cache_dir'] = self.media_cache.get('dir', './.dvt_cache/media')
+                init_args['max_bytes'] = int(self.media_cache.get('max_size_mb', 10240)) * 1024 * 1024
+                init_args['max_age_s'] = float(self.media_cache.get('max_age_s', 0))
+
+            udf = with_resources(PipelineDownload.with_init_args(**init_args), {
+                'batch_size': download_batch_size(stats_dir, float(pipeline.get('memory_mb', 1024)), prefetch_batches),
+                'concurrency': prefetch_batches,
+                'num_cpus': float(pipeline.get('download_cpus', 0.25)),
+            })
+            return udf(col(column))
+
+        if not self.media_cache:
+            return col(column).url.download(on_error='null', io_config=self.io_config)
+
+        udf = CachedDownload.with_init_args(
+            cache_dir=self.media_cache.get('dir', './.dvt_cache/media'),
+            max_bytes=int(self.media_cache.get('max_size_mb', 10240)) * 1024 * 1024,
+            stats_scope=self.stats_scope,
+            max_age_s=float(self.media_cache.get('max_age_s', 0)),
+            io_config=self.io_config,
+        )
+        return with_resources(udf, io_resources(self.resources))(col(column))
+
+    def _register_udf(self, udf: Any) -> None:
+
+        self.udfs.append((udf.name.rsplit('.', 1)[-1], self.on_column, is_decode_udf(udf)))
+
+    def _with_io_resources(self, udf: Any) -> Any:
+        """
+        Apply this detector's batch size and concurrency to an IO-bound UDF,
+        with a small CPU request (`io_cpus`) instead of `num_cpus`.
+        """
+        self._register_udf(udf)
+        return with_resources(udf, io_resources(self.resources))
+
+    def _with_resources(self, udf: Any) -> Any:
+        """
+        Apply this detector's `resources` (batch_size, concurrency, num_cpus) to a UDF,
+        looking its results up in the result cache first when one is configured.
+        """
+        self._register_udf(udf)
+        if self.result_cache and is_cacheable(udf):
+            udf = with_result_cache(udf, self.result_cache.get('path', './.dvt_cache/results.db'))
+        if self.media_pipeline and is_decode_udf(udf):
+            udf = with_stage_metrics(
+                udf, self.media_pipeline.get('stats_dir', './.dvt_cache/pipeline'), self.stats_scope
+            )
+        return with_resources(udf, self.resources)
+
 
 class ConstraintEvaluator:
     """
@@ -85,10 +290,18 @@ class ConstraintEvaluator:
 class DetectorRegistry:
     """
     Registry for managing detector plugins.
+
+    Detectors can be registered as classes or lazily as `'module:Class'`
+    strings, which are only imported when a config references them. Packages
+    can also publish detectors through the `dvt.detectors` entry point group.
     """
+
+    ENTRY_POINT_GROUP = 'dvt.detectors'
     
     def __init__(self):
         self._detectors = {}
+        self._lazy = {}
+        self._entry_points_loaded = False
         
     def register(self, detector_type: str, detector_class: type):
         
@@ -96,14 +309,44 @@ class DetectorRegistry:
             raise ValueError(f"Detector class must inherit from BaseDetector")
         
         self._detectors[detector_type.upper()] = detector_class
+
+    def register_lazy(self, detector_type: str, target: str):
+
+        if ':' not in target:
+            raise ValueError(f"Lazy detector target must be 'module:Class', got '{target}'")
+
+        self._lazy[detector_type.upper()] = target
+
+    def _load_entry_points(self):
+
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+
+        for entry_point in entry_points(group=self.ENTRY_POINT_GROUP):
+            self._lazy.setdefault(entry_point.name.upper(), entry_point.value)
         
     def get_detector(self, detector_type: str) -> Optional[type]:
         
-        return self._detectors.get(detector_type.upper())
+        detector_type = detector_type.upper()
+        if detector_type in self._detectors:
+            return self._detectors[detector_type]
+
+        self._load_entry_points()
+        target = self._lazy.get(detector_type)
+        if target is None:
+            return None
+
+        # Import the plugin module on first use
+        module_name, class_name = target.split(':', 1)
+        detector_class = getattr(import_module(module_name), class_name)
+        self.register(detector_type, detector_class)
+        return detector_class
     
     def list_detectors(self) -> List[str]:
         
-        return list(self._detectors.keys())
+        self._load_entry_points()
+        return list(dict.fromkeys([*self._detectors, *self._lazy]))
     
     def create_detector(self, detector_config: Dict[str, Any]) -> BaseDetector:
         
@@ -0,0 +1,45 @@
+"""
+Packing of a detector's boolean check columns into integer bitmasks.
+"""
+from typing import Dict, List, Tuple
+
+import daft
+from daft import col
+import numpy as np
+
+# Bits per mask column; the sign bit of int64 is left unused
+BITS_PER_MASK = 63
+
+
+def pack_checks(df: daft.DataFrame, name: str, columns: List[str]) -> Tuple[daft.DataFrame, Dict[str, List[str]]]:
+    """
+    Replace the `__VALID_...__` columns of detector `name` with
+    `__CHECKS_<name>_<k>__` int64 columns, where bit `i` is set when check `i`
+    failed (False). Null results, like in the boolean columns, never fail.
+
+    Returns the new dataframe and the side table mapping each mask column to
+    its check column names in bit order.
+    """
+    packed = {}
+    for k, start in enumerate(range(0, len(columns), BITS_PER_MASK)):
+        checks = columns[start:start + BITS_PER_MASK]
+        mask_col = f'__CHECKS_{name}_{k}__'
+
+        mask = daft.lit(0).cast(daft.DataType.int64())
+        for bit, check in enumerate(checks):
+            failed = (~col(check)).fill_null(False)
+            mask = mask + failed.if_else(daft.lit(1 << bit), daft.lit(0)).cast(daft.DataType.int64())
+
+        df = df.with_column(mask_col, mask)
+        packed[mask_col] = checks
+
+    if columns:
+        df = df.exclude(*columns)
+    return df, packed
+
+
+def failed_rows(masks: np.ndarray, bit: int) -> np.ndarray:
+    """
+    Boolean array of the rows whose mask has `bit` set.
+    """
+    return ((masks >> np.int64(bit)) & np.int64(1)).astype(bool)
@@ -0,0 +1,58 @@
+"""
+Per-partition checkpoints of detector outputs.
+"""
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, List
+
+import daft
+
+
+class CheckpointStore:
+    """
+    Local Parquet directory holding one sub-directory per completed partition.
+
+    Runs are keyed by a hash of the inputs, detector configs and partition
+    count, so a restarted run with the same key finds its finished partitions.
+    """
+
+    SUCCESS_MARKER = '_SUCCESS'
+
+    def __init__(self, root: str, run_key: Any, num_partitions: int):
+        digest = hashlib.sha256(json.dumps([run_key, num_partitions], sort_keys=True, default=str).encode('utf-8'))
+        self.num_partitions = num_partitions
+        self.path = os.path.join(root, digest.hexdigest()[:16])
+
+    def _partition_path(self, partition: int) -> str:
+        return os.path.join(self.path, f'part-{partition:05d}')
+
+    def is_complete(self, partition: int) -> bool:
+
+        return os.path.exists(os.path.join(self._partition_path(partition), self.SUCCESS_MARKER))
+
+    def pending_partitions(self) -> List[int]:
+
+        return [p for p in range(self.num_partitions) if not self.is_complete(p)]
+
+    def write(self, partition: int, df: daft.DataFrame) -> None:
+        """
+        Execute `df` and persist it as the output of `partition`.
+
+        Files are written to a temporary directory and renamed into place, and
+        the success marker is written last, so a crash never leaves a partition
+        that looks complete.
+        """
+        target = self._partition_path(partition)
+        tmp = f'{target}.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(target, ignore_errors=True)
+
+        df.write_parquet(tmp)
+        os.replace(tmp, target)
+        open(os.path.join(target, self.SUCCESS_MARKER), 'w').close()
+
+    def read(self) -> daft.DataFrame:
+
+        return daft.read_parquet(os.path.join(self.path, 'part-*', '*.parquet'))
@@ -1,44 +1,279 @@
 
+import functools
+
 import daft
-from typing import List, Dict, Any
+from daft import col
+from typing import List, Dict, Any, Optional, Tuple
 
 from .base import registry
+from .checkpoint import CheckpointStore
+from .bitmask import pack_checks
+from .explain import explain_plan
 from detectors import registry as detector_registry
+from udfs.resources import default_resources
+
+
+# Prefixes of the columns holding detector results, as read by the Reporter
+RESULT_PREFIXES = ('__VALID_', '__CHECKS_', '__GROUP_SIZE_', '__DRIFT_')
 
 
 class Detector:
 
-    def __init__(self, data: daft.DataFrame, detectors: List[Dict[str, Any]]):
+    def __init__(
+        self,
+        data: daft.DataFrame,
+        detectors: List[Dict[str, Any]],
+        resources: Optional[Dict[str, Any]] = None,
+        media_cache: Optional[Dict[str, Any]] = None,
+        result_cache: Optional[Dict[str, Any]] = None,
+        pack_validation: Optional[bool] = None,
+        media_pipeline: Optional[Dict[str, Any]] = None,
+        join_key: Optional[str] = None,
+        stats_scope: Optional[str] = None,
+        io_config: Optional[daft.io.IOConfig] = None,
+    ):
 
         self._data = data
         self._detectors = detectors
         self._registry = registry
+        self._resources = resources or {}
+        self._media_cache = media_cache
+        self._result_cache = result_cache
+        self._pack_validation = pack_validation
+        self._media_pipeline = media_pipeline
+        # Column `data` was joined on, when it joins several inputs
+        self._join_key = join_key
+        # Key of this run's cache and pipeline counters
+        self._stats_scope = stats_scope
+        # IO config for reading reference sets and media
+        self._io_config = io_config
+
+        # Packed bitmask column -> its check column names in bit order
+        self.check_columns: Dict[str, List[str]] = {}
+        # Detector name -> the result columns it added, in plan order
+        self.result_columns: Dict[str, List[str]] = {}
 
     def add_row_hash(self, data: daft.DataFrame) -> daft.DataFrame:
 
+        columns = [c for c in data.column_names if c != '__ROW_ID__']
         return data.with_column(
             '__ROW_HASH__',
-            daft.list_(*data.column_names).hash()
+            daft.list_(*columns).hash()
         )
 
-    def detect_issues(self) -> daft.DataFrame:
+    def add_row_id(self, data: daft.DataFrame) -> daft.DataFrame:
+        """
+        Add a unique, order-preserving `__ROW_ID__`, unless the loader already
+        numbered the rows by file (see `Loader._add_row_id`).
+
+        Side branches are joined back on it, so it must be the same in every
+        execution of the plan. It is added before any detector: daft does not
+        push projections through this operator, so adding it later keeps
+        every upstream UDF alive in each branch that reads the frame.
+        """
+        if '__ROW_ID__' in data.column_names:
+            return data
+        return data._add_monotonically_increasing_id('__ROW_ID__')
+
+    def detect_issues(self, checkpoint: Optional[Dict[str, Any]] = None) -> daft.DataFrame:
+        """
+        Build the detector plan. Config and planning errors are raised before
+        anything executes, so invalid configs fail before media is fetched.
+        """
+        errors = []
+        df = self.add_row_id(self.add_row_hash(self._data))
+        detectors = self._build_detectors(errors)
+        self._raise_errors(errors)
+
+        if checkpoint:
+            return self._detect_issues_checkpointed(df, detectors, checkpoint)
+
+        df = self._run_detectors(df, detectors, errors)
+        self._raise_errors(errors)
+        return df
+
+    def detect_issues_chunked(self, num_chunks: int) -> Tuple[List[daft.DataFrame], Optional[daft.DataFrame]]:
+        """
+        Build one plan per chunk of rows, for runs that must fit in memory.
 
-        df = self.add_row_hash(self._data)
+        Rows are split by `__ROW_HASH__ % num_chunks` and each chunk runs the
+        row-local detectors, so executing the chunks one after another holds
+        only one chunk's media at a time. Dataset-level detectors need every
+        row and run once over the whole input; the second return value is that
+        full plan (None without any). Reading only its dataset-level result
+        columns prunes the row-local UDFs they do not depend on.
 
+        Joined inputs are split on a hash of the join key instead, which
+        keeps the rows of a key together. Their row ids come from the loader,
+        numbered over the whole join, so each chunk still reads and joins the
+        whole input.
+        """
+        errors = []
+        detectors = self._build_detectors(errors)
+        self._raise_errors(errors)
+
+        if self._join_key:
+            key_hash = col(self._join_key).hash().fill_null(0) % num_chunks
+            parts = [
+                self.add_row_id(self.add_row_hash(self._data.where(key_hash == chunk)))
+                for chunk in range(num_chunks)
+            ]
+            df = functools.reduce(lambda a, b: a.concat(b), parts)
+        else:
+            df = self.add_row_id(self.add_row_hash(self._data))
+            partition_expr = col('__ROW_HASH__') % num_chunks
+            parts = [df.where(partition_expr == chunk) for chunk in range(num_chunks)]
+
+        row_local = [detector for detector in detectors if detector.ROW_LOCAL]
+        chunks = [self._run_detectors(part, row_local, errors) for part in parts]
+        self._raise_errors(errors)
+
+        if len(row_local) == len(detectors):
+            return chunks, None
+
+        df = self._run_detectors(df, detectors, errors)
+        self._raise_errors(errors)
+        return chunks, df
+
+    def explain(self) -> Tuple[str, List[str]]:
+        """
+        Describe the detector plan without executing it: config errors,
+        downloads and decodes per media column, and the daft logical plan.
+        Detectors only build lazy expressions, so no rows are processed and
+        no media is fetched. Returns the description and the list of errors.
+        """
+        errors = []
+        df = self.add_row_id(self.add_row_hash(self._data))
+        detectors = self._build_detectors(errors)
+        df = self._run_detectors(df, detectors, errors)
+        return explain_plan(df, detectors, errors), errors
+
+    def _raise_errors(self, errors: List[str]) -> None:
+
+        if errors:
+            raise ValueError('Invalid detector configuration:\n' + '\n'.join(f'  - {e}' for e in errors))
+
+    def _build_detectors(self, errors: List[str]) -> List[Any]:
+
+        detectors = []
         for detector_config in self._detectors:
+            detector_name = detector_config.get('name', 'unknown')
             try:
                 # Create detector instance using registry
                 detector = self._create_detector_from_config(detector_config)
+                errors.extend(f'{detector_name}: {e}' for e in detector.validate_config())
+                detectors.append(detector)
+            except Exception as e:
+                errors.append(f'{detector_name}: {str(e)}')
 
-                # Apply detection
+        self._apply_resources(detectors)
+        for detector in detectors:
+            if detector.media_cache is None:
+                detector.media_cache = self._media_cache
+            if detector.result_cache is None:
+                detector.result_cache = self._result_cache
+            if detector.pack_validation is None:
+                detector.pack_validation = self._pack_validation
+            if detector.media_pipeline is None:
+                detector.media_pipeline = self._media_pipeline
+            detector.stats_scope = self._stats_scope
+            detector.io_config = self._io_config
+        return detectors
+
+    def _run_detectors(self, df: daft.DataFrame, detectors: List[Any], errors: List[str]) -> daft.DataFrame:
+
+        # Index of the last detector using each intermediate column
+        last_consumer = {}
+        for i, detector in enumerate(detectors):
+            for column in detector.intermediate_columns():
+                last_consumer[column] = i
+
+        source = df
+        for i, detector in enumerate(detectors):
+            try:
+                # Apply detection (lazy: only builds the plan)
+                before = set(df.column_names)
+                detector.source = source
                 df = detector.detect(df)
 
+                if detector.pack_validation:
+                    checks = [c for c in df.column_names if c.startswith('__VALID_') and c not in before]
+                    df, packed = pack_checks(df, detector.name, checks)
+                    self.check_columns.update(packed)
+
+                self.result_columns[detector.name] = [
+                    c for c in df.column_names if c.startswith(RESULT_PREFIXES) and c not in before
+                ]
+
             except Exception as e:
-                detector_name = detector_config.get('name', 'unknown')
-                print(f'[Error] Failed to run detector \'{detector_name}\': {str(e)}')
+                errors.append(f'{detector.name}: {str(e)}')
+
+            # Project away media bytes as soon as nothing downstream needs them
+            finished = [c for c, last in last_consumer.items() if last == i and c in df.column_names]
+            if finished:
+                df = df.exclude(*finished)
 
         return df
 
+    def _detect_issues_checkpointed(self, df: daft.DataFrame, detectors: List[Any], checkpoint: Dict[str, Any]) -> daft.DataFrame:
+        """
+        Run row-local detectors partition by partition, persisting each
+        partition's output so a restarted run only computes what is missing.
+
+        `checkpoint` holds `dir`, optional `partitions` (default 16) and an
+        optional `run_key` identifying the inputs. Dataset-level detectors
+        (duplicates, drift, outlier statistics) run afterwards on the
+        checkpointed output. Each partition re-executes the scan, so the row
+        ids the outputs are matched by must come from the input itself (see
+        `Loader._add_row_id`), not from execution order.
+        """
+        num_partitions = int(checkpoint.get('partitions', 16))
+        store = CheckpointStore(
+            checkpoint['dir'],
+            [checkpoint.get('run_key'), self._detectors, self._resources],
+            num_partitions,
+        )
+
+        row_local = [detector for detector in detectors if detector.ROW_LOCAL]
+        dataset_level = [detector for detector in detectors if not detector.ROW_LOCAL]
+
+        # Partitions follow the row content, so they are stable across runs
+        partition_expr = col('__ROW_HASH__') % num_partitions
+
+        pending = store.pending_partitions()
+        print(f'[Checkpoint] {num_partitions - len(pending)}/{num_partitions} partitions already complete in {store.path}')
+
+        for partition in pending:
+            # Media bytes are dropped by _run_detectors, so they are never persisted
+            errors = []
+            part_df = self._run_detectors(df.where(partition_expr == partition), row_local, errors)
+            self._raise_errors(errors)
+            store.write(partition, part_df)
+            print(f'[Checkpoint] Partition {partition + 1}/{num_partitions} written')
+
+        if not pending:
+            # Nothing to compute, but building the plan still records the
+            # result and packed check columns the Reporter reads
+            errors = []
+            self._run_detectors(df, row_local, errors)
+            self._raise_errors(errors)
+
+        errors = []
+        df = self._run_detectors(store.read().sort('__ROW_ID__'), dataset_level, errors)
+        self._raise_errors(errors)
+        return df
+
+    def _apply_resources(self, detectors: List[Any]) -> None:
+        """
+        Resolve UDF resources: machine defaults, then the config's `resources`
+        section, then each detector's own `resources`.
+        """
+        media_detectors = sum(1 for detector in detectors if detector.USES_MEDIA)
+        defaults = {**default_resources(media_detectors), **self._resources}
+
+        for detector in detectors:
+            detector.resources = {**defaults, **detector.resources}
+
     def detect_and_show(self, num_rows: int = 10) -> None:
 
         df = self.detect_issues()
@@ -0,0 +1,71 @@
+"""
+Human-readable summary of a detector plan.
+"""
+import io
+from collections import Counter, defaultdict
+from typing import Any, List
+
+import daft
+
+
+def _section(plan: str, title: str) -> str:
+    """
+    Return one `== <title> ==` section of `DataFrame.explain(show_all=True)`.
+    """
+    start = plan.find(f'== {title} ==')
+    if start < 0:
+        return ''
+    end = plan.find('\n== ', start + 1)
+    return plan[start:] if end < 0 else plan[start:end]
+
+
+def explain_plan(df: daft.DataFrame, detectors: List[Any], errors: List[str]) -> str:
+    """
+    Summarize the plan of `df` without executing it: detectors, config
+    errors, how often each media column is downloaded and how many decoding
+    UDFs read it, as registered by the detectors while building the plan,
+    then daft's optimized logical plan.
+    """
+    buffer = io.StringIO()
+    df.explain(show_all=True, file=buffer)
+    plan = buffer.getvalue()
+
+    downloads = Counter(column for detector in detectors for column in detector.downloads)
+    decodes = defaultdict(list)
+    other_udfs = []
+    for detector in detectors:
+        for udf_name, column, decodes_media in detector.udfs:
+            if decodes_media and column in downloads:
+                decodes[column].append(udf_name)
+            else:
+                other_udfs.append(udf_name)
+
+    lines = ["=" * 80, "DETECTOR PLAN", "=" * 80, ""]
+
+    lines.append(f"Detectors: {len(detectors)}")
+    for detector in detectors:
+        lines.append(f"  - {detector.name} ({type(detector).__name__}) on {detector.on_column or detector.on_columns}")
+    lines.append("")
+
+    lines.append(f"Config errors: {len(errors)}")
+    lines.extend(f"  - {error}" for error in errors)
+    lines.append("")
+
+    lines.append("Downloads per column:")
+    lines.extend(f"  {column}: {count}" for column, count in sorted(downloads.items()))
+    if not downloads:
+        lines.append("  none")
+    lines.append("")
+
+    lines.append("Decodes per media column (UDF passes per row):")
+    for column, udfs in sorted(decodes.items()):
+        lines.append(f"  {column}: {len(udfs)} ({', '.join(udfs)})")
+    if not decodes:
+        lines.append("  none")
+    if other_udfs:
+        lines.append(f"  other UDFs: {', '.join(other_udfs)}")
+    lines.append("")
+
+    lines.append(_section(plan, 'Optimized Logical Plan').rstrip())
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,76 @@
+"""
+Bucket-based candidate search shared by the near-duplicate detectors.
+"""
+from typing import Any
+import daft
+from daft import Window, col
+
+
+def flag_bucket_matches(
+    df: daft.DataFrame,
+    signatures: daft.DataFrame,
+    id_col: str,
+    signature_col: str,
+    band_keys: Any,
+    match_udf: Any,
+    flag_col: str,
+    max_bucket_size: int = 1000,
+) -> daft.DataFrame:
+    """
+    Add `flag_col` to `df` (True for rows matched to another row, else null).
+
+    `signatures` holds `id_col` and `signature_col` for every row of `df`. It
+    should be a narrow branch of the frame before any detector ran (see
+    `BaseDetector._side_frame`), so only the flag column is joined back and
+    no upstream work is repeated. Rows are exploded into their LSH band keys
+    and grouped by key, so only rows sharing a bucket are compared.
+    `match_udf(ids, signatures)` receives each bucket's id and signature lists
+    and returns the matched ids.
+
+    Buckets larger than `max_bucket_size` (e.g. blank images, or thousands of
+    copies of one text) are not compared pairwise: they are grouped by
+    (band key, signature hash) instead, without their signatures, and rows
+    sharing an identical signature match. Buckets are sized with a window, so
+    the signatures are computed once.
+    """
+    keys = (
+        signatures.where(col(signature_col).not_null())
+        .with_column('__BAND_KEY__', band_keys)
+        .explode('__BAND_KEY__')
+    )
+
+    bucket_size = col(id_col).count().over(Window().partition_by('__BAND_KEY__'))
+    keys = keys.with_column('__BUCKET_SIZE__', bucket_size).where(col('__BUCKET_SIZE__') > 1)
+
+    # Small buckets are one group each; large ones split into identical copies
+    small = col('__BUCKET_SIZE__') <= max_bucket_size
+    no_signature = daft.lit(None).cast(signatures.schema()[signature_col].dtype)
+    groups = (
+        keys.with_column('__COPY_KEY__', small.if_else(daft.lit(0).cast(daft.DataType.uint64()), col(signature_col).hash()))
+        .groupby('__BAND_KEY__', '__COPY_KEY__')
+        .agg(
+            col(id_col).cast(daft.DataType.int64()).agg_list().alias('__IDS__'),
+            small.if_else(col(signature_col), no_signature).agg_list().alias('__SIGNATURES__'),
+            col(id_col).count().alias('__GROUP_SIZE__'),
+            small.any_value().alias('__SMALL__'),
+        )
+    )
+
+    # Each branch of the if_else gets null for the groups the other one handles
+    no_ids = daft.lit(None).cast(daft.DataType.list(daft.DataType.int64()))
+    copies = col('__GROUP_SIZE__') > 1
+    matched = (
+        groups.select(
+            col('__SMALL__').if_else(
+                match_udf(col('__SMALL__').if_else(col('__IDS__'), no_ids), col('__SIGNATURES__')),
+                copies.if_else(col('__IDS__'), no_ids),
+            ).alias(id_col)
+        )
+        .explode(id_col)
+        .where(col(id_col).not_null())
+        .distinct()
+        .with_column(flag_col, daft.lit(True))
+    )
+
+    # Joins do not preserve order; the Reporter maps rows by `id_col`
+    return df.join(matched, on=id_col, how='left')
@@ -0,0 +1,77 @@
+"""
+Membership checks against reference sets read from CSV or Parquet files.
+"""
+from typing import Any, Dict, List, Optional
+import daft
+from daft import col
+
+
+JOIN_STRATEGIES = ('broadcast', 'hash', 'sort_merge')
+
+
+def reference_errors(reference: Any) -> List[str]:
+    """
+    Configuration errors of a `reference` section.
+    """
+    if not isinstance(reference, dict) or not reference.get('path'):
+        return ["'reference' must be a mapping with a 'path'"]
+
+    errors = []
+    if reference.get('format') not in (None, 'csv', 'parquet'):
+        errors.append(f"reference format must be 'csv' or 'parquet', got '{reference['format']}'")
+    if reference.get('join_strategy') not in (None, *JOIN_STRATEGIES):
+        errors.append(f"reference join_strategy must be one of {list(JOIN_STRATEGIES)}")
+    return errors
+
+
+def read_reference(reference: Dict[str, Any], io_config: Optional[daft.io.IOConfig] = None) -> daft.DataFrame:
+    """
+    Read the distinct values of a reference set as `__REF_KEY__`.
+
+    `path` is a CSV or Parquet file (or glob), local or S3 (read with the
+    run's `io_config`); `format` defaults to the file suffix and `column` to
+    the file's first column.
+    """
+    path = reference['path']
+    file_format = reference.get('format') or ('parquet' if path.endswith(('.parquet', '.pq')) else 'csv')
+    read = daft.read_parquet if file_format == 'parquet' else daft.read_csv
+    df = read(path, io_config=io_config)
+
+    column = reference.get('column') or df.column_names[0]
+    return df.select(col(column).alias('__REF_KEY__')).distinct()
+
+
+def flag_members(
+    df: daft.DataFrame,
+    column: str,
+    reference: Dict[str, Any],
+    flag_col: str,
+    negate: bool = False,
+    io_config: Optional[daft.io.IOConfig] = None,
+) -> daft.DataFrame:
+    """
+    Add `flag_col` to `df`: True for rows whose `column` value is in the
+    reference set (not in it, with `negate`), False otherwise and null for
+    null values, like `is_in`.
+
+    The set is left-joined on its distinct values instead of being inlined
+    into the expression, so it can hold millions of entries. `join_strategy:
+    broadcast` ships it whole to every partition, for sets that fit in
+    memory; `hash` partitions both sides.
+    """
+    dtype = df.schema()[column].dtype
+    keys = (
+        read_reference(reference, io_config)
+        .with_column('__REF_KEY__', col('__REF_KEY__').cast(dtype))
+        .with_column('__REF_FOUND__', daft.lit(True))
+    )
+
+    df = df.join(keys, left_on=column, right_on='__REF_KEY__', how='left', strategy=reference.get('join_strategy'))
+
+    found = col('__REF_FOUND__').fill_null(False)
+    df = df.with_column(
+        flag_col,
+        col(column).is_null().if_else(daft.lit(None).cast(daft.DataType.bool()), ~found if negate else found),
+    )
+    # Joins do not preserve order; the Reporter maps rows by `__ROW_ID__`
+    return df.exclude(*[c for c in ('__REF_KEY__', '__REF_FOUND__') if c in df.column_names])